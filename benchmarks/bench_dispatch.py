@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: bench_dispatch.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Dispatch-overhead micro-benchmark: the old linear can_handle scan vs the indexed
+SkillRegistry, with many registered skills.
+
+Usage:
+python benchmarks/bench_dispatch.py --skills 500
+
+===================================================================
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from voice_assistant.skills.base import Skill, SkillRegistry  # noqa: E402
+
+
+class _Ctx:
+    def speak(self, text: str) -> None:
+        pass
+
+
+class _IndexedSkill(Skill):
+    def __init__(self, intent: str):
+        self.name = intent
+        self.intents = (intent,)
+
+    def handle(self, ctx, intent_name: str, slots: dict):
+        return intent_name
+
+
+class _LegacySkill(_IndexedSkill):
+    """Pre-registry style: only can_handle, compared one skill at a time."""
+
+    def can_handle(self, intent_name: str) -> bool:
+        return intent_name == self.name
+
+
+def _linear(ctx, intent: str, skills):
+    for sk in skills:
+        if sk.can_handle(intent):
+            return sk.handle(ctx, intent, {}) or ""
+    return ""
+
+
+def _bench(fn, intents, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for it in intents:
+            fn(it)
+        best = min(best, time.perf_counter() - t0)
+    return best / len(intents)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="skill dispatch overhead")
+    ap.add_argument("--skills", type=int, default=500)
+    ap.add_argument("--calls", type=int, default=20_000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    names = [f"intent_{i}" for i in range(args.skills)]
+    legacy = [_LegacySkill(n) for n in names]
+    t0 = time.perf_counter()
+    registry = SkillRegistry(_IndexedSkill(n) for n in names)
+    build = time.perf_counter() - t0
+    ctx = _Ctx()
+    rnd = random.Random(0)
+    uniform = [rnd.choice(names) for _ in range(args.calls)]
+    worst = [names[-1]] * args.calls
+
+    print(f"skills: {args.skills}  registry build: {build * 1000:.2f} ms")
+    for label, intents in (("uniform", uniform), ("last-registered", worst)):
+        lin = _bench(lambda it: _linear(ctx, it, legacy), intents, args.repeat)
+        idx = _bench(lambda it: registry.dispatch(ctx, it, {}), intents, args.repeat)
+        print(
+            f"{label:>16}: linear {lin * 1e6:8.2f} us  "
+            f"indexed {idx * 1e6:6.2f} us  x{lin / idx:.0f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
\ No newline at end of file
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: bench_e2e.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+End-to-end benchmark over every built-in skill. Each command is a WAV clip
+transcribed by the "wav" STT backend and then dispatched through the app's own
+skill registry and AssistantCore. The skills talk to local wttr.in, Wikipedia and
+SMTP stubs and speak through a TTS with a fake engine. Reports commands/s and
+p50/p95/p99 latency per skill.
+
+Usage:
+python benchmarks/bench_e2e.py --n 200 --out results.json
+python benchmarks/bench_e2e.py --baseline results.json --threshold 0.10
+
+Notes:
+- Every weather city and Wikipedia topic is unique, so the response cache and the
+  wikipedia library's memoization never answer for the stubs.
+- --net-ms adds latency to each stub response. --concurrency runs that many
+  commands at once per skill.
+- With --baseline, the exit status is 1 when any skill's throughput drops or its
+  p95 rises by more than --threshold (a fraction) against the stored results;
+  p95 changes under --min-ms are treated as noise.
+
+===================================================================
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+import speech_recognition as sr
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from stubs import FakeEngine, start_http_stub, start_smtp_stub, stub_desktop_io  # noqa: E402
+from voice_assistant.app import AppContext, _register_skills  # noqa: E402
+from voice_assistant.config import Config  # noqa: E402
+from voice_assistant.core import AssistantCore  # noqa: E402
+from voice_assistant.metrics import LatencyHistogram  # noqa: E402
+from voice_assistant.smtp_client import MailQueue  # noqa: E402
+from voice_assistant.stt_backends import SAMPLE_RATE, WavFileBackend  # noqa: E402
+from voice_assistant.tts import TTS  # noqa: E402
+
+COMMANDS = {
+    "time": lambda tag: "what time is it",
+    "weather": lambda tag: f"weather in City{tag}",
+    "wikipedia": lambda tag: f"wikipedia Topic{tag}",
+    "web_search": lambda tag: f"search benchmark {tag}",
+    "joke": lambda tag: "tell me a joke",
+    "system": lambda tag: "shutdown",
+    "email": lambda tag: "send email",
+    "file": lambda tag: "list files",
+}
+
+
+def _tag(i: int) -> str:
+    """Letters only: the weather intent takes a capitalized, alphabetic city name."""
+    out = ""
+    while True:
+        i, r = divmod(i, 26)
+        out = chr(ord("a") + r) + out
+        if not i:
+            return out
+        i -= 1
+
+
+def _clip(seed: int, seconds: float = 0.3) -> sr.AudioData:
+    rng = np.random.default_rng(seed)
+    pcm = (rng.standard_normal(int(SAMPLE_RATE * seconds)) * 4000).astype("<i2").tobytes()
+    return sr.AudioData(pcm, SAMPLE_RATE, 2)
+
+
+def _workload(n: int, warmup: int) -> Tuple[WavFileBackend, Dict[str, List[sr.AudioData]]]:
+    """One clip per command, registered with the wav backend under its transcript."""
+    backend = WavFileBackend()
+    clips: Dict[str, List[sr.AudioData]] = {}
+    seed = 0
+    for skill, phrase in COMMANDS.items():
+        clips[skill] = []
+        for i in range(warmup + n):
+            audio = _clip(seed)
+            seed += 1
+            backend.add(audio, phrase(_tag(seed)))
+            clips[skill].append(audio)
+    return backend, clips
+
+
+def _build(args) -> Tuple[AssistantCore, Dict[str, object]]:
+    latency = args.net_ms / 1000
+    http, base_url = start_http_stub(latency)
+    smtp = start_smtp_stub(latency)
+    stub_desktop_io()
+    cfg = Config(
+        weather_url=base_url,
+        wikipedia_api_url=f"{base_url}/w/api.php",
+        wolfram_app_id=None,
+        allow_system_power=True,  # stub_desktop_io() keeps it from suspending
+        allow_email=True,
+        smtp_host="127.0.0.1",
+        smtp_port=smtp.port,
+        smtp_user=None,
+        smtp_plain=True,
+        email_sender="bench@example.com",
+        cache_path="",
+        file_roots="",  # "list files" lists the working directory; no crawl
+        prewarm_skills=False,
+    )
+    tts = TTS(engine_factory=FakeEngine)
+    mailer = MailQueue.from_config(cfg)
+    core = AssistantCore(AppContext(cfg, tts), _register_skills(cfg, lambda: mailer), timeout=None)
+    return core, {"http": http, "smtp": smtp, "tts": tts, "mailer": mailer}
+
+
+async def _run_skill(
+    core: AssistantCore, backend: WavFileBackend, clips: List[sr.AudioData], concurrency: int
+) -> Tuple[LatencyHistogram, float]:
+    hist = LatencyHistogram()
+    gate = asyncio.Semaphore(concurrency)
+    loop = asyncio.get_running_loop()
+
+    async def one(audio: sr.AudioData) -> None:
+        async with gate:
+            t0 = time.perf_counter()
+            text = await loop.run_in_executor(None, backend.transcribe, audio)
+            ans = await core.handle(text, preempt=False)
+            hist.record(time.perf_counter() - t0)
+            if not ans:
+                raise RuntimeError(f"no answer for {text!r}")
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one(a) for a in clips))
+    return hist, time.perf_counter() - t0
+
+
+async def _bench(core, backend, clips, args) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for skill, audio in clips.items():
+        if args.warmup:
+            await _run_skill(core, backend, audio[: args.warmup], 1)
+        hist, wall = await _run_skill(core, backend, audio[args.warmup :], args.concurrency)
+        s = hist.summary()
+        results[skill] = {
+            "commands": hist.count,
+            "per_s": hist.count / wall,
+            "p50_ms": s["p50"] * 1000,
+            "p95_ms": s["p95"] * 1000,
+            "p99_ms": s["p99"] * 1000,
+        }
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float, min_ms: float = 1.0) -> List[str]:
+    """Regressions of more than ``threshold`` (fraction) against ``baseline``.
+
+    p95 changes smaller than ``min_ms`` are ignored: sub-millisecond skills jitter
+    by more than any sensible threshold from scheduling alone.
+    """
+    problems = []
+    for skill, old in baseline.get("skills", {}).items():
+        new = results["skills"].get(skill)
+        if new is None:
+            continue
+        if new["per_s"] < old["per_s"] * (1 - threshold):
+            problems.append(f"{skill}: {old['per_s']:.1f} -> {new['per_s']:.1f} commands/s")
+        slower = new["p95_ms"] - old["p95_ms"]
+        if slower > old["p95_ms"] * threshold and slower > min_ms:
+            problems.append(f"{skill}: p95 {old['p95_ms']:.2f} -> {new['p95_ms']:.2f} ms")
+    return problems
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="end-to-end skill benchmark against local stubs")
+    ap.add_argument("--n", type=int, default=100, help="measured commands per skill")
+    ap.add_argument("--warmup", type=int, default=1, help="unmeasured commands per skill first")
+    ap.add_argument("--concurrency", type=int, default=1)
+    ap.add_argument("--net-ms", type=float, default=0.0, help="latency added by each stub")
+    ap.add_argument("--out", help="write results as JSON")
+    ap.add_argument("--baseline", help="results JSON to compare against")
+    ap.add_argument("--threshold", type=float, default=0.10, help="allowed regression fraction")
+    ap.add_argument("--min-ms", type=float, default=1.0, help="ignore smaller p95 changes")
+    args = ap.parse_args()
+
+    backend, clips = _workload(args.n, args.warmup)
+    core, stubs = _build(args)
+    try:
+        skills = asyncio.run(_bench(core, backend, clips, args))
+    finally:
+        stubs["mailer"].close()  # email answers once queued; let the queue drain
+        stubs["http"].shutdown()
+        stubs["smtp"].shutdown()
+        stubs["tts"].close()
+    results = {
+        "meta": {
+            "time": time.time(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "n": args.n,
+            "concurrency": args.concurrency,
+            "net_ms": args.net_ms,
+        },
+        "skills": skills,
+    }
+
+    print(f"{'skill':<11}  {'cmd/s':>9}  {'p50 ms':>8}  {'p95 ms':>8}  {'p99 ms':>8}")
+    for skill, r in skills.items():
+        print(
+            f"{skill:<11}  {r['per_s']:>9.1f}  {r['p50_ms']:>8.2f}  {r['p95_ms']:>8.2f}"
+            f"  {r['p99_ms']:>8.2f}"
+        )
+    print(f"emails received by the SMTP stub: {len(stubs['smtp'].messages)}")
+    if args.out:
+        Path(args.out).write_text(json.dumps(results, indent=2), encoding="utf-8")
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        problems = compare(results, baseline, args.threshold, args.min_ms)
+        for p in problems:
+            print(f"REGRESSION {p}")
+        if problems:
+            return 1
+        print(f"no regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
\ No newline at end of file
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: bench_http.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Measures the latency gained from connection reuse (pooled HttpClient vs a fresh
+requests.get per call) and from concurrent fetches, against a local stub server.
+
+Usage:
+python benchmarks/bench_http.py --requests 200 --handshake-ms 30 --latency-ms 50
+
+Notes:
+- --handshake-ms delays every new connection on the server side to stand in for
+  the DNS + TCP + TLS setup a real wttr.in/Wikipedia call pays.
+
+===================================================================
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from voice_assistant.http_client import HttpClient  # noqa: E402
+
+_BODY = json.dumps(
+    {
+        "current_condition": [
+            {"temp_C": "21", "FeelsLikeC": "20", "weatherDesc": [{"value": "Sunny"}]}
+        ]
+    }
+).encode()
+
+
+def start_stub(handshake_s: float, latency_s: float):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+        disable_nagle_algorithm = True
+
+        def setup(self):
+            time.sleep(handshake_s)
+            super().setup()
+
+        def do_GET(self):
+            time.sleep(latency_s)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(_BODY)))
+            self.end_headers()
+            self.wfile.write(_BODY)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def _ms(samples):
+    s = sorted(samples)
+    p95 = s[int(0.95 * (len(s) - 1))]
+    return f"p50 {statistics.median(s) * 1000:7.2f} ms  p95 {p95 * 1000:7.2f} ms"
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="HTTP connection reuse benchmark")
+    ap.add_argument("--requests", type=int, default=200)
+    ap.add_argument("--handshake-ms", type=float, default=30.0)
+    ap.add_argument("--latency-ms", type=float, default=20.0)
+    ap.add_argument("--cities", type=int, default=8)
+    args = ap.parse_args(argv)
+
+    server, base = start_stub(args.handshake_ms / 1000, args.latency_ms / 1000)
+    http = HttpClient()
+    try:
+        cold, warm = [], []
+        for i in range(args.requests):
+            url = f"{base}/City{i}?format=j1"
+            t0 = time.perf_counter()
+            requests.get(url, timeout=6).json()
+            cold.append(time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            http.get(url).json()
+            warm.append(time.perf_counter() - t0)
+        print(f"fresh connection per call: {_ms(cold)}")
+        print(f"pooled HttpClient:         {_ms(warm)}")
+        saved = statistics.median(cold) - statistics.median(warm)
+        print(f"saved per call (median):   {saved * 1000:.2f} ms")
+
+        urls = [f"{base}/City{i}?format=j1" for i in range(args.cities)]
+        t0 = time.perf_counter()
+        for u in urls:
+            http.get(u).json()
+        seq = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        http.map(lambda u: http.get(u).json(), urls)
+        par = time.perf_counter() - t0
+        print(
+            f"{args.cities} cities sequential: {seq * 1000:.1f} ms  "
+            f"concurrent: {par * 1000:.1f} ms"
+        )
+    finally:
+        http.close()
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
\ No newline at end of file
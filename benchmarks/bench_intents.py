@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: bench_intents.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Compares the compiled single-pass intent matcher with the sequential regex loop
+on a synthetic utterance corpus. With --fallback, also times the n-gram fallback
+classifier: model build, save and memory-mapped load, and scoring the corpus's
+pattern misses one at a time against one batch per --batch utterances.
+
+Usage:
+python benchmarks/bench_intents.py --n 100000
+python benchmarks/bench_intents.py --n 20000 --fallback --batch 1000
+
+===================================================================
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from voice_assistant.intents import (  # noqa: E402
+    FallbackParser,
+    _parse_intent_sequential,
+    parse_intent,
+)
+
+_TEMPLATES = [
+    "what's the time",
+    "time in {city}",
+    "weather in {city}",
+    "what's the temperature in {city}",
+    "forecast for tomorrow",
+    "wikipedia {topic}",
+    "who is {topic}",
+    "tell me about {topic}",
+    "search {topic}",
+    "google {topic}",
+    "open {topic}",
+    "tell me a joke",
+    "make me laugh",
+    "sleep",
+    "lock the screen",
+    "send email to bob",
+    "list files",
+    "open file notes",
+    "play some music",
+    "turn the lights on in {city}",
+    "how hot is it outside",
+]
+_CITIES = ["Rome", "New York", "Berlin", "Tehran", "Sao Paulo", "Kyoto"]
+_TOPICS = ["Alan Turing", "Ada Lovelace", "network slicing 6G", "Python", "quantum annealing"]
+_FILLER = ["please", "hey assistant", "um", "quickly", "now", "for me"]
+
+
+def synthetic_corpus(n: int, seed: int = 0) -> List[str]:
+    rnd = random.Random(seed)
+    out = []
+    for _ in range(n):
+        s = rnd.choice(_TEMPLATES).format(city=rnd.choice(_CITIES), topic=rnd.choice(_TOPICS))
+        if rnd.random() < 0.3:
+            s = f"{rnd.choice(_FILLER)} {s}"
+        if rnd.random() < 0.2:
+            s = f"{s} {rnd.choice(_FILLER)}"
+        out.append(s)
+    return out
+
+
+def _time(fn: Callable, corpus: List[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for s in corpus:
+            fn(s)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def bench_fallback(corpus: List[str], batch: int) -> None:
+    from voice_assistant.intent_model import IntentClassifier
+
+    t0 = time.perf_counter()
+    model = IntentClassifier.train()
+    built = time.perf_counter() - t0
+    path = os.path.join(tempfile.mkdtemp(prefix="va-intents-"), "intents.model")
+    model.save(path)
+    t0 = time.perf_counter()
+    IntentClassifier.load(path)
+    loaded = time.perf_counter() - t0
+    print(
+        f"fallback model: {model.weights.shape[0]} examples x {len(model.cols)} n-grams, "
+        f"{os.path.getsize(path) / 1024:.0f} KiB; built in {built * 1000:.1f} ms, "
+        f"mmap load {loaded * 1000:.2f} ms"
+    )
+
+    misses = [s for s in corpus if parse_intent(s) is None]
+    parse = FallbackParser(lambda: model)
+    t0 = time.perf_counter()
+    single = [parse(s) for s in misses]
+    one_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    batched = []
+    for i in range(0, len(misses), batch):
+        batched.extend(parse.parse_many(misses[i : i + batch]))
+    many_s = time.perf_counter() - t0
+    recovered = sum(it is not None for it in batched)
+    assert [i and i.name for i in single] == [i and i.name for i in batched]
+    print(f"pattern misses: {len(misses)}, classified: {recovered}")
+    print(f"one at a time: {one_s * 1e6 / len(misses):.0f} us/utterance")
+    print(f"batches of {batch}: {many_s * 1e6 / len(misses):.1f} us/utterance")
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--n", type=int, default=100_000)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--fallback", action="store_true", help="also time the n-gram fallback")
+    ap.add_argument("--batch", type=int, default=1000, help="fallback batch size")
+    args = ap.parse_args(argv)
+
+    corpus = synthetic_corpus(args.n)
+    mismatches = sum(parse_intent(s) != _parse_intent_sequential(s) for s in corpus)
+    seq = _time(_parse_intent_sequential, corpus, args.repeat)
+    one = _time(parse_intent, corpus, args.repeat)
+    print(f"utterances: {args.n}  mismatches: {mismatches}")
+    print(f"sequential: {seq:.3f}s  ({args.n / seq:,.0f}/s)")
+    print(f"compiled:   {one:.3f}s  ({args.n / one:,.0f}/s)  speedup x{seq / one:.2f}")
+    if args.fallback:
+        bench_fallback(corpus, args.batch)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
\ No newline at end of file
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: bench_server.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Load generator for server mode. Opens 1, 50 and 500 concurrent sessions by
+default, and each session sends commands back to back for a fixed time. Reports
+the sustained requests/s and the p50/p99 latency at each level.
+
+Usage:
+python benchmarks/bench_server.py --sessions 1 50 500 --seconds 10
+python benchmarks/bench_server.py --mode http --url http://127.0.0.1:8765
+
+Notes:
+- Without --url a server is started in a subprocess ("voice-assistant serve").
+  Its weather lookups go to the local HTTP stub from stubs.py (--net-ms adds
+  latency), so nothing leaves the machine.
+- The command mix is time / joke / weather, and every weather city is new, so
+  each weather command reaches the stub.
+
+===================================================================
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import itertools
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+from urllib.parse import urlsplit
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from stubs import start_http_stub  # noqa: E402
+from voice_assistant.metrics import LatencyHistogram  # noqa: E402
+from voice_assistant.server import OP_TEXT, encode_frame, read_message  # noqa: E402
+
+_counter = itertools.count()
+
+
+def _command() -> str:
+    i = next(_counter)
+    kind = i % 3
+    if kind == 0:
+        return "what time is it"
+    if kind == 1:
+        return "tell me a joke"
+    tag = "".join(chr(ord("a") + int(d)) for d in str(i))
+    return f"weather in City{tag}"
+
+
+class _Client:
+    def __init__(self, host: str, port: int, mode: str, session: str):
+        self.host, self.port, self.mode, self.session = host, port, mode, session
+
+    async def connect(self) -> None:
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        if self.mode == "ws":
+            key = base64.b64encode(os.urandom(16)).decode()
+            self.writer.write(
+                f"GET /v1/ws HTTP/1.1\r\nHost: {self.host}\r\nUpgrade: websocket\r\n"
+                f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\n"
+                "Sec-WebSocket-Version: 13\r\n\r\n".encode()
+            )
+            head = await self.reader.readuntil(b"\r\n\r\n")
+            if b" 101 " not in head.split(b"\r\n", 1)[0]:
+                raise RuntimeError(head.decode(errors="replace"))
+
+    async def ask(self, text: str) -> Optional[str]:
+        if self.mode == "ws":
+            self.writer.write(encode_frame(OP_TEXT, text.encode(), mask=True))
+            return json.loads(await read_message(self.reader, self.writer))["answer"]
+        body = json.dumps({"text": text, "session": self.session}).encode()
+        self.writer.write(
+            f"POST /v1/command HTTP/1.1\r\nHost: {self.host}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode()
+            + body
+        )
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        length = next(
+            int(line.split(b":")[1])
+            for line in head.split(b"\r\n")
+            if line.lower().startswith(b"content-length")
+        )
+        return json.loads(await self.reader.readexactly(length))["answer"]
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+async def run_level(
+    host: str, port: int, mode: str, sessions: int, seconds: float
+) -> Tuple[int, float, LatencyHistogram, int]:
+    clients = [_Client(host, port, mode, f"bench-{sessions}-{i}") for i in range(sessions)]
+    for chunk in range(0, sessions, 50):  # don't flood the accept queue
+        await asyncio.gather(*(c.connect() for c in clients[chunk : chunk + 50]))
+    hist = LatencyHistogram()
+    errors = 0
+    stop_at = time.perf_counter() + seconds
+
+    async def worker(client: _Client) -> None:
+        nonlocal errors
+        while time.perf_counter() < stop_at:
+            t0 = time.perf_counter()
+            ans = await client.ask(_command())
+            hist.record(time.perf_counter() - t0)
+            if not ans:
+                errors += 1
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker(c) for c in clients))
+    wall = time.perf_counter() - t0
+    for c in clients:
+        c.close()
+    return hist.count, wall, hist, errors
+
+
+def _start_server(net_ms: float, workers: int) -> Tuple[subprocess.Popen, int, object]:
+    stub, base_url = start_http_stub(net_ms / 1000)
+    env = dict(os.environ)
+    env.update(
+        PYTHONPATH=os.pathsep.join(filter(None, [str(ROOT / "src"), env.get("PYTHONPATH")])),
+        VA_WEATHER_URL=base_url,
+        VA_CACHE_PATH="",
+        VA_FILE_ROOTS="",
+        VA_SERVER_WORKERS=str(workers),
+        VA_SERVER_MAX_SESSIONS="2000",
+    )
+    proc = subprocess.Popen(
+        [sys.executable, "-u", "-m", "voice_assistant.app", "serve", "--port", "0"],
+        env=env, stdout=subprocess.PIPE, text=True,
+    )
+    line = proc.stdout.readline()
+    if not line.startswith("Serving on"):
+        proc.kill()
+        raise RuntimeError(f"server did not start: {line!r}")
+    port = int(line.split()[2].rsplit(":", 1)[1])
+    return proc, port, stub
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="server mode load generator")
+    ap.add_argument("--sessions", type=int, nargs="+", default=[1, 50, 500])
+    ap.add_argument("--seconds", type=float, default=10.0, help="duration of each level")
+    ap.add_argument("--mode", choices=("ws", "http"), default="ws")
+    ap.add_argument("--url", help="existing server, e.g. http://127.0.0.1:8765")
+    ap.add_argument("--net-ms", type=float, default=0.0, help="weather stub latency")
+    ap.add_argument("--workers", type=int, default=64, help="server skill threads")
+    args = ap.parse_args()
+
+    proc = None
+    if args.url:
+        u = urlsplit(args.url)
+        host, port = u.hostname, u.port or 80
+    else:
+        proc, port, _stub = _start_server(args.net_ms, args.workers)
+        host = "127.0.0.1"
+    try:
+        asyncio.run(run_level(host, port, args.mode, 1, 1.0))  # warm-up: load the skills
+        print(f"mode: {args.mode}  {args.seconds:.0f} s per level  stub latency {args.net_ms} ms")
+        print(f"{'sessions':>8}  {'req/s':>9}  {'p50 ms':>8}  {'p99 ms':>8}  {'errors':>6}")
+        for n in args.sessions:
+            count, wall, hist, errors = asyncio.run(
+                run_level(host, port, args.mode, n, args.seconds)
+            )
+            print(
+                f"{n:>8}  {count / wall:>9.1f}  {hist.percentile(0.5) * 1000:>8.2f}"
+                f"  {hist.percentile(0.99) * 1000:>8.2f}  {errors:>6}"
+            )
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(10)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
\ No newline at end of file
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: bench_speculative.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+WAV replay benchmark for speculative dispatch. Clips are streamed in real time
+through the "wav" backend, which emits interim hypotheses. Each clip is followed by
+the end-of-speech pause the endpointer waits for, and a final-decode delay. The
+script measures the time from the end of speech to the answer, with speculation
+off and on.
+
+Usage:
+python benchmarks/bench_speculative.py --n 8 --skill-ms 400 --pause-ms 800
+
+===================================================================
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+import speech_recognition as sr
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from bench_stt import write_synthetic_clips  # noqa: E402
+from voice_assistant.core import AssistantCore  # noqa: E402
+from voice_assistant.skills.base import AsyncSkill, SkillRegistry  # noqa: E402
+from voice_assistant.stt_backends import (  # noqa: E402
+    SAMPLE_RATE,
+    STREAM_CHUNK,
+    WavFileBackend,
+    load_wav,
+    pcm16,
+    pcm_chunks,
+)
+
+
+class _Ctx:
+    def speak(self, text: str) -> None:
+        pass
+
+
+class _Lookup(AsyncSkill):
+    """Stands in for a network skill: answers after a fixed delay."""
+
+    def __init__(self, intent: str, seconds: float, speculative: bool):
+        self.name = intent
+        self.intents = (intent,)
+        self.seconds = seconds
+        self.speculative = speculative
+
+    async def handle_async(self, ctx, intent_name, slots):
+        await asyncio.sleep(self.seconds)
+        return f"{intent_name} {slots}"
+
+
+def _replay(backend, pcm: bytes, chunk_s: float, final_s: float, marks: dict):
+    speech_end = _speech_end(pcm)
+
+    def paced():
+        for pos, chunk in zip(range(0, len(pcm), STREAM_CHUNK), pcm_chunks(pcm)):
+            time.sleep(chunk_s)
+            if pos <= speech_end < pos + len(chunk):
+                marks["speech_end"] = time.perf_counter()
+            yield chunk
+
+    for hyp in backend.stream(paced()):
+        if hyp.final:
+            time.sleep(final_s)
+        yield hyp
+
+
+def _speech_end(pcm: bytes) -> int:
+    """Byte offset of the last voiced sample."""
+    voiced = np.flatnonzero(np.abs(np.frombuffer(pcm, dtype=np.int16).astype(np.int32)) > 500)
+    return 2 * int(voiced[-1]) if len(voiced) else 0
+
+
+async def _run(clips, backend, skills, args, speculate_after: int):
+    core = AssistantCore(_Ctx(), skills, timeout=None, speculate_after=speculate_after)
+    chunk_s = STREAM_CHUNK / 2 / SAMPLE_RATE / args.speed
+    latencies = []
+    final_s = args.final_ms / 1000 / args.speed
+    for text, pcm in clips:
+        marks: dict = {}
+        ans = await core.handle_stream(_replay(backend, pcm, chunk_s, final_s, marks))
+        assert ans, f"no answer for {text!r}"
+        latencies.append((text, time.perf_counter() - marks["speech_end"]))
+    return latencies, core.speculation_stats
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="speculative dispatch WAV replay benchmark")
+    ap.add_argument("--n", type=int, default=8, help="synthetic clips")
+    ap.add_argument("--dir", help="reuse clips with .txt sidecars from this directory")
+    ap.add_argument("--skill-ms", type=float, default=400, help="simulated lookup latency")
+    ap.add_argument("--pause-ms", type=float, default=800, help="end-of-speech silence appended")
+    ap.add_argument("--final-ms", type=float, default=150, help="final decode delay")
+    ap.add_argument("--speculate-after", type=int, default=2)
+    ap.add_argument("--speed", type=float, default=1.0, help="replay faster than real time")
+    args = ap.parse_args()
+
+    root = Path(args.dir or tempfile.mkdtemp(prefix="va-spec-"))
+    if not args.dir:
+        write_synthetic_clips(root, args.n)
+    # Index each clip with the endpointer's trailing silence, as the recognizer hears it.
+    backend = WavFileBackend()
+    silence = b"\0\0" * int(SAMPLE_RATE * args.pause_ms / 1000)
+    clips = []
+    for wav in sorted(root.rglob("*.wav")):
+        if wav.with_suffix(".txt").exists():
+            text = wav.with_suffix(".txt").read_text(encoding="utf-8").strip()
+            pcm = pcm16(load_wav(str(wav))) + silence
+            backend.add(sr.AudioData(pcm, SAMPLE_RATE, 2), text)
+            clips.append((text, pcm))
+    seconds = args.skill_ms / 1000 / args.speed
+    skills = SkillRegistry(
+        [_Lookup(i, seconds, True) for i in ("time", "weather", "wikipedia")]
+        + [_Lookup("joke", seconds, False)]
+    )
+
+    results = {}
+    for label, after in (("sequential", 0), ("speculative", args.speculate_after)):
+        results[label] = asyncio.run(_run(clips, backend, skills, args, after))
+
+    base = [lat for _, lat in results["sequential"][0]]
+    spec = [lat for _, lat in results["speculative"][0]]
+    print(f"clips: {len(clips)}  lookup: {args.skill_ms:.0f} ms  pause: {args.pause_ms:.0f} ms")
+    for label, lats in (("sequential", base), ("speculative", spec)):
+        print(
+            f"{label:>12}: end of speech -> answer  mean {statistics.mean(lats) * 1000:7.1f} ms"
+            f"  p50 {statistics.median(lats) * 1000:7.1f} ms"
+        )
+    print(f"saved: {(statistics.mean(base) - statistics.mean(spec)) * 1000:.1f} ms per utterance")
+    print(f"speculation: {results['speculative'][1]}")
+    per_phrase = defaultdict(list)
+    for (text, b), (_, s) in zip(results["sequential"][0], results["speculative"][0]):
+        per_phrase[text].append(b - s)
+    for text, saved in sorted(per_phrase.items()):
+        print(f"  {text!r:28} saved {statistics.mean(saved) * 1000:7.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
\ No newline at end of file
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: bench_startup.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Startup benchmark: `python -X importtime` cost of importing the app (optionally
+next to importing every skill eagerly, as the app used to), and wall time from
+process start to the first CLI "> " prompt. With --oneshot, also the wall time of
+`voice-assistant "what time is it"`: in-process (VA_DAEMON=0), through a daemon
+that has to start, and through a warm daemon.
+
+Usage:
+python benchmarks/bench_startup.py --runs 5 --top 10 --eager
+python benchmarks/bench_startup.py --oneshot --runs 20
+
+===================================================================
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+EAGER_MODULES = [
+    "voice_assistant.stt",
+    "voice_assistant.vad",
+    "voice_assistant.gui",
+    "voice_assistant.http_client",
+    "voice_assistant.skills.cache",
+    "voice_assistant.skills.skill_time",
+    "voice_assistant.skills.skill_weather",
+    "voice_assistant.skills.skill_wikipedia",
+    "voice_assistant.skills.skill_web",
+    "voice_assistant.skills.skill_jokes",
+    "voice_assistant.skills.skill_system",
+    "voice_assistant.skills.skill_email",
+    "voice_assistant.skills.skill_files",
+]
+
+
+def _env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC), env.get("PYTHONPATH")]))
+    env.setdefault("VA_PREWARM_SKILLS", "0")  # measure the prompt, not the pre-warm thread
+    return env
+
+
+def import_times(modules: List[str]) -> List[Tuple[int, int, str]]:
+    """(self_us, cumulative_us, name) for each top-level import, from -X importtime."""
+    stmt = "import " + ", ".join(modules)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", stmt],
+        env=_env(), capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|", 2)
+        if name[1:2] != " ":  # indented names are nested imports
+            rows.append((int(self_us), int(cum_us), name.strip()))
+    return rows
+
+
+def time_to_prompt() -> float:
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-u", "-m", "voice_assistant.app", "--cli"],
+        env=_env(), stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+    )
+    seen = b""
+    try:
+        while not seen.endswith(b"> "):
+            chunk = proc.stdout.read1(4096)
+            if not chunk:
+                raise RuntimeError(f"CLI exited before the prompt: {seen[-200:]!r}")
+            seen += chunk
+        return time.perf_counter() - t0
+    finally:
+        proc.stdin.close()
+        proc.wait(5)
+
+
+def time_oneshot(env: Dict[str, str]) -> float:
+    t0 = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", "voice_assistant.client", "what time is it"],
+        env=env, stdout=subprocess.DEVNULL, check=True,
+    )
+    return time.perf_counter() - t0
+
+
+def _oneshot(runs: int) -> None:
+    env = _env()
+    env.update(VA_DAEMON_SPEAK="0", VA_FILE_ROOTS="", VA_CACHE_PATH="")
+    env["VA_DAEMON_SOCKET"] = os.path.join(tempfile.mkdtemp(prefix="va-daemon-"), "va.sock")
+    cold = [time_oneshot(dict(env, VA_DAEMON="0")) for _ in range(runs)]
+    first = time_oneshot(env)
+    warm = [time_oneshot(env) for _ in range(runs)]
+    subprocess.run(
+        [sys.executable, "-m", "voice_assistant.app", "daemon", "--stop"],
+        env=env, stdout=subprocess.DEVNULL, check=True,
+    )
+    print(f"one-shot in-process:   median {statistics.median(cold) * 1000:7.1f} ms")
+    print(f"one-shot, daemon start:       {first * 1000:7.1f} ms")
+    print(f"one-shot, warm daemon: median {statistics.median(warm) * 1000:7.1f} ms")
+
+
+def _report(label: str, modules: List[str], runs: int, top: int) -> None:
+    totals = []
+    rows: List[Tuple[int, int, str]] = []
+    for _ in range(runs):
+        rows = import_times(modules)
+        totals.append(sum(cum for _, cum, _ in rows) / 1000)
+    print(f"{label}: imports {statistics.median(totals):.1f} ms (median of {runs})")
+    for _, cum, name in sorted(rows, key=lambda r: -r[1])[:top]:
+        print(f"  {cum / 1000:8.1f} ms  {name}")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("Usage:")[0])
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--top", type=int, default=10, help="slowest top-level imports to list")
+    ap.add_argument(
+        "--eager", action="store_true", help="also time importing every skill up front"
+    )
+    ap.add_argument("--oneshot", action="store_true", help="also time one-shot commands")
+    args = ap.parse_args()
+
+    _report("app", ["voice_assistant.app"], args.runs, args.top)
+    _report("one-shot client", ["voice_assistant.client"], args.runs, args.top)
+    if args.eager:
+        _report("app + all skills", ["voice_assistant.app"] + EAGER_MODULES, args.runs, args.top)
+
+    prompts = [time_to_prompt() for _ in range(args.runs)]
+    print(
+        f"time to first prompt: median {statistics.median(prompts) * 1000:.1f} ms, "
+        f"min {min(prompts) * 1000:.1f} ms over {args.runs} runs"
+    )
+    if args.oneshot:
+        _oneshot(args.runs)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
\ No newline at end of file
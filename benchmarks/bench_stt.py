@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: bench_stt.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Latency/throughput harness: feeds a directory of WAV clips through an STT backend
+and reports real-time factor (processing time / audio time) and per-clip latency.
+
+Usage:
+python benchmarks/bench_stt.py --backend vosk --dir clips/
+python benchmarks/bench_stt.py --backend wav --make-clips clips/ --n 20
+
+Notes:
+- A <clip>.txt next to a clip is its reference transcript (exact-match accuracy).
+- --make-clips writes synthetic tone clips with sidecars, enough for the "wav" backend.
+
+===================================================================
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import statistics
+import struct
+import sys
+import time
+import wave
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from voice_assistant.config import Config  # noqa: E402
+from voice_assistant.stt_backends import audio_seconds, load_wav, make_backend  # noqa: E402
+
+_PHRASES = ["what's the time", "weather in Rome", "wikipedia Alan Turing", "tell me a joke"]
+
+
+def write_synthetic_clips(root: Path, n: int, rate: int = 16000) -> None:
+    """Distinct tone bursts of 1-3 s with silence around them, plus transcript sidecars."""
+    root.mkdir(parents=True, exist_ok=True)
+    for i in range(n):
+        freq, seconds = 220 + 35 * i, 1 + (i % 3)
+        frames = bytearray()
+        for k in range(int(rate * (seconds + 0.5))):
+            voiced = 0.25 * rate <= k < (seconds + 0.25) * rate
+            v = int(8000 * math.sin(2 * math.pi * freq * k / rate)) if voiced else 0
+            frames += struct.pack("<h", v)
+        with wave.open(str(root / f"clip{i:03d}.wav"), "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(rate)
+            w.writeframes(bytes(frames))
+        (root / f"clip{i:03d}.txt").write_text(_PHRASES[i % len(_PHRASES)], encoding="utf-8")
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="STT backend latency harness")
+    ap.add_argument("--backend", default="wav", help="google | vosk | whisper | wav")
+    ap.add_argument("--dir", help="directory of WAV clips")
+    ap.add_argument(
+        "--make-clips", metavar="DIR", help="write synthetic clips to DIR and use them"
+    )
+    ap.add_argument("--n", type=int, default=20, help="number of synthetic clips")
+    ap.add_argument("--model", help="model path/name for offline backends")
+    ap.add_argument("--language", default="en-US")
+    args = ap.parse_args(argv)
+
+    root = args.make_clips or args.dir
+    if not root:
+        ap.error("--dir or --make-clips is required")
+    if args.make_clips:
+        write_synthetic_clips(Path(root), args.n)
+
+    clips = sorted(Path(root).rglob("*.wav"))
+    cfg = Config(stt_backend=args.backend, stt_model_path=args.model, stt_wav_dir=root)
+    t0 = time.perf_counter()
+    backend = make_backend(cfg)
+    load_s = time.perf_counter() - t0
+
+    latencies, audio_total, correct, refs = [], 0.0, 0, 0
+    for clip in clips:
+        audio = load_wav(str(clip))
+        audio_total += audio_seconds(audio)
+        t0 = time.perf_counter()
+        text = backend.transcribe(audio, args.language)
+        latencies.append(time.perf_counter() - t0)
+        ref = clip.with_suffix(".txt")
+        if ref.exists():
+            refs += 1
+            correct += text.strip().lower() == ref.read_text(encoding="utf-8").strip().lower()
+
+    if not latencies:
+        print(f"no WAV clips under {root}")
+        return 1
+    busy = sum(latencies)
+    lat = sorted(latencies)
+    print(f"backend: {backend.name}  clips: {len(clips)}  model load: {load_s * 1000:.1f} ms")
+    print(f"audio: {audio_total:.1f}s  processing: {busy:.3f}s  RTF: {busy / audio_total:.4f}")
+    print(
+        f"throughput: {audio_total / busy:,.1f} audio-s per s  "
+        f"({len(clips) / busy:,.1f} clips/s)"
+    )
+    print(
+        f"latency ms  p50: {statistics.median(lat) * 1000:.2f}"
+        f"  p95: {lat[int(0.95 * (len(lat) - 1))] * 1000:.2f}  max: {lat[-1] * 1000:.2f}"
+    )
+    if refs:
+        print(f"exact-match accuracy: {correct}/{refs}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
\ No newline at end of file
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: bench_tts_stream.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Time-to-first-audio for long answers, spoken as one block vs sentence by sentence.
+The engine and the audio sink are fakes whose synthesis and playback time grow
+with the text length, so the numbers show the pipeline, not a real voice.
+
+Usage:
+python benchmarks/bench_tts_stream.py --synth-ms 0.5 --play-ms 2 --sentences 2 5 10
+
+===================================================================
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from voice_assistant.audio import AudioCache  # noqa: E402
+from voice_assistant.tts import TTS  # noqa: E402
+
+SENTENCE = "Ada Lovelace was an English mathematician who wrote the first published program."
+
+
+class Sink:
+    """Fake audio device: notes when the first sound comes out."""
+
+    available = True
+
+    def __init__(self, play_ms: float):
+        self.play_ms = play_ms
+        self.first: Optional[float] = None
+        self._stop = threading.Event()
+
+    def play(self, data: bytes) -> None:
+        self.sound(len(data))
+
+    def sound(self, chars: int) -> None:
+        if self.first is None:
+            self.first = time.perf_counter()
+        self._stop.clear()
+        self._stop.wait(chars * self.play_ms / 1000)
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+class Engine:
+    """pyttsx3 stand-in: synthesis costs synth_ms per character, then the sink plays."""
+
+    def __init__(self, sink: Sink, synth_ms: float):
+        self.sink = sink
+        self.synth_ms = synth_ms
+        self._pending = None
+
+    def setProperty(self, name, value):
+        pass
+
+    def getProperty(self, name):
+        return None
+
+    def say(self, text):
+        self._pending = text
+
+    def save_to_file(self, text, path):
+        self._pending = (text, path)
+
+    def runAndWait(self):
+        if isinstance(self._pending, tuple):
+            text, path = self._pending
+            time.sleep(len(text) * self.synth_ms / 1000)
+            with open(path, "w") as f:
+                f.write(text)
+            return
+        time.sleep(len(self._pending) * self.synth_ms / 1000)
+        self.sink.sound(len(self._pending))
+
+    def stop(self):
+        self.sink.stop()
+
+
+def run(sentences: int, stream: bool, args) -> tuple:
+    text = " ".join([SENTENCE] * sentences)
+    ttfa: List[float] = []
+    total: List[float] = []
+    for _ in range(args.repeat):
+        sink = Sink(args.play_ms)
+        tts = TTS(
+            engine_factory=lambda: Engine(sink, args.synth_ms),
+            cache=AudioCache(),
+            player=sink,
+            stream=stream,
+        )
+        t0 = time.perf_counter()
+        tts.say(text, wait=True)
+        total.append(time.perf_counter() - t0)
+        ttfa.append(sink.first - t0)
+        tts.close()
+    return statistics.median(ttfa), statistics.median(total), len(text)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="TTS time-to-first-audio benchmark")
+    ap.add_argument("--synth-ms", type=float, default=0.5, help="synthesis ms per character")
+    ap.add_argument("--play-ms", type=float, default=2.0, help="playback ms per character")
+    ap.add_argument("--sentences", type=int, nargs="+", default=[2, 5, 10])
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    for n in args.sentences:
+        (b_first, b_total, chars), (s_first, s_total, _) = run(n, False, args), run(n, True, args)
+        print(
+            f"{n:>3} sentences ({chars} chars): first audio {b_first * 1000:7.1f} -> "
+            f"{s_first * 1000:6.1f} ms ({b_first / s_first:.1f}x), "
+            f"total {b_total * 1000:7.1f} -> {s_total * 1000:7.1f} ms"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
\ No newline at end of file
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: bench_wiki_index.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Offline Wikipedia index benchmark on a synthetic abstracts dump. Measures the
+import rate and peak memory, the index size, and lookup latency for exact titles,
+partial titles and titles with a typo.
+
+Usage:
+python benchmarks/bench_wiki_index.py --pages 200000 --queries 500
+python benchmarks/bench_wiki_index.py --dump enwiki-latest-abstract.xml.gz
+
+===================================================================
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import os
+import random
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from voice_assistant.wiki_index import WikiIndex, import_abstracts  # noqa: E402
+
+_SYLLABLES = "ka lo mi ne ra to su vi an el or ul is ber gan dor mat lin fur qua zen".split()
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+
+
+def make_dump(path: str, pages: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    vocab = list({_word(rng) for _ in range(20_000)})
+    titles = []
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write("<feed>\n")
+        for _ in range(pages):
+            title = " ".join(rng.choice(vocab) for _ in range(rng.randint(1, 3)))
+            body = " ".join(rng.choice(vocab).lower() for _ in range(40))
+            f.write(
+                f"<doc>\n<title>Wikipedia: {title}</title>\n<url>x</url>\n"
+                f"<abstract>{title} is a {body}. It is {body[:60]}.</abstract>\n"
+                "<links><sublink linktype=\"nav\"><anchor>History</anchor><link>x</link>"
+                "</sublink></links>\n</doc>\n"
+            )
+            if len(titles) < 5000:
+                titles.append(title)
+        f.write("</feed>\n")
+    return titles
+
+
+def _typo(title: str, rng: random.Random) -> str:
+    words = title.split()
+    i = rng.randrange(len(words))
+    w = words[i]
+    if len(w) > 4:
+        j = rng.randrange(2, len(w))
+        words[i] = w[:j] + w[j + 1 :]  # drop a letter after the first two
+    return " ".join(words)
+
+
+def _partial(title: str, rng: random.Random) -> str:
+    words = title.split()
+    return words[-1] if len(words) > 1 else words[0][:-2]
+
+
+def _lat(index: WikiIndex, queries: List[str]) -> str:
+    lat, hits = [], 0
+    for q in queries:
+        t0 = time.perf_counter()
+        hits += index.lookup(q) is not None
+        lat.append(time.perf_counter() - t0)
+    lat.sort()
+    p99 = lat[int(0.99 * (len(lat) - 1))]
+    return (
+        f"p50 {statistics.median(lat) * 1000:.3f} ms  p99 {p99 * 1000:.3f} ms"
+        f"  found {hits}/{len(queries)}"
+    )
+
+
+def _maxrss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="offline Wikipedia index benchmark")
+    ap.add_argument("--pages", type=int, default=200_000)
+    ap.add_argument("--queries", type=int, default=500)
+    ap.add_argument("--dump", help="real abstracts dump (default: a synthetic one)")
+    args = ap.parse_args()
+
+    work = tempfile.mkdtemp(prefix="va-wiki-")
+    dump = args.dump or os.path.join(work, "abstract.xml.gz")
+    titles = [] if args.dump else make_dump(dump, args.pages)
+    db = os.path.join(work, "wiki.sqlite3")
+
+    before = _maxrss_mb()
+    t0 = time.perf_counter()
+    n = import_abstracts(dump, db)
+    took = time.perf_counter() - t0
+    print(
+        f"import: {n} pages in {took:.1f} s ({n / took:,.0f} pages/s), "
+        f"peak RSS +{_maxrss_mb() - before:.0f} MB, index {os.path.getsize(db) / 2**20:.0f} MB"
+    )
+
+    index = WikiIndex(db)
+    rng = random.Random(1)
+    if not titles:
+        titles = [r[0] for r in index._db.execute("SELECT title FROM pages LIMIT 5000")]
+    sample = [rng.choice(titles) for _ in range(args.queries)]
+    kinds: List[tuple] = [
+        ("exact", lambda t: t.lower()),
+        ("partial", lambda t: _partial(t, rng)),
+        ("typo", lambda t: _typo(t, rng)),
+    ]
+    for name, make in kinds:
+        fn: Callable[[str], str] = make
+        print(f"{name:>8}: {_lat(index, [fn(t) for t in sample])}")
+    index.close()
+    shutil.rmtree(work, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
\ No newline at end of file
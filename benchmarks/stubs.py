@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: stubs.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Local stand-ins for every external service the skills touch, so the benchmarks
+run offline and give the same results on every run.
+
+Usage:
+from stubs import start_http_stub, start_smtp_stub, FakeEngine, stub_desktop_io
+
+Notes:
+- start_http_stub answers wttr.in-style "/<city>?format=j1" requests and the
+  Wikipedia API calls made by the `wikipedia` library (search, page info,
+  extracts) on one keep-alive server.
+- start_smtp_stub speaks enough SMTP for smtplib (EHLO, AUTH PLAIN, MAIL, RCPT,
+  DATA, RSET, NOOP, QUIT). It keeps received messages and counts connections.
+- FakeEngine is a pyttsx3 engine that "speaks" instantly.
+
+===================================================================
+"""
+from __future__ import annotations
+
+import json
+import socketserver
+import threading
+import time
+import types
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+
+def _weather(city: str) -> dict:
+    return {
+        "current_condition": [
+            {
+                "temp_C": str(10 + len(city) % 20),
+                "FeelsLikeC": "18",
+                "weatherDesc": [{"value": "Sunny"}],
+            }
+        ]
+    }
+
+
+def _wikipedia(params: dict) -> dict:
+    if params.get("list") == "search":
+        return {"query": {"search": [{"title": params.get("srsearch", "")}]}}
+    title = params.get("titles", "")
+    page = {"pageid": 1, "title": title, "fullurl": f"https://en.wikipedia.org/wiki/{title}"}
+    if params.get("prop") == "extracts":
+        page["extract"] = f"{title} is a stub article. It is served locally for benchmarks."
+    return {"query": {"pages": {"1": page}}}
+
+
+def start_http_stub(latency_s: float = 0.0) -> Tuple[ThreadingHTTPServer, str]:
+    """Start the weather + Wikipedia stub; returns (server, base_url)."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like the real services
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            time.sleep(latency_s)
+            url = urlsplit(self.path)
+            if url.path == "/w/api.php":
+                params = {k: v[0] for k, v in parse_qs(url.query, keep_blank_values=True).items()}
+                data = _wikipedia(params)
+            else:
+                data = _weather(unquote(url.path.strip("/")))
+            body = json.dumps(data).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="http-stub", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+class SMTPStub(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, latency_s: float = 0.0):
+        self.latency_s = latency_s
+        self.messages: List[str] = []
+        self.connections = 0
+        self._lock = threading.Lock()
+        super().__init__(("127.0.0.1", 0), _SMTPHandler)
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def _reply(self, line: str) -> None:
+        time.sleep(self.server.latency_s)
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self) -> None:
+        with self.server._lock:
+            self.server.connections += 1
+        self._reply("220 stub ESMTP")
+        data: List[str] = []
+        in_data = False
+        for raw in self.rfile:
+            line = raw.decode("utf-8", "replace").rstrip("\r\n")
+            if in_data:
+                if line == ".":
+                    in_data = False
+                    with self.server._lock:
+                        self.server.messages.append("\n".join(data))
+                    data = []
+                    self._reply("250 OK queued")
+                else:
+                    data.append(line[1:] if line.startswith("..") else line)
+                continue
+            verb = line.split(" ", 1)[0].upper()
+            if verb == "EHLO":
+                self._reply("250-stub\r\n250-8BITMIME\r\n250 AUTH PLAIN")
+            elif verb == "AUTH":
+                self._reply("235 Authentication successful")
+            elif verb == "DATA":
+                in_data = True
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+            elif verb == "QUIT":
+                self._reply("221 Bye")
+                return
+            elif verb in ("HELO", "MAIL", "RCPT", "RSET", "NOOP"):
+                self._reply("250 OK")
+            else:
+                self._reply("502 Command not implemented")
+
+
+def start_smtp_stub(latency_s: float = 0.0) -> SMTPStub:
+    server = SMTPStub(latency_s)
+    threading.Thread(target=server.serve_forever, name="smtp-stub", daemon=True).start()
+    return server
+
+
+class FakeEngine:
+    """pyttsx3 engine stand-in: every call returns at once."""
+
+    def __init__(self):
+        self.props = {"rate": 180, "volume": 1.0, "voice": "fake", "voices": []}
+        self.spoken = 0
+
+    def setProperty(self, name, value):
+        self.props[name] = value
+
+    def getProperty(self, name):
+        return self.props[name]
+
+    def say(self, text):
+        self.spoken += 1
+
+    def save_to_file(self, text, path):
+        pass
+
+    def runAndWait(self):
+        pass
+
+    def stop(self):
+        pass
+
+
+def stub_desktop_io() -> None:
+    """Keep the web, files and system skills from opening browsers, file managers or
+    suspending the machine. Patches only those skill modules' references."""
+    from voice_assistant.skills import skill_files, skill_system, skill_web
+
+    skill_system.subprocess = types.SimpleNamespace(run=lambda *args, **kwargs: None)
+    skill_files._open = lambda path: None
+    skill_web.webbrowser = types.SimpleNamespace(open=lambda *args, **kwargs: True)
\ No newline at end of file
@@ -6,7 +6,7 @@ Project: Desktop Voice Assistant
 File: app.py
 Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
 Created: 2025-10-20
-Updated: 2025-10-20
+Updated: 2026-10-18
 License: MIT License (see LICENSE file for details)
 ===================================================================
 
@@ -16,28 +16,83 @@ Application entry-point: wires config, TTS/STT, intents, skills, and optional GU
 Usage:
 python -m voice_assistant.app --gui
 voice-assistant --cli
+voice-assistant batch transcripts.txt -o intents.jsonl
+voice-assistant serve --port 8765
+voice-assistant wiki-import enwiki-latest-abstract.xml.gz
+voice-assistant "what's the time"    (one-shot, answered by the resident daemon)
+
+Notes:
+- Startup imports only what the first prompt needs. Skills are registered as
+  LazySkill descriptors, and STT, the GUI toolkit and the shared HTTP client and
+  response cache are imported when first used; VA_PREWARM_SKILLS=1 loads the
+  skills on a background thread once the prompt or window is up.
+- Utterances the keyword patterns miss go to the n-gram intent classifier
+  (VA_INTENT_FALLBACK); it and NumPy load at the first miss or in the pre-warm.
+- Commands run on the asyncio AssistantCore, each with a timeout. In the GUI, in
+  /live mode, and at an interactive prompt, a new utterance preempts the one
+  still running. Piped input is answered line by line.
+- "voice-assistant daemon" keeps the TTS engine and the skills loaded behind a
+  Unix socket; client.py is the entry point that starts it and talks to it.
 
 ===================================================================
 """
 from __future__ import annotations
 
 import argparse
-from typing import List, Optional
+import asyncio
+import errno
+import os
+import sys
+import threading
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Generic,
+    Iterable,
+    Iterator,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
 
 from .config import Config
 from .tts import TTS
-from .stt import recognize_once
-from .intents import parse_intent
-from .gui import run_gui
+from .audio import AudioCache
+from .core import AssistantCore, LoopThread
+from .intents import FallbackParser, Intent, parse_intent
+from .metrics import METRICS, JsonDumper, serve_prometheus
+from .transcript import Transcript
+from .skills.base import LazySkill, Skill, SkillRegistry, load_entry_point_skills
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .stt import CaptureSession
+
+T = TypeVar("T")
+
+_SKILLS = f"{__package__}.skills"
+
+
+class _LazyValue(Generic[T]):
+    """Calls ``factory`` on first use and hands back the same object afterwards."""
 
-from .skills.skill_time import TimeSkill
-from .skills.skill_weather import WeatherSkill
-from .skills.skill_wikipedia import WikipediaSkill
-from .skills.skill_web import WebSkill
-from .skills.skill_jokes import JokeSkill
-from .skills.skill_system import SystemSkill
-from .skills.skill_email import EmailSkill
-from .skills.skill_files import FilesSkill
+    def __init__(self, factory: Callable[[], T]):
+        self._factory = factory
+        self._value: Optional[T] = None
+        self._lock = threading.Lock()
+
+    @property
+    def created(self) -> bool:
+        return self._value is not None
+
+    def __call__(self) -> T:
+        if self._value is None:
+            with self._lock:
+                if self._value is None:
+                    self._value = self._factory()
+        return self._value
 
 
 class AppContext:
@@ -49,85 +104,470 @@ class AppContext:
         self.tts.say(text)
 
 
-def _register_skills(cfg: Config) -> List:
-    return [
-        TimeSkill(),
-        WeatherSkill(cfg),
-        WikipediaSkill(cfg),
-        WebSkill(),
-        JokeSkill(),
-        SystemSkill(cfg),
-        EmailSkill(cfg),
-        FilesSkill(),
+def _make_tts(cfg: Config) -> TTS:
+    cache = None
+    if cfg.tts_cache_mb > 0:
+        cache = AudioCache(max_bytes=cfg.tts_cache_mb * 1024 * 1024, disk_dir=cfg.tts_cache_dir)
+    return TTS(
+        rate=cfg.tts_rate,
+        volume=cfg.tts_volume,
+        voice_contains=cfg.tts_voice_contains,
+        cache=cache,
+        wait_ready=False,
+        stream=cfg.tts_stream,
+    )
+
+
+def _make_capture(cfg: Config) -> CaptureSession:
+    # Not started here: the microphone is opened on the first /listen and then kept.
+    from .stt import CaptureSession
+    from .stt_backends import make_backend
+    from .vad import VoiceActivityDetector
+
+    return CaptureSession(
+        language=cfg.locale,
+        calibrate_every=cfg.stt_calibrate_every,
+        backend=make_backend(cfg),
+        vad=(
+            VoiceActivityDetector(aggressiveness=cfg.stt_vad_aggressiveness)
+            if cfg.stt_vad
+            else None
+        ),
+        streaming=cfg.stt_streaming,
+    )
+
+
+def _make_response_cache(cfg: Config) -> Any:
+    from .skills.cache import ResponseCache
+
+    return ResponseCache(cfg.cache_path or None)
+
+
+def _make_http(cfg: Config) -> Any:
+    from .http_client import HttpClient
+
+    return HttpClient.from_config(cfg)
+
+
+def _make_file_index(cfg: Config) -> Any:
+    # Started on first use of the files skill (or by the pre-warm); crawls in the background.
+    from .file_index import FileIndex
+
+    roots = [r for r in cfg.file_roots.split(os.pathsep) if r]
+    if not roots:
+        return None
+    return FileIndex(cfg.file_index_path or None, roots, max_entries=cfg.file_index_max).start()
+
+
+def _make_wiki_index(cfg: Config) -> Any:
+    from .wiki_index import WikiIndex
+
+    return WikiIndex.open(cfg.wikipedia_index)
+
+
+def _make_mailer(cfg: Config) -> Any:
+    from .smtp_client import MailQueue
+
+    return MailQueue.from_config(cfg)
+
+
+def _register_skills(cfg: Config, mailer: Optional[Callable[[], Any]] = None) -> SkillRegistry:
+    # Descriptors only: each skill module is imported when its intent first comes up.
+    # The network skills share one response cache and one HTTP client, built on demand.
+    cache = _LazyValue(lambda: _make_response_cache(cfg))
+    http = _LazyValue(lambda: _make_http(cfg))
+
+    def with_cfg(cls: type) -> Skill:
+        return cls(cfg)
+
+    def with_file_index(cls: type) -> Skill:
+        return cls(_make_file_index(cfg))
+
+    def with_mailer(cls: type) -> Skill:
+        return cls(cfg, mailer() if mailer is not None and cfg.smtp_queue else None)
+
+    def with_network(cls: type) -> Skill:
+        return cls(cfg, cache(), http())
+
+    def with_wiki_index(cls: type) -> Skill:
+        return cls(cfg, cache(), http(), _make_wiki_index(cfg))
+
+    def lookup(name: str, target: str, factory: Optional[Callable[[type], Skill]] = None):
+        # read-only skills: safe to start from an interim transcript
+        return LazySkill(name, (name,), f"{_SKILLS}.{target}", factory, speculative=True)
+
+    builtin = [
+        lookup("time", "skill_time:TimeSkill"),
+        lookup("weather", "skill_weather:WeatherSkill", with_network),
+        lookup("wikipedia", "skill_wikipedia:WikipediaSkill", with_wiki_index),
+        LazySkill("web_search", ("web_search",), f"{_SKILLS}.skill_web:WebSkill"),
+        LazySkill("joke", ("joke",), f"{_SKILLS}.skill_jokes:JokeSkill"),
+        LazySkill("system", ("system",), f"{_SKILLS}.skill_system:SystemSkill", with_cfg),
+        LazySkill("email", ("email",), f"{_SKILLS}.skill_email:EmailSkill", with_mailer),
+        LazySkill("file", ("file",), f"{_SKILLS}.skill_files:FilesSkill", with_file_index),
     ]
+    return SkillRegistry(builtin + load_entry_point_skills(cfg))
 
 
-def _dispatch(ctx: AppContext, text: str, skills: List) -> str:
-    intent = parse_intent(text)
-    if not intent:
-        msg = "Sorry, I didn't understand."
-        ctx.speak(msg)
-        return msg
-    for sk in skills:
-        if sk.can_handle(intent.name):
-            return sk.handle(ctx, intent.name, intent.slots) or ""
-    msg = "I couldn't find a skill to handle that."
-    ctx.speak(msg)
-    return msg
+def _make_parser(cfg: Config) -> Callable[[str], Optional[Intent]]:
+    if not cfg.intent_fallback:
+        return parse_intent
 
+    def load() -> Any:
+        from .intent_model import load_classifier
 
-def run_cli(cfg: Config):
-    tts = TTS(rate=cfg.tts_rate, volume=cfg.tts_volume, voice_contains=cfg.tts_voice_contains)
-    ctx = AppContext(cfg, tts)
-    skills = _register_skills(cfg)
-    print("Type text or /listen to use microphone. Ctrl+C to exit.")
+        return load_classifier(cfg.intent_model_path or None)
+
+    return FallbackParser(
+        load, threshold=cfg.intent_threshold, action_threshold=cfg.intent_action_threshold
+    )
+
+
+def _prewarm(skills: SkillRegistry, parse: Optional[Callable[[str], Any]] = None) -> None:
+    def run() -> None:
+        skills.prewarm()
+        if isinstance(parse, FallbackParser):
+            parse.prewarm()
+
+    threading.Thread(target=run, name="skill-prewarm", daemon=True).start()
+
+
+def _make_core(
+    cfg: Config, ctx: AppContext, skills: SkillRegistry, parse: Callable[[str], Any] = parse_intent
+) -> AssistantCore:
+    return AssistantCore(
+        ctx,
+        skills,
+        timeout=cfg.skill_timeout or None,
+        on_preempt=ctx.tts.stop,
+        parse=parse,
+        speculate_after=cfg.speculate_after,
+    )
+
+
+def _read_lines(
+    loop: asyncio.AbstractEventLoop, lines: "asyncio.Queue[Optional[str]]", ready: threading.Event
+):
+    # input() blocks, so it lives on a daemon thread that can never hold up exit;
+    # ``ready`` says when to show the next prompt.
     while True:
+        ready.wait()
+        ready.clear()
         try:
-            q = input("> ").strip()
-            if q == "/listen":
-                heard = recognize_once(timeout=cfg.recognizer_timeout, language=cfg.locale)
-                print(f"Heard: {heard}")
-                if not heard:
-                    continue
-                ans = _dispatch(ctx, heard, skills)
-                print(ans)
-            else:
-                ans = _dispatch(ctx, q, skills)
-                print(ans)
+            line: Optional[str] = input("> ")
         except (EOFError, KeyboardInterrupt):
-            print("\nBye.")
+            line = None
+        loop.call_soon_threadsafe(lines.put_nowait, line)
+        if line is None:
+            return
+
+
+async def _cli_session(
+    cfg: Config, core: AssistantCore, capture: _LazyValue[CaptureSession], interactive: bool
+):
+    loop = asyncio.get_running_loop()
+    lines: "asyncio.Queue[Optional[str]]" = asyncio.Queue()
+    ready = threading.Event()
+    threading.Thread(
+        target=_read_lines, args=(loop, lines, ready), name="cli-input", daemon=True
+    ).start()
+    running: Set["asyncio.Future[None]"] = set()
+    live: Optional["asyncio.Future[None]"] = None
+
+    def spawn(job: Awaitable[None]) -> "asyncio.Future[None]":
+        task = asyncio.ensure_future(job)
+        running.add(task)
+        task.add_done_callback(running.discard)
+        return task
+
+    async def report(job: Awaitable[Optional[str]]) -> None:
+        try:
+            ans = await job
+        except Exception as e:
+            print(f"Error: {e}")
+            return
+        if ans is not None:
+            print(ans)
+
+    async def listen_once() -> None:
+        heard = await loop.run_in_executor(
+            None, lambda: capture().start().listen(timeout=cfg.recognizer_timeout)
+        )
+        print(f"Heard: {heard}")
+        if heard:
+            await report(core.handle(heard, preempt=interactive))
+
+    def echo(hypotheses: Iterable[Tuple[str, bool]]) -> Iterator[Tuple[str, bool]]:
+        for text, final in hypotheses:
+            if final and text:
+                print(f"Heard: {text}")
+            yield text, final
+
+    async def live_loop() -> None:
+        # Each phrase is dispatched from its hypotheses; with a streaming backend the
+        # lookup may already be running when the speaker stops.
+        session = await loop.run_in_executor(None, lambda: capture().start())
+        while True:
+            hypotheses = await loop.run_in_executor(None, session.next_stream, 0.5)
+            if hypotheses is not None:
+                spawn(report(core.handle_stream(echo(hypotheses))))
+
+    ready.set()
+    while True:
+        q = await lines.get()
+        if q is None:
             break
+        q = q.strip()
+        if live is not None:
+            live.cancel()
+            live = None
+            print("Stopped listening.")
+            if not q:
+                ready.set()
+                continue
+        if q == "/live":
+            print("Listening continuously; press Enter to stop.")
+            live = spawn(live_loop())
+            ready.set()
+            continue
+        job = listen_once() if q == "/listen" else report(core.handle(q, preempt=interactive))
+        if interactive:
+            spawn(job)
+        else:
+            await job
+        ready.set()
+    for task in running:
+        task.cancel()
+    await asyncio.gather(*running, return_exceptions=True)
 
 
-def run_gui_mode(cfg: Config):
-    tts = TTS(rate=cfg.tts_rate, volume=cfg.tts_volume, voice_contains=cfg.tts_voice_contains)
+def run_cli(cfg: Config):
+    tts = _make_tts(cfg)
     ctx = AppContext(cfg, tts)
-    skills = _register_skills(cfg)
+    mailer = _LazyValue(lambda: _make_mailer(cfg))
+    skills = _register_skills(cfg, mailer)
+    parse = _make_parser(cfg)
+    core = _make_core(cfg, ctx, skills, parse)
+    capture = _LazyValue(lambda: _make_capture(cfg))
+    print("Type text, /listen for one phrase or /live for hands-free. Ctrl+C to exit.")
+    if cfg.prewarm_skills:
+        _prewarm(skills, parse)
+    try:
+        asyncio.run(_cli_session(cfg, core, capture, interactive=sys.stdin.isatty()))
+    except KeyboardInterrupt:
+        pass
+    print("\nBye.")
+    if mailer.created:
+        mailer().close()  # deliver what is still queued
+    tts.close()
+    if tts.cache is not None and (tts.cache.hits or tts.cache.misses):
+        print(f"TTS cache: {tts.cache.stats()}")
+    if capture.created:
+        capture().stop()
+        if capture().vad is not None and capture().vad.clips:
+            print(f"VAD: {capture().vad.stats()}")
+
+
+def _gui_callbacks(
+    core: AssistantCore, runner: LoopThread, listen: Callable[[], str]
+) -> Tuple[Callable[[], str], Callable[[str], str]]:
+    """The GUI's on_listen and on_text.
+
+    A spoken command barges in on whatever is still running, as in the CLI. Typed
+    commands don't preempt, so several can be in flight at once.
+    """
 
     def on_listen() -> str:
-        heard = recognize_once(timeout=cfg.recognizer_timeout, language=cfg.locale)
+        heard = listen()
         if heard:
-            _dispatch(ctx, heard, skills)
+            runner.submit(core.handle(heard))  # spoken, not awaited: the mic is free again
         return heard
 
     def on_text(q: str) -> str:
-        return _dispatch(ctx, q, skills)
+        ans = runner.submit(core.handle(q, preempt=False)).result()
+        return ans if ans is not None else "(interrupted)"
+
+    return on_listen, on_text
+
+
+def run_gui_mode(cfg: Config):
+    from .gui import run_gui
+
+    tts = _make_tts(cfg)
+    ctx = AppContext(cfg, tts)
+    mailer = _LazyValue(lambda: _make_mailer(cfg))
+    skills = _register_skills(cfg, mailer)
+    parse = _make_parser(cfg)
+    core = _make_core(cfg, ctx, skills, parse)
+    capture = _LazyValue(lambda: _make_capture(cfg))
+    runner = LoopThread()
+    on_listen, on_text = _gui_callbacks(
+        core, runner, lambda: capture().start().listen(timeout=cfg.recognizer_timeout)
+    )
+    transcript = Transcript(max_lines=cfg.gui_max_lines, spill_path=cfg.gui_transcript_log)
+    on_ready = (lambda: _prewarm(skills, parse)) if cfg.prewarm_skills else None
+    run_gui(cfg.app_name, on_listen, on_text, transcript=transcript, on_ready=on_ready)
+    runner.close()
+    if capture.created:
+        capture().stop()
+    if mailer.created:
+        mailer().close()
+    tts.close()
 
-    run_gui(cfg.app_name, on_listen, on_text)
+
+def run_server(cfg: Config, host: str, port: int):
+    from .server import serve
+
+    mailer = _LazyValue(lambda: _make_mailer(cfg))
+    skills = _register_skills(cfg, mailer)
+    parse = _make_parser(cfg)
+    if cfg.prewarm_skills:
+        _prewarm(skills, parse)
+    try:
+        asyncio.run(serve(cfg, skills, host, port, parse))
+    except KeyboardInterrupt:
+        pass
+    if mailer.created:
+        mailer().close()
+
+
+def run_daemon(cfg: Config, path: str):
+    from .server import serve_unix
+
+    tts = _make_tts(cfg) if cfg.daemon_speak else None
+    mailer = _LazyValue(lambda: _make_mailer(cfg))
+    skills = _register_skills(cfg, mailer)
+    parse = _make_parser(cfg)
+    _prewarm(skills, parse)  # the whole point of the daemon: always load everything up front
+    try:
+        asyncio.run(serve_unix(cfg, skills, path, tts=tts, idle=cfg.daemon_idle, parse=parse))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if mailer.created:
+            mailer().close()
+        if tts is not None:
+            tts.close()
+
+
+def stop_daemon(path: str) -> int:
+    import signal
+
+    from .server import daemon_pid
+
+    pid = daemon_pid(path)
+    if pid is None:
+        print(f"No daemon is serving {path}.")
+        return 1
+    os.kill(pid, signal.SIGTERM)
+    print(f"Stopped the daemon (pid {pid}).")
+    return 0
+
+
+def run_wiki_import(dump: str, path: str) -> int:
+    import time
+
+    from .wiki_index import import_abstracts
+
+    def progress(n: int) -> None:
+        print(f"\r{n:,} pages", end="", flush=True)
+
+    t0 = time.perf_counter()
+    n = import_abstracts(dump, path, progress=progress)
+    print(f"\rIndexed {n:,} pages into {path} in {time.perf_counter() - t0:.0f} s.")
+    return 0
+
+
+def run_once(text: str) -> int:
+    """Answer one command in this process, without the daemon."""
+    cfg = Config()
+    tts = _make_tts(cfg)
+    core = _make_core(cfg, AppContext(cfg, tts), _register_skills(cfg), _make_parser(cfg))
+    ans = asyncio.run(core.handle(text))
+    print(ans if ans is not None else "(interrupted)")
+    tts.close()
+    return 0
 
 
 def main(argv: Optional[list[str]] = None) -> int:
     parser = argparse.ArgumentParser(prog="voice-assistant", description="Desktop Voice Assistant")
     parser.add_argument("--cli", action="store_true", help="run in CLI mode")
     parser.add_argument("--gui", action="store_true", help="run in GUI mode")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="time each pipeline stage; print p50/p95/p99 on exit",
+    )
+    sub = parser.add_subparsers(dest="command")
+    p_batch = sub.add_parser(
+        "batch", help="parse a transcript file offline and write JSONL intents"
+    )
+    p_batch.add_argument("input", help="newline- or JSONL-delimited transcripts ('-' for stdin)")
+    p_batch.add_argument("-o", "--output", default="-", help="JSONL output path ('-' for stdout)")
+    p_batch.add_argument(
+        "-j", "--jobs", type=int, default=os.cpu_count() or 1, help="worker processes"
+    )
+    p_batch.add_argument("--chunk-size", type=int, default=1000, help="utterances per work item")
+    p_batch.add_argument(
+        "--fuzzy", action="store_true", help="classify pattern misses with the n-gram model"
+    )
+    p_serve = sub.add_parser("serve", help="answer many clients over HTTP and WebSocket")
+    p_serve.add_argument("--host", help="bind address (default VA_SERVER_HOST)")
+    p_serve.add_argument("--port", type=int, help="port (default VA_SERVER_PORT)")
+    p_wiki = sub.add_parser("wiki-import", help="build the offline Wikipedia index from a dump")
+    p_wiki.add_argument("dump", help="abstracts dump (enwiki-latest-abstract.xml[.gz|.bz2])")
+    p_wiki.add_argument("-o", "--output", help="index path (default VA_WIKIPEDIA_INDEX)")
+    p_daemon = sub.add_parser("daemon", help="keep engines and skills warm for one-shot commands")
+    p_daemon.add_argument("--socket", help="Unix socket path (default VA_DAEMON_SOCKET)")
+    p_daemon.add_argument("--stop", action="store_true", help="stop the running daemon")
     args = parser.parse_args(argv)
 
+    if args.command == "batch":
+        from .batch import run_batch_files
+
+        fuzzy = None
+        if args.fuzzy:
+            cfg = Config()
+            fuzzy = (cfg.intent_model_path, cfg.intent_threshold)
+        run_batch_files(
+            args.input, args.output, jobs=args.jobs, chunk_size=args.chunk_size, fuzzy=fuzzy
+        )
+        return 0
+
     cfg = Config()
+    if args.command == "wiki-import":
+        return run_wiki_import(args.dump, args.output or cfg.wikipedia_index)
+    if args.command == "daemon" and args.stop:
+        return stop_daemon(args.socket or cfg.daemon_socket)
+    server = dumper = None
+    if args.profile or cfg.metrics_port or cfg.metrics_json:
+        METRICS.enabled = True
+    if cfg.metrics_port:
+        server = serve_prometheus(METRICS, cfg.metrics_port)
+    if cfg.metrics_json:
+        dumper = JsonDumper(cfg.metrics_json, METRICS, cfg.metrics_json_interval)
 
-    if args.gui or not args.cli:
-        run_gui_mode(cfg)
-    else:
-        run_cli(cfg)
+    try:
+        if args.command == "serve":
+            run_server(cfg, args.host or cfg.server_host, args.port or cfg.server_port)
+        elif args.command == "daemon":
+            try:
+                run_daemon(cfg, args.socket or cfg.daemon_socket)
+            except OSError as e:
+                if e.errno != errno.EADDRINUSE:
+                    raise
+                print(e)  # another client started the daemon first
+        elif args.gui or not args.cli:
+            run_gui_mode(cfg)
+        else:
+            run_cli(cfg)
+    finally:
+        if server is not None:
+            server.shutdown()
+        if dumper is not None:
+            dumper.close()
+        if args.profile:
+            print(METRICS.report())
     return 0
 
 
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: audio.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Rendered-speech audio cache and in-memory WAV playback.
+
+Usage:
+from voice_assistant.audio import AudioCache, WavPlayer
+
+Notes:
+- AudioCache is content-addressed by (text, voice, rate, volume): an LRU bounded by
+  bytes in memory, plus an optional directory of <sha256>.wav files on disk.
+- WavPlayer plays WAV bytes via simpleaudio when installed, else winsound on Windows,
+  else aplay/paplay (stdin) on Linux or afplay on macOS.
+
+===================================================================
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import wave
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+try:
+    import simpleaudio  # type: ignore
+except Exception:  # pragma: no cover
+    simpleaudio = None
+
+
+class AudioCache:
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024, disk_dir: Optional[str] = None):
+        self.max_bytes = max_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        if self.disk_dir:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+        self._items: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.synth_seconds = 0.0
+        self.saved_seconds = 0.0
+
+    @staticmethod
+    def key(text: str, voice: Optional[str], rate: int, volume: float) -> str:
+        raw = "\x1f".join([text, voice or "", str(int(rate)), f"{float(volume):.3f}"])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                self.saved_seconds += item[1]
+                return item[0]
+        data = self._read_disk(key)
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._store(key, data, 0.0)
+        return data
+
+    def put(self, key: str, data: bytes, synth_seconds: float = 0.0) -> None:
+        with self._lock:
+            self.synth_seconds += synth_seconds
+            self._store(key, data, synth_seconds)
+        self._write_disk(key, data)
+
+    def _store(self, key: str, data: bytes, synth_seconds: float) -> None:
+        if len(data) > self.max_bytes:
+            return
+        old = self._items.pop(key, None)
+        if old is not None:
+            self._size -= len(old[0])
+            synth_seconds = synth_seconds or old[1]
+        self._items[key] = (data, synth_seconds)
+        self._size += len(data)
+        while self._size > self.max_bytes:
+            _, (evicted, _) = self._items.popitem(last=False)
+            self._size -= len(evicted)
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        if not self.disk_dir:
+            return None
+        try:
+            return (self.disk_dir / f"{key}.wav").read_bytes()
+        except OSError:
+            return None
+
+    def _write_disk(self, key: str, data: bytes) -> None:
+        if not self.disk_dir:
+            return
+        path = self.disk_dir / f"{key}.wav"
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self.disk_dir, suffix=".part")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "entries": len(self._items),
+                "bytes": self._size,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "synth_seconds": round(self.synth_seconds, 3),
+                "saved_seconds": round(self.saved_seconds, 3),
+            }
+
+
+class WavPlayer:
+    """Blocking WAV-bytes player whose stop() may be called from another thread."""
+
+    def __init__(self):
+        self._proc: Optional[subprocess.Popen] = None
+        self._play_obj = None
+        self._cmd = None
+        if simpleaudio is not None:
+            self.backend = "simpleaudio"
+        elif sys.platform.startswith("win"):
+            self.backend = "winsound"
+        elif sys.platform == "darwin" and shutil.which("afplay"):
+            self.backend, self._cmd = "afplay", ["afplay"]
+        elif shutil.which("aplay"):
+            self.backend, self._cmd = "aplay", ["aplay", "-q", "-"]
+        elif shutil.which("paplay"):
+            self.backend, self._cmd = "paplay", ["paplay"]
+        else:
+            self.backend = None
+
+    @property
+    def available(self) -> bool:
+        return self.backend is not None
+
+    def play(self, data: bytes) -> None:
+        if self.backend == "simpleaudio":
+            with wave.open(io.BytesIO(data)) as w:
+                frames = w.readframes(w.getnframes())
+                self._play_obj = simpleaudio.play_buffer(
+                    frames, w.getnchannels(), w.getsampwidth(), w.getframerate()
+                )
+            self._play_obj.wait_done()
+            self._play_obj = None
+        elif self.backend == "winsound":
+            import winsound  # type: ignore
+
+            winsound.PlaySound(data, winsound.SND_MEMORY)
+        elif self.backend == "afplay":
+            # afplay cannot read stdin, so it gets a short-lived temp file.
+            fd, tmp = tempfile.mkstemp(suffix=".wav")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                self._proc = subprocess.Popen(self._cmd + [tmp])
+                self._proc.wait()
+            finally:
+                self._proc = None
+                os.unlink(tmp)
+        elif self._cmd:
+            self._proc = subprocess.Popen(self._cmd, stdin=subprocess.PIPE)
+            try:
+                self._proc.communicate(data)
+            except (BrokenPipeError, OSError):
+                pass
+            finally:
+                self._proc = None
+
+    def stop(self) -> None:
+        if self._play_obj is not None:
+            self._play_obj.stop()
+        proc = self._proc
+        if proc is not None and proc.poll() is None:
+            proc.terminate()
+        if self.backend == "winsound":
+            import winsound  # type: ignore
+
+            winsound.PlaySound(None, winsound.SND_PURGE)
\ No newline at end of file
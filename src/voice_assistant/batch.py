@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: batch.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Offline batch intent parsing for transcript corpora (regression & analytics replays).
+
+Usage:
+voice-assistant batch transcripts.jsonl -o intents.jsonl --jobs 8
+
+Notes:
+- Input is one utterance per line, either plain text or a JSON object with a "text"
+  field (an "id" field is copied through). "-" reads stdin / writes stdout.
+- Chunks are fanned out to a process pool and written back in input order; at most
+  a few chunks per worker are in flight, so memory stays bounded for any input size.
+- With --fuzzy, each chunk's pattern misses go through the n-gram classifier in
+  one call, and those records get a "score". The model file is built once up
+  front and memory-mapped by every worker.
+
+===================================================================
+"""
+from __future__ import annotations
+
+import json
+import sys
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import IO, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .intents import FallbackParser, parse_intent
+
+# (line number, id or None, text)
+Record = Tuple[int, Optional[object], str]
+# (model path or "" for in-memory, threshold)
+Fuzzy = Tuple[str, float]
+
+_FALLBACK: Dict[Fuzzy, FallbackParser] = {}
+
+
+def iter_transcripts(lines: Iterable[str]) -> Iterator[Record]:
+    for n, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        rid = None
+        if line.startswith("{"):
+            try:
+                obj = json.loads(line)
+            except ValueError:
+                obj = None
+            if isinstance(obj, dict):
+                rid = obj.get("id")
+                line = str(obj.get("text") or "")
+        yield n, rid, line
+
+
+def _load_model(path: str):
+    from .intent_model import load_classifier
+
+    return load_classifier(path or None)
+
+
+def _fallback_parser(fuzzy: Fuzzy) -> FallbackParser:
+    # One per worker process, kept across chunks.
+    if fuzzy not in _FALLBACK:
+        path, threshold = fuzzy
+        _FALLBACK[fuzzy] = FallbackParser(partial(_load_model, path), threshold)
+    return _FALLBACK[fuzzy]
+
+
+def parse_chunk(chunk: List[Record], fuzzy: Optional[Fuzzy] = None) -> str:
+    """Parse one chunk and return its JSONL output (serialization happens in the worker)."""
+    texts = [text for _, _, text in chunk]
+    if fuzzy is not None:
+        intents = _fallback_parser(fuzzy).parse_many(texts)
+    else:
+        intents = [parse_intent(text) for text in texts]
+    out = []
+    for (n, rid, text), intent in zip(chunk, intents):
+        rec = {"line": n, "text": text}
+        if rid is not None:
+            rec["id"] = rid
+        rec["intent"] = intent.name if intent else None
+        rec["slots"] = intent.slots if intent else {}
+        if intent is not None and intent.score is not None:
+            rec["score"] = round(intent.score, 3)
+        out.append(json.dumps(rec, ensure_ascii=False))
+    return "\n".join(out) + "\n" if out else ""
+
+
+def _chunked(records: Iterable[Record], size: int) -> Iterator[List[Record]]:
+    it = iter(records)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_batch(
+    src: IO[str],
+    dst: IO[str],
+    jobs: int = 1,
+    chunk_size: int = 1000,
+    executor: Optional[Executor] = None,
+    fuzzy: Optional[Fuzzy] = None,
+) -> int:
+    """Stream ``src`` through the intent parser into ``dst``; returns the record count."""
+    chunks = _chunked(iter_transcripts(src), max(1, chunk_size))
+    parse = partial(parse_chunk, fuzzy=fuzzy)
+    count = 0
+    if fuzzy is not None and fuzzy[0]:
+        _load_model(fuzzy[0])  # build a missing or stale model file before the workers map it
+    if jobs <= 1 and executor is None:
+        for chunk in chunks:
+            dst.write(parse(chunk))
+            count += len(chunk)
+        return count
+
+    own = executor is None
+    pool = executor or ProcessPoolExecutor(max_workers=jobs)
+    window = max(2, 2 * jobs)
+    pending: Deque[Tuple[Future, int]] = deque()
+    try:
+        for chunk in chunks:
+            pending.append((pool.submit(parse, chunk), len(chunk)))
+            if len(pending) >= window:
+                fut, size = pending.popleft()
+                dst.write(fut.result())
+                count += size
+        while pending:
+            fut, size = pending.popleft()
+            dst.write(fut.result())
+            count += size
+    finally:
+        if own:
+            pool.shutdown(cancel_futures=True)
+    return count
+
+
+def run_batch_files(
+    input_path: str,
+    output_path: str = "-",
+    jobs: int = 1,
+    chunk_size: int = 1000,
+    fuzzy: Optional[Fuzzy] = None,
+) -> int:
+    src = sys.stdin if input_path == "-" else open(input_path, encoding="utf-8")
+    dst = sys.stdout if output_path == "-" else open(output_path, "w", encoding="utf-8")
+    try:
+        return run_batch(src, dst, jobs=jobs, chunk_size=chunk_size, fuzzy=fuzzy)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
\ No newline at end of file
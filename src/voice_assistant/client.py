@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: client.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Thin one-shot client for the resident daemon, and the "voice-assistant" entry
+point. A free-text command is sent to the daemon over a Unix domain socket and
+the reply is printed. The daemon is started first if it isn't running. Anything
+else (flags, subcommands, no arguments) goes to app.main as before.
+
+Usage:
+voice-assistant "what's the time"
+voice-assistant tell me a joke
+voice-assistant daemon --stop
+
+Notes:
+- This module imports only the standard library pieces it needs (json, os,
+  socket, sys) and paths.py. The engines, skills and config live in the daemon, so a warm
+  command costs one connect and one request.
+- The request is the server's POST /v1/command over the socket (see server.py).
+- Without AF_UNIX, or with VA_DAEMON=0, the command runs in this process.
+- The daemon logs to <socket>.log and exits after VA_DAEMON_IDLE idle seconds.
+
+===================================================================
+"""
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from .paths import default_socket_path
+
+_COMMANDS = ("batch", "serve", "daemon", "wiki-import")
+
+
+class DaemonError(Exception):
+    pass
+
+
+def socket_path() -> str:
+    return os.getenv("VA_DAEMON_SOCKET") or default_socket_path()
+
+
+def _connect(path: str, timeout: float) -> socket.socket:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def ask(text: str, path: Optional[str] = None, timeout: float = 60.0) -> Dict[str, Any]:
+    """Send one command to the daemon; returns the server's JSON reply.
+
+    Raises OSError (FileNotFoundError, ConnectionRefusedError) if nobody is listening.
+    """
+    body = json.dumps({"text": text}).encode()
+    with _connect(path or socket_path(), timeout) as sock:
+        sock.sendall(
+            b"POST /v1/command HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+            b"Content-Length: %d\r\nConnection: close\r\n\r\n" % len(body) + body
+        )
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    head, _, payload = b"".join(chunks).partition(b"\r\n\r\n")
+    try:
+        status = int(head.split(b" ", 2)[1])
+        data = json.loads(payload)
+    except (IndexError, ValueError):
+        raise DaemonError("malformed reply from the daemon")
+    if status != 200:
+        raise DaemonError(data.get("error", f"HTTP {status}"))
+    return data
+
+
+def start_daemon(path: Optional[str] = None, timeout: float = 30.0) -> None:
+    """Start the daemon in the background and wait until its socket accepts connections."""
+    import subprocess
+
+    path = path or socket_path()
+    os.makedirs(os.path.dirname(path) or ".", mode=0o700, exist_ok=True)
+    with open(path + ".log", "ab") as log:
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "voice_assistant.app", "daemon", "--socket", path],
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=log,
+            start_new_session=True,  # outlives this client and its terminal
+        )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            _connect(path, 1.0).close()
+            return
+        except OSError:
+            pass
+        # Exit status 0 means another daemon won the start-up race; keep waiting for it.
+        if proc.poll():
+            raise DaemonError(f"the daemon exited with status {proc.returncode}; see {path}.log")
+        time.sleep(0.02)
+    raise DaemonError(f"the daemon did not start within {timeout:.0f} s; see {path}.log")
+
+
+def run_command(text: str, path: Optional[str] = None) -> Optional[str]:
+    """The daemon's answer to ``text``, starting the daemon if needed."""
+    try:
+        return ask(text, path)["answer"]
+    except (FileNotFoundError, ConnectionRefusedError):
+        start_daemon(path)
+        return ask(text, path)["answer"]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0].startswith("-") or argv[0] in _COMMANDS:
+        from .app import main as app_main
+
+        return app_main(argv)
+    text = " ".join(argv)
+    if not hasattr(socket, "AF_UNIX") or os.getenv("VA_DAEMON", "1") != "1":
+        from .app import run_once
+
+        return run_once(text)
+    try:
+        ans = run_command(text)
+    except (OSError, DaemonError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(ans if ans is not None else "(interrupted)")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
\ No newline at end of file
@@ -6,7 +6,7 @@ Project: Desktop Voice Assistant
 File: config.py
 Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
 Created: 2025-10-20
-Updated: 2025-10-20
+Updated: 2026-10-18
 License: MIT License (see LICENSE file for details)
 ===================================================================
 
@@ -29,6 +29,8 @@ import os
 from pathlib import Path
 from typing import Dict
 
+from .paths import default_socket_path
+
 try:
     from dotenv import load_dotenv
 
@@ -43,6 +45,15 @@ class Config:
     locale: str = os.getenv("VA_LOCALE", "en-US")
     wolfram_app_id: str | None = os.getenv("WOLFRAM_APP_ID")
     default_city: str = os.getenv("VA_DEFAULT_CITY", "Rome")
+    # Service endpoints (overridable for mirrors and local stubs)
+    weather_url: str = os.getenv("VA_WEATHER_URL", "https://wttr.in")
+    wikipedia_api_url: str | None = os.getenv("VA_WIKIPEDIA_API")
+    # Local summary index built with "voice-assistant wiki-import" (used if the file
+    # exists); offline mode never falls back to the live API
+    wikipedia_index: str = os.getenv(
+        "VA_WIKIPEDIA_INDEX", str(Path.home() / ".cache" / "voice_assistant" / "wikipedia.sqlite3")
+    )
+    wikipedia_offline: bool = os.getenv("VA_WIKIPEDIA_OFFLINE", "0") == "1"
 
     # Safety & feature flags
     allow_system_power: bool = os.getenv("VA_ALLOW_SYSTEM_POWER", "0") == "1"
@@ -54,15 +65,108 @@ class Config:
     smtp_user: str | None = os.getenv("VA_SMTP_USER")
     smtp_password: str | None = os.getenv("VA_SMTP_PASSWORD")
     smtp_use_tls: bool = os.getenv("VA_SMTP_TLS", "1") == "1"
+    # Plain SMTP without TLS, for a local relay or mail catcher
+    smtp_plain: bool = os.getenv("VA_SMTP_PLAIN", "0") == "1"
     email_sender: str | None = os.getenv("VA_EMAIL_SENDER")
+    # Send from a background queue over one reused session (see smtp_client.py)
+    smtp_queue: bool = os.getenv("VA_SMTP_QUEUE", "1") == "1"
+    smtp_batch_size: int = int(os.getenv("VA_SMTP_BATCH", "20"))
+    smtp_idle_timeout: float = float(os.getenv("VA_SMTP_IDLE", "60"))
 
     # STT engine
     recognizer_timeout: int = int(os.getenv("VA_RECOGNIZER_TIMEOUT", "6"))
+    # Backend: google | vosk | whisper | wav (see stt_backends.py)
+    stt_backend: str = os.getenv("VA_STT_BACKEND", "google")
+    stt_model_path: str | None = os.getenv("VA_STT_MODEL")
+    stt_wav_dir: str | None = os.getenv("VA_STT_WAV_DIR")
+    # Voice activity detection in front of the backend (webrtcvad level 0-3 if installed)
+    stt_vad: bool = os.getenv("VA_STT_VAD", "0") == "1"
+    stt_vad_aggressiveness: int = int(os.getenv("VA_STT_VAD_LEVEL", "2"))
+    # Seconds between ambient-noise recalibrations of the live microphone stream
+    stt_calibrate_every: float = float(os.getenv("VA_STT_CALIBRATE_EVERY", "300"))
 
     # TTS voice preferences (pyttsx3 property names)
     tts_rate: int = int(os.getenv("VA_TTS_RATE", "180"))
     tts_volume: float = float(os.getenv("VA_TTS_VOLUME", "1.0"))
     tts_voice_contains: str | None = os.getenv("VA_TTS_VOICE", None)
+    # Audio cache for phrases spoken more than once (0 MB disables it; disk tier optional)
+    tts_cache_mb: int = int(os.getenv("VA_TTS_CACHE_MB", "16"))
+    tts_cache_dir: str | None = os.getenv("VA_TTS_CACHE_DIR")
+    # Speak long answers sentence by sentence instead of as one block
+    tts_stream: bool = os.getenv("VA_TTS_STREAM", "1") == "1"
+
+    # File index for "open file ..." (os.pathsep-separated roots). Opt-in: nothing is
+    # crawled until roots are set.
+    file_roots: str = os.getenv("VA_FILE_ROOTS", "")
+    file_index_path: str = os.getenv(
+        "VA_FILE_INDEX", str(Path.home() / ".cache" / "voice_assistant" / "files.sqlite3")
+    )
+    file_index_max: int = int(os.getenv("VA_FILE_INDEX_MAX", "200000"))
+
+    # Skill response cache, in memory unless VA_CACHE_PATH names a SQLite file.
+    # Entries past their TTL are still served, and refreshed in the background, until
+    # cache_stale_factor x TTL.
+    cache_path: str = os.getenv("VA_CACHE_PATH", "")
+    weather_cache_ttl: float = float(os.getenv("VA_WEATHER_TTL", "600"))
+    wikipedia_cache_ttl: float = float(os.getenv("VA_WIKIPEDIA_TTL", "86400"))
+    cache_stale_factor: float = float(os.getenv("VA_CACHE_STALE_FACTOR", "6"))
+
+    # Query Wikipedia and WolframAlpha in parallel; a Wikipedia answer arriving within
+    # wikipedia_prefer_ms of the start is preferred over an earlier Wolfram one
+    wikipedia_hedge: bool = os.getenv("VA_WIKIPEDIA_HEDGE", "1") == "1"
+    wikipedia_prefer_ms: float = float(os.getenv("VA_WIKIPEDIA_PREFER_MS", "300"))
+
+    # Shared HTTP client: connections kept per host, retries with exponential backoff
+    http_pool_size: int = int(os.getenv("VA_HTTP_POOL", "10"))
+    http_retries: int = int(os.getenv("VA_HTTP_RETRIES", "2"))
+    http_backoff: float = float(os.getenv("VA_HTTP_BACKOFF", "0.3"))
+    http_timeout: float = float(os.getenv("VA_HTTP_TIMEOUT", "6"))
+
+    # Stream audio to the STT backend while the user speaks (vosk / wav give interim
+    # results); read-only skills start once speculate_after interim hypotheses in a
+    # row agree on the intent (0 = never speculate)
+    stt_streaming: bool = os.getenv("VA_STT_STREAMING", "0") == "1"
+    speculate_after: int = int(os.getenv("VA_SPECULATE_AFTER", "2"))
+
+    # Classify what the keyword patterns miss with the n-gram model (intent_model.py);
+    # matches under the threshold are dropped. The model file is rebuilt when stale.
+    intent_fallback: bool = os.getenv("VA_INTENT_FALLBACK", "1") == "1"
+    intent_threshold: float = float(os.getenv("VA_INTENT_THRESHOLD", "0.35"))
+    # Stricter bar for fallback matches that act (web search opens a browser)
+    intent_action_threshold: float = float(os.getenv("VA_INTENT_ACTION_THRESHOLD", "0.5"))
+    intent_model_path: str = os.getenv(
+        "VA_INTENT_MODEL", str(Path.home() / ".cache" / "voice_assistant" / "intents.model")
+    )
+
+    # Seconds a command may run before it is abandoned (0 = no limit)
+    skill_timeout: float = float(os.getenv("VA_SKILL_TIMEOUT", "20"))
+
+    # Server mode (voice-assistant serve): HTTP + WebSocket for many thin clients
+    server_host: str = os.getenv("VA_SERVER_HOST", "127.0.0.1")
+    server_port: int = int(os.getenv("VA_SERVER_PORT", "8765"))
+    server_token: str | None = os.getenv("VA_SERVER_TOKEN")
+    server_workers: int = int(os.getenv("VA_SERVER_WORKERS", "64"))
+    server_max_sessions: int = int(os.getenv("VA_SERVER_MAX_SESSIONS", "1000"))
+    session_ttl: float = float(os.getenv("VA_SESSION_TTL", "600"))
+
+    # Resident daemon for one-shot commands (voice-assistant "..."): its Unix socket,
+    # idle seconds before it exits (0 = never) and whether it speaks the answers
+    daemon_socket: str = os.getenv("VA_DAEMON_SOCKET") or default_socket_path()
+    daemon_idle: float = float(os.getenv("VA_DAEMON_IDLE", "1800"))
+    daemon_speak: bool = os.getenv("VA_DAEMON_SPEAK", "1") == "1"
+
+    # Stage latency metrics: Prometheus text on 127.0.0.1:<port> (0 = off) and/or a
+    # JSON snapshot rewritten every metrics_json_interval seconds
+    metrics_port: int = int(os.getenv("VA_METRICS_PORT", "0"))
+    metrics_json: str | None = os.getenv("VA_METRICS_JSON")
+    metrics_json_interval: float = float(os.getenv("VA_METRICS_JSON_EVERY", "60"))
+
+    # Import and build the skills in the background once the prompt or window is up
+    prewarm_skills: bool = os.getenv("VA_PREWARM_SKILLS", "1") == "1"
+
+    # GUI transcript pane: lines kept in memory; older ones spill to this log file
+    gui_max_lines: int = int(os.getenv("VA_GUI_MAX_LINES", "5000"))
+    gui_transcript_log: str | None = os.getenv("VA_GUI_TRANSCRIPT_LOG")
 
     extra: Dict[str, str] = field(default_factory=dict)
 
@@ -72,15 +176,67 @@ class Config:
             "locale": self.locale,
             "wolfram_app_id": bool(self.wolfram_app_id),
             "default_city": self.default_city,
+            "weather_url": self.weather_url,
+            "wikipedia_api_url": self.wikipedia_api_url,
+            "wikipedia_index": self.wikipedia_index,
+            "wikipedia_offline": self.wikipedia_offline,
             "allow_system_power": self.allow_system_power,
             "allow_email": self.allow_email,
             "smtp_host": bool(self.smtp_host),
             "smtp_user": bool(self.smtp_user),
+            "smtp_plain": self.smtp_plain,
+            "smtp_queue": self.smtp_queue,
+            "smtp_batch_size": self.smtp_batch_size,
+            "smtp_idle_timeout": self.smtp_idle_timeout,
             "email_sender": bool(self.email_sender),
             "recognizer_timeout": self.recognizer_timeout,
+            "stt_backend": self.stt_backend,
+            "stt_model_path": self.stt_model_path,
+            "stt_wav_dir": self.stt_wav_dir,
+            "stt_vad": self.stt_vad,
+            "stt_vad_aggressiveness": self.stt_vad_aggressiveness,
+            "stt_calibrate_every": self.stt_calibrate_every,
             "tts_rate": self.tts_rate,
             "tts_volume": self.tts_volume,
             "tts_voice_contains": self.tts_voice_contains,
+            "tts_cache_mb": self.tts_cache_mb,
+            "tts_cache_dir": self.tts_cache_dir,
+            "tts_stream": self.tts_stream,
+            "file_roots": self.file_roots,
+            "file_index_path": self.file_index_path,
+            "file_index_max": self.file_index_max,
+            "cache_path": self.cache_path,
+            "weather_cache_ttl": self.weather_cache_ttl,
+            "wikipedia_cache_ttl": self.wikipedia_cache_ttl,
+            "cache_stale_factor": self.cache_stale_factor,
+            "wikipedia_hedge": self.wikipedia_hedge,
+            "wikipedia_prefer_ms": self.wikipedia_prefer_ms,
+            "http_pool_size": self.http_pool_size,
+            "http_retries": self.http_retries,
+            "http_backoff": self.http_backoff,
+            "http_timeout": self.http_timeout,
+            "stt_streaming": self.stt_streaming,
+            "speculate_after": self.speculate_after,
+            "intent_fallback": self.intent_fallback,
+            "intent_threshold": self.intent_threshold,
+            "intent_action_threshold": self.intent_action_threshold,
+            "intent_model_path": self.intent_model_path,
+            "skill_timeout": self.skill_timeout,
+            "server_host": self.server_host,
+            "server_port": self.server_port,
+            "server_token": bool(self.server_token),
+            "server_workers": self.server_workers,
+            "server_max_sessions": self.server_max_sessions,
+            "session_ttl": self.session_ttl,
+            "daemon_socket": self.daemon_socket,
+            "daemon_idle": self.daemon_idle,
+            "daemon_speak": self.daemon_speak,
+            "metrics_port": self.metrics_port,
+            "metrics_json": self.metrics_json,
+            "metrics_json_interval": self.metrics_json_interval,
+            "prewarm_skills": self.prewarm_skills,
+            "gui_max_lines": self.gui_max_lines,
+            "gui_transcript_log": self.gui_transcript_log,
         }
 
     @staticmethod
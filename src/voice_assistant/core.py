@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: core.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Asyncio core: parses an utterance, awaits its skills with a timeout, and lets a
+newer utterance preempt one that is still running.
+
+Usage:
+core = AssistantCore(ctx, registry, timeout=20, on_preempt=tts.stop)
+answer = await core.handle("what's the weather in Paris")
+
+Notes:
+- Every command gets a CancelToken. Async skills are cancelled outright; blocking
+  skills keep running on their executor thread, but the token is set so they can
+  bail out early and anything they still try to speak is dropped.
+- handle() returns None when the command was preempted by a newer one.
+- handle_stream() takes interim STT hypotheses. Once the parsed intent has been
+  the same for `speculate_after` hypotheses in a row, and every skill for it is
+  marked speculative, the skills start before the utterance ends. Their speech is
+  held back until the final transcript confirms the intent. If the final
+  transcript parses differently, the speculative run is cancelled and discarded.
+- Stages are timed into METRICS: "parse", "command" (dispatch to answer) and
+  "skill.<name>" for each skill run.
+- LoopThread runs the loop on a background thread for front-ends that own the
+  main thread (Tk), handing back concurrent.futures.Future objects.
+
+===================================================================
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from .intents import Intent, parse_intent
+from .metrics import METRICS
+from .skills.base import Context, SkillRegistry
+
+T = TypeVar("T")
+
+NOT_UNDERSTOOD = "Sorry, I didn't understand."
+NO_SKILL = "I couldn't find a skill to handle that."
+TIMED_OUT = "Sorry, that took too long."
+
+
+class CommandCancelled(Exception):
+    """Raised by CancelToken.raise_if_cancelled inside a skill."""
+
+
+class CancelToken:
+    """Thread-safe flag shared between the core and the skill running a command."""
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise CommandCancelled()
+
+
+class CommandContext:
+    """Per-command view of the app context: carries the token, mutes stale speech."""
+
+    def __init__(self, ctx: Context, token: CancelToken):
+        self._ctx = ctx
+        self.token = token
+
+    def speak(self, text: str) -> None:
+        if not self.token.cancelled:
+            self._ctx.speak(text)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._ctx, name)
+
+
+class HeldContext(CommandContext):
+    """CommandContext for a speculative run: speech waits until release()."""
+
+    def __init__(self, ctx: Context, token: CancelToken):
+        super().__init__(ctx, token)
+        self._held: List[str] = []
+        self._live = False
+        self._lock = threading.Lock()
+
+    def speak(self, text: str) -> None:
+        with self._lock:
+            if not self._live:
+                self._held.append(text)
+                return
+        super().speak(text)
+
+    def release(self) -> None:
+        with self._lock:
+            self._live = True
+            held, self._held = self._held, []
+        for text in held:
+            super().speak(text)
+
+
+def _intent_key(intent: Optional[Intent]) -> Optional[Hashable]:
+    if not intent:
+        return None
+    return intent.name, tuple(sorted(intent.slots.items()))
+
+
+class AssistantCore:
+    def __init__(
+        self,
+        ctx: Context,
+        skills: SkillRegistry,
+        timeout: Optional[float] = 20.0,
+        on_preempt: Optional[Callable[[], None]] = None,
+        parse: Callable[[str], Optional[Intent]] = parse_intent,
+        speculate_after: int = 2,
+    ):
+        self.ctx = ctx
+        self.skills = skills
+        self.timeout = timeout
+        self.on_preempt = on_preempt
+        self.parse = parse
+        self.speculate_after = speculate_after
+        self._active: Dict["asyncio.Task[Optional[str]]", CancelToken] = {}
+        self.speculation_stats = {"started": 0, "used": 0, "dropped": 0}
+
+    def preempt(self) -> int:
+        """Cancel every running command and barge in on speech; returns how many."""
+        n = len(self._active)
+        for task, token in list(self._active.items()):
+            token.cancel()
+            task.cancel()
+        if self.on_preempt is not None:
+            self.on_preempt()
+        return n
+
+    async def handle(self, text: str, preempt: bool = True) -> Optional[str]:
+        return await self.dispatch(self._parse(text), preempt)
+
+    async def dispatch(self, intent: Optional[Intent], preempt: bool = True) -> Optional[str]:
+        if preempt:
+            self.preempt()
+        token = CancelToken()
+        task = asyncio.ensure_future(self._run(intent, CommandContext(self.ctx, token)))
+        return await self._supervise(task, token)
+
+    async def handle_stream(
+        self, hypotheses: Iterable[Tuple[str, bool]], preempt: bool = True
+    ) -> Optional[str]:
+        """Dispatch one utterance from a blocking iterator of (text, final) hypotheses.
+
+        Returns None if nothing was recognized or the command was preempted.
+        """
+        spec = Speculation(self)
+        loop = asyncio.get_running_loop()
+        it = iter(hypotheses)
+        final = ""
+        try:
+            while True:
+                hyp = await loop.run_in_executor(None, next, it, None)
+                if hyp is None:
+                    break
+                text, is_final = hyp
+                if is_final:
+                    final = text
+                    break
+                spec.hypothesis(text)
+        except BaseException:
+            spec.cancel()
+            raise
+        if not final:
+            spec.cancel()
+            return None
+        return await spec.finish(final, preempt=preempt)
+
+    def _parse(self, text: str) -> Optional[Intent]:
+        with METRICS.span("parse"):
+            return self.parse(text)
+
+    async def _supervise(
+        self, task: "asyncio.Task[Optional[str]]", token: CancelToken
+    ) -> Optional[str]:
+        self._active[task] = token
+        with METRICS.span("command"):
+            return await self._wait(task, token)
+
+    async def _wait(
+        self, task: "asyncio.Task[Optional[str]]", token: CancelToken
+    ) -> Optional[str]:
+        try:
+            done, _ = await asyncio.wait({task}, timeout=self.timeout)
+            if not done:
+                token.cancel()
+                task.cancel()
+                self.ctx.speak(TIMED_OUT)
+                return TIMED_OUT
+            if task.cancelled():
+                return None
+            return task.result()
+        finally:
+            token.cancel()  # mute late speech from a thread we could not stop
+            task.cancel()
+            self._active.pop(task, None)
+
+    async def _run(self, intent: Optional[Intent], ctx: CommandContext) -> Optional[str]:
+        if not intent:
+            ctx.speak(NOT_UNDERSTOOD)
+            return NOT_UNDERSTOOD
+        handlers = self.skills.handlers(intent.name)
+        if not handlers:
+            ctx.speak(NO_SKILL)
+            return NO_SKILL
+        for skill in handlers:
+            try:
+                with METRICS.span(f"skill.{skill.name}"):
+                    ans = await skill.handle_async(ctx, intent.name, intent.slots)
+            except CommandCancelled:
+                return None
+            if ans is not None:
+                return ans
+        return ""
+
+
+class Speculation:
+    """One utterance in progress: feed interim hypotheses, then finish() with the final."""
+
+    def __init__(self, core: AssistantCore):
+        self.core = core
+        self._key: Optional[Hashable] = None
+        self._hits = 0
+        self._task: Optional["asyncio.Task[Optional[str]]"] = None
+        self._task_key: Optional[Hashable] = None
+        self._ctx: Optional[HeldContext] = None
+
+    def hypothesis(self, text: str) -> None:
+        core = self.core
+        intent = core._parse(text)
+        key = _intent_key(intent)
+        self._hits = self._hits + 1 if key is not None and key == self._key else 1
+        self._key = key
+        if key is None or key == self._task_key:
+            return
+        if core.speculate_after <= 0 or self._hits < core.speculate_after:
+            return
+        handlers = core.skills.handlers(intent.name)
+        if not handlers or not all(s.speculative for s in handlers):
+            return
+        self.cancel()  # the intent moved on, e.g. "weather in" -> "weather in Rome"
+        self._ctx = HeldContext(core.ctx, CancelToken())
+        self._task = asyncio.ensure_future(core._run(intent, self._ctx))
+        self._task_key = key
+        core.speculation_stats["started"] += 1
+
+    def cancel(self) -> None:
+        if self._task is None:
+            return
+        self._ctx.token.cancel()
+        self._task.cancel()
+        self._task = self._task_key = self._ctx = None
+        self.core.speculation_stats["dropped"] += 1
+
+    async def finish(self, text: str, preempt: bool = True) -> Optional[str]:
+        core = self.core
+        intent = core._parse(text)
+        if self._task is None or _intent_key(intent) != self._task_key:
+            self.cancel()
+            return await core.dispatch(intent, preempt)
+        task, ctx = self._task, self._ctx
+        self._task = self._task_key = self._ctx = None
+        core.speculation_stats["used"] += 1
+        if preempt:
+            core.preempt()
+        ctx.release()
+        return await core._supervise(task, ctx.token)
+
+
+class LoopThread:
+    """An event loop running on a daemon thread."""
+
+    def __init__(self, name: str = "assistant-loop"):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, coro: Awaitable[T]) -> "Future[T]":
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def close(self, timeout: Optional[float] = 2.0) -> None:
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout)
\ No newline at end of file
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: file_index.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Background file index for the files skill: crawls configured roots into SQLite and
+answers fuzzy file-name queries from an in-memory trigram index.
+
+Usage:
+index = FileIndex("~/.cache/voice_assistant/files.sqlite3", ["~/Documents"]).start()
+index.search("quartly report", k=5)
+
+Notes:
+- The SQLite file keeps every indexed path and the mtime each directory had when
+  it was last read. On start the index is loaded from disk first, so it answers
+  at once. The crawl that follows only re-reads directories whose mtime has
+  changed, and walks the unchanged ones through their stored children.
+- With the optional `watchdog` package, create/delete/move events keep the index
+  current. Without it, the roots are re-crawled every rescan_interval seconds,
+  which is cheap because of the mtime check.
+- search() collects candidates by shared name trigrams, keeps the best few with
+  a heap, and reranks them with difflib. Typos and partial names still match.
+- Hidden files and directories are skipped. Indexing stops at max_entries.
+
+===================================================================
+"""
+from __future__ import annotations
+
+import difflib
+import heapq
+import os
+import sqlite3
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+try:
+    from watchdog.observers import Observer  # type: ignore
+except Exception:  # pragma: no cover
+    Observer = None
+
+RERANK = 50  # trigram candidates scored with difflib
+STRONG_MATCH = 0.8  # score above which a match is trusted enough to act on
+
+
+def _grams(name: str) -> Set[str]:
+    padded = f" {name} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _norm(text: str) -> str:
+    return " ".join(text.lower().replace("_", " ").replace("-", " ").split())
+
+
+def strong_match(query: str, path: str) -> bool:
+    """True if the name of ``path`` contains ``query`` or scores at least STRONG_MATCH."""
+    q, name = _norm(query), _norm(os.path.basename(path))
+    return bool(q) and (q in name or FileIndex._score(q, name) >= STRONG_MATCH)
+
+
+class FileIndex:
+    def __init__(
+        self,
+        path: Optional[str],
+        roots: Sequence[str],
+        max_entries: int = 200_000,
+        rescan_interval: float = 300.0,
+        watch: bool = True,
+    ):
+        self.roots = [os.path.abspath(os.path.expanduser(r)) for r in roots]
+        self.max_entries = max_entries
+        self.rescan_interval = rescan_interval
+        self.watch = watch and Observer is not None
+        self.ready = threading.Event()  # set once the first full crawl is done
+        self._lock = threading.RLock()
+        self._ids: Dict[str, int] = {}
+        self._paths: Dict[int, str] = {}
+        self._names: Dict[int, str] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        self._next_id = 0
+        self._stop = threading.Event()
+        self._observer = None
+        self._thread: Optional[threading.Thread] = None
+        if path:
+            path = os.path.expanduser(path)
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " path TEXT PRIMARY KEY, parent TEXT NOT NULL, is_dir INTEGER NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS files_parent ON files (parent)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS dirs (path TEXT PRIMARY KEY, mtime REAL)")
+        self._db.commit()
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    # -- lifecycle ---------------------------------------------------------
+
+    def start(self) -> "FileIndex":
+        """Load what is on disk, then crawl and watch on a daemon thread."""
+        self._thread = threading.Thread(target=self._run, name="file-index", daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._observer is not None:
+            self._observer.stop()
+        if self._thread is not None:
+            self._thread.join(5)
+        with self._lock:
+            self._db.close()
+
+    def _run(self) -> None:
+        self.load()
+        self.crawl()
+        self.ready.set()
+        if self.watch:
+            self._start_observer()
+        interval = None if self._observer is not None else self.rescan_interval
+        while not self._stop.wait(interval):
+            self.crawl()
+
+    def _start_observer(self) -> None:
+        observer = Observer()
+        handler = _EventHandler(self)
+        for root in self.roots:
+            if os.path.isdir(root):
+                observer.schedule(handler, root, recursive=True)
+        observer.daemon = True
+        observer.start()
+        self._observer = observer
+
+    # -- index maintenance -------------------------------------------------
+
+    def load(self) -> int:
+        with self._lock:
+            rows = self._db.execute("SELECT path FROM files").fetchall()
+            for (path,) in rows:
+                self._remember(path)
+        return len(rows)
+
+    def crawl(self) -> None:
+        """Bring the index up to date with the roots, re-reading only changed directories."""
+        for root in self.roots:
+            if os.path.isdir(root):
+                self._crawl_dir(root)
+        with self._lock:
+            self._db.commit()
+
+    def _crawl_dir(self, top: str) -> None:
+        stack = [top]
+        while stack and not self._stop.is_set():
+            d = stack.pop()
+            try:
+                mtime = os.stat(d).st_mtime
+            except OSError:
+                self.remove(d)
+                continue
+            with self._lock:
+                row = self._db.execute("SELECT mtime FROM dirs WHERE path = ?", (d,)).fetchone()
+                if row is not None and row[0] == mtime:
+                    stack.extend(self._child_dirs(d))
+                    continue
+            stack.extend(self._rescan(d, mtime))
+
+    def _child_dirs(self, d: str) -> List[str]:
+        rows = self._db.execute(
+            "SELECT path FROM files WHERE parent = ? AND is_dir = 1", (d,)
+        ).fetchall()
+        return [p for (p,) in rows]
+
+    def _rescan(self, d: str, mtime: float) -> List[str]:
+        """Re-read one directory; returns its subdirectories."""
+        found: Dict[str, bool] = {}
+        try:
+            with os.scandir(d) as it:
+                for entry in it:
+                    if entry.name.startswith("."):
+                        continue
+                    try:
+                        found[entry.path] = entry.is_dir(follow_symlinks=False)
+                    except OSError:
+                        continue
+        except OSError:
+            return []
+        with self._lock:
+            rows = self._db.execute("SELECT path, is_dir FROM files WHERE parent = ?", (d,))
+            known = dict(rows.fetchall())
+            for path in known.keys() - found.keys():
+                self._forget_tree(path)
+            new = [(p, is_dir) for p, is_dir in found.items() if p not in known]
+            room = self.max_entries - len(self._paths)
+            for path, is_dir in new[: max(room, 0)]:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO files (path, parent, is_dir) VALUES (?, ?, ?)",
+                    (path, d, int(is_dir)),
+                )
+                self._remember(path)
+            self._db.execute("INSERT OR REPLACE INTO dirs (path, mtime) VALUES (?, ?)", (d, mtime))
+            return [p for p, is_dir in found.items() if is_dir and p in self._ids]
+
+    def add(self, path: str) -> None:
+        """Index one path (and, for a directory, everything below it)."""
+        path = os.path.abspath(path)
+        if os.path.basename(path).startswith(".") or not os.path.exists(path):
+            return
+        is_dir = os.path.isdir(path)
+        with self._lock:
+            if path not in self._ids and len(self._paths) < self.max_entries:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO files (path, parent, is_dir) VALUES (?, ?, ?)",
+                    (path, os.path.dirname(path), int(is_dir)),
+                )
+                self._remember(path)
+        if is_dir:
+            self._crawl_dir(path)
+        with self._lock:
+            self._db.commit()
+
+    def remove(self, path: str) -> None:
+        with self._lock:
+            self._forget_tree(os.path.abspath(path))
+            self._db.commit()
+
+    def _remember(self, path: str) -> None:
+        if path in self._ids:
+            return
+        i = self._next_id
+        self._next_id += 1
+        name = _norm(os.path.basename(path))
+        self._ids[path] = i
+        self._paths[i] = path
+        self._names[i] = name
+        for g in _grams(name):
+            self._postings.setdefault(g, set()).add(i)
+
+    def _forget_tree(self, path: str) -> None:
+        row = self._db.execute("SELECT is_dir FROM files WHERE path = ?", (path,)).fetchone()
+        if row is not None and not row[0]:
+            self._forget(path)
+            self._db.execute("DELETE FROM files WHERE path = ?", (path,))
+            return
+        prefix = path.rstrip(os.sep) + os.sep
+        for p in [p for p in self._ids if p == path or p.startswith(prefix)]:
+            self._forget(p)
+        like = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        for table in ("files", "dirs"):
+            self._db.execute(
+                f"DELETE FROM {table} WHERE path = ? OR path LIKE ? ESCAPE '\\'", (path, like)
+            )
+
+    def _forget(self, p: str) -> None:
+        if p in self._ids:
+            i = self._ids.pop(p)
+            del self._paths[i]
+            for g in _grams(self._names.pop(i)):
+                ids = self._postings.get(g)
+                if ids is not None:
+                    ids.discard(i)
+                    if not ids:
+                        del self._postings[g]
+
+    # -- queries -------------------------------------------------------------
+
+    def search(self, query: str, k: int = 5) -> List[str]:
+        """Paths whose names best match ``query``, best first."""
+        q = _norm(query)
+        if not q:
+            return []
+        with self._lock:
+            hits: Counter = Counter()
+            for g in _grams(q):
+                hits.update(self._postings.get(g, ()))
+            if len(q) < 3:  # too short for trigrams to be selective
+                hits.update(i for i, name in self._names.items() if q in name)
+            top = heapq.nlargest(RERANK, hits.items(), key=lambda kv: kv[1])
+            scored = [(self._score(q, self._names[i]), self._paths[i]) for i, _ in top]
+        best = heapq.nlargest(k, scored)
+        return [path for score, path in best if score > 0.3]
+
+    @staticmethod
+    def _score(q: str, name: str) -> float:
+        stem = name.rsplit(".", 1)[0] if "." in name else name
+        ratio = max(
+            difflib.SequenceMatcher(None, q, name).ratio(),
+            difflib.SequenceMatcher(None, q, stem).ratio(),
+        )
+        if q in name:
+            ratio += 0.5 if name.startswith(q) else 0.3
+        return ratio
+
+    def directories(self, query: str) -> List[str]:
+        return [p for p in self.search(query, k=10) if os.path.isdir(p)]
+
+
+def top_entries(directory: str, k: int = 10) -> Tuple[List[str], int]:
+    """The first ``k`` names in ``directory`` by case-insensitive order, plus the total count.
+
+    Uses a bounded heap, so a huge directory costs O(n log k) instead of a full sort.
+    """
+    count = 0
+
+    def names() -> Iterable[str]:
+        nonlocal count
+        with os.scandir(directory) as it:
+            for entry in it:
+                count += 1
+                yield entry.name
+
+    top = heapq.nsmallest(k, names(), key=str.lower)
+    return top, count
+
+
+class _EventHandler:
+    """watchdog handler: the observer only needs a dispatch(event) method."""
+
+    def __init__(self, index: FileIndex):
+        self.index = index
+
+    def dispatch(self, event) -> None:
+        kind = event.event_type
+        if kind == "created":
+            self.index.add(event.src_path)
+        elif kind == "deleted":
+            self.index.remove(event.src_path)
+        elif kind == "moved":
+            self.index.remove(event.src_path)
+            self.index.add(event.dest_path)
\ No newline at end of file
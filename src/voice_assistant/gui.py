@@ -6,7 +6,7 @@ Project: Desktop Voice Assistant
 File: gui.py
 Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
 Created: 2025-10-20
-Updated: 2025-10-20
+Updated: 2026-10-18
 License: MIT License (see LICENSE file for details)
 ===================================================================
 
@@ -16,29 +16,65 @@ Tkinter GUI with push-to-talk, transcript pane, and manual input.
 Usage:
 from voice_assistant.gui import run_gui; run_gui(app_context)
 
+Notes:
+- Commands run on a thread pool; results come back through a queue that the Tk
+  mainloop polls with root.after, so slow skills never freeze the window.
+- Transcript lines are buffered and inserted once per poll tick.
+- The pane mirrors a bounded Transcript: old lines are trimmed in chunks and paged
+  back in from the on-disk spill log when the view is scrolled to the top.
+- on_ready is called on the Tk thread once the window is first idle (the app uses
+  it to start pre-loading skills).
+
 ===================================================================
 """
 from __future__ import annotations
 
+import queue
 import tkinter as tk
+from concurrent.futures import Future, ThreadPoolExecutor
 from tkinter import ttk
-from typing import Callable
+from typing import Callable, List, Optional, Tuple
+
+from .transcript import Transcript
+
+POLL_MS = 50
+PAGE_LINES = 200
 
 
 class AssistantGUI:
-    def __init__(self, title: str, on_listen: Callable[[], str], on_text: Callable[[str], str]):
+    def __init__(
+        self,
+        title: str,
+        on_listen: Callable[[], str],
+        on_text: Callable[[str], str],
+        max_workers: int = 4,
+        transcript: Optional[Transcript] = None,
+        on_ready: Optional[Callable[[], None]] = None,
+    ):
         self.on_listen = on_listen
         self.on_text = on_text
+        self.transcript = transcript if transcript is not None else Transcript()
+        self._paged = 0  # history lines paged back in above the transcript's own lines
+        self._paging = False
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gui-cmd")
+        self._results: "queue.Queue[Tuple[str, Future]]" = queue.Queue()
+        self._lines: "queue.Queue[str]" = queue.Queue()
+        self._inflight = 0
+        self._listening = False
 
         self.root = tk.Tk()
         self.root.title(title)
         self.root.geometry("840x560")
 
-        self.text = tk.Text(self.root, wrap="word")
-        self.text.configure(state=tk.NORMAL)
-        self.text.insert(tk.END, "👋 Ready. Click ‘🎙️ Listen’ or type a command.\n")
+        pane = ttk.Frame(self.root)
+        pane.pack(fill=tk.BOTH, expand=True, padx=8, pady=8)
+        self.scrollbar = ttk.Scrollbar(pane, orient=tk.VERTICAL)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.text = tk.Text(pane, wrap="word", yscrollcommand=self._on_scroll)
+        self.scrollbar.configure(command=self.text.yview)
         self.text.configure(state=tk.DISABLED)
-        self.text.pack(fill=tk.BOTH, expand=True, padx=8, pady=8)
+        self.text.pack(fill=tk.BOTH, expand=True)
+        self._append_lines(["👋 Ready. Click ‘🎙️ Listen’ or type a command."])
 
         frame = ttk.Frame(self.root)
         frame.pack(fill=tk.X, padx=8, pady=4)
@@ -52,13 +88,95 @@ class AssistantGUI:
         btn_listen = ttk.Button(frame, text="🎙️ Listen", command=self._listen)
         btn_listen.pack(side=tk.LEFT)
 
+        self.status = ttk.Label(frame, text="", width=14)
+        self.status.pack(side=tk.LEFT, padx=4)
+
         self.root.bind("<Return>", lambda e: self._send_text())
+        self.root.protocol("WM_DELETE_WINDOW", self._close)
+        self.root.after(POLL_MS, self._poll)
+        if on_ready is not None:
+            # after_idle runs once the window has been mapped and drawn
+            self.root.after_idle(on_ready)
 
     def log(self, who: str, message: str):
+        # Safe from any thread; lines are flushed to the widget by _poll.
+        self._lines.put(f"{who}: {message}")
+
+    def _flush_log(self):
+        lines: List[str] = []
+        while True:
+            try:
+                lines.extend(self._lines.get_nowait().splitlines() or [""])
+            except queue.Empty:
+                break
+        if lines:
+            self._append_lines(lines)
+
+    def _append_lines(self, lines: List[str]):
+        at_bottom = self.text.yview()[1] >= 0.999
+        trimmed = self.transcript.extend(lines)
+        self.text.configure(state=tk.NORMAL)
+        self.text.insert(tk.END, "\n".join(lines) + "\n")
+        if trimmed:
+            self.text.delete("1.0", f"{self._paged + trimmed + 1}.0")
+            self._paged = 0
+        self.text.configure(state=tk.DISABLED)
+        if at_bottom:
+            self.text.see(tk.END)
+
+    def _on_scroll(self, first: str, last: str):
+        self.scrollbar.set(first, last)
+        if float(first) <= 0.0 and not self._paging and self._paged < self.transcript.spilled:
+            self._paging = True
+            self.root.after_idle(self._page_in)
+
+    def _page_in(self):
+        self._paging = False
+        older = self.transcript.history(self._paged, PAGE_LINES)
+        if not older:
+            return
         self.text.configure(state=tk.NORMAL)
-        self.text.insert(tk.END, f"{who}: {message}\n")
-        self.text.see(tk.END)
+        self.text.insert("1.0", "\n".join(older) + "\n")
         self.text.configure(state=tk.DISABLED)
+        self._paged += len(older)
+        self.text.see(f"{len(older) + 1}.0")
+
+    def _submit(self, kind: str, fn: Callable, *args):
+        fut = self._executor.submit(fn, *args)
+        self._inflight += 1
+        self._update_status()
+        fut.add_done_callback(lambda f: self._results.put((kind, f)))
+
+    def _poll(self):
+        while True:
+            try:
+                kind, fut = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._inflight -= 1
+            self._on_result(kind, fut)
+        self._update_status()
+        self._flush_log()
+        self.root.after(POLL_MS, self._poll)
+
+    def _on_result(self, kind: str, fut: Future):
+        if kind == "listen":
+            self._listening = False
+        try:
+            ans = fut.result()
+        except Exception as e:
+            self.log("Error", str(e) or type(e).__name__)
+            return
+        if kind == "listen":
+            self.log("Heard", ans or "<no speech detected>")
+        else:
+            self.log("Assistant", ans)
+
+    def _update_status(self):
+        text = f"⏳ {self._inflight} running" if self._inflight else ""
+        if self._listening:
+            text = "🎙️ listening…"
+        self.status.configure(text=text)
 
     def _send_text(self):
         q = self.entry.get().strip()
@@ -66,21 +184,30 @@ class AssistantGUI:
             return
         self.entry.delete(0, tk.END)
         self.log("You", q)
-        ans = self.on_text(q)
-        self.log("Assistant", ans)
+        self._submit("text", self.on_text, q)
 
     def _listen(self):
+        if self._listening:  # one microphone, one capture at a time
+            return
+        self._listening = True
         self.log("You", "(Listening…)")
-        ans = self.on_listen()
-        if ans:
-            self.log("Heard", ans)
-        else:
-            self.log("Heard", "<no speech detected>")
+        self._submit("listen", self.on_listen)
+
+    def _close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.transcript.close()
+        self.root.destroy()
 
     def run(self):
         self.root.mainloop()
 
 
-def run_gui(title: str, on_listen: Callable[[], str], on_text: Callable[[str], str]):
-    app = AssistantGUI(title, on_listen, on_text)
+def run_gui(
+    title: str,
+    on_listen: Callable[[], str],
+    on_text: Callable[[str], str],
+    transcript: Optional[Transcript] = None,
+    on_ready: Optional[Callable[[], None]] = None,
+):
+    app = AssistantGUI(title, on_listen, on_text, transcript=transcript, on_ready=on_ready)
     app.run()
\ No newline at end of file
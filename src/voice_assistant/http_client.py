@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: http_client.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Shared connection-pooled HTTP client for network-backed skills.
+
+Usage:
+http = HttpClient.from_config(cfg); http.get("https://wttr.in/Rome?format=j1")
+
+Notes:
+- One requests.Session with keep-alive; the adapter keeps up to pool_size open
+  connections per host and blocks instead of opening more (per-host limit).
+- Idempotent requests are retried on connection errors and 429/5xx with
+  exponential backoff (urllib3 Retry).
+- map() runs a function over items on a small thread pool, so skills can issue
+  several requests at once over the same pool.
+
+===================================================================
+"""
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterable, List, Optional, TypeVar
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .config import Config
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+USER_AGENT = "desktop-voice-assistant/0.1 (+https://github.com/mobinyousefi)"
+
+
+class HttpClient:
+    def __init__(
+        self,
+        pool_size: int = 10,
+        retries: int = 2,
+        backoff: float = 0.3,
+        timeout: float = 6.0,
+        max_workers: int = 8,
+    ):
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET", "HEAD", "OPTIONS"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry, pool_block=True
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, cfg: Config) -> "HttpClient":
+        return cls(
+            pool_size=cfg.http_pool_size,
+            retries=cfg.http_retries,
+            backoff=cfg.http_backoff,
+            timeout=cfg.http_timeout,
+        )
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.get(url, **kwargs)
+
+    def get_json(self, url: str, **kwargs: Any) -> Optional[Any]:
+        r = self.get(url, **kwargs)
+        if r.status_code != 200:
+            return None
+        return r.json()
+
+    def submit(self, fn: Callable[..., R], *args: Any) -> Future:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="http")
+        return self._executor.submit(fn, *args)
+
+    def map(self, fn: Callable[[T], R], items: Iterable[T]) -> List[Optional[R]]:
+        """Apply ``fn`` to every item concurrently; failed calls yield None, order is kept."""
+        futures = [self.submit(fn, item) for item in items]
+        out: List[Optional[R]] = []
+        for fut in futures:
+            try:
+                out.append(fut.result())
+            except Exception:
+                out.append(None)
+        return out
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
\ No newline at end of file
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: intent_model.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Fallback intent classifier for utterances the keyword patterns miss ("how hot
+is it outside", a misheard "whether in Rome"). Character n-gram TF-IDF vectors
+of example phrases per intent, scored by cosine similarity in one matrix product.
+
+Usage:
+from voice_assistant.intent_model import load_classifier
+model = load_classifier("~/.cache/voice_assistant/intents.model")
+model.predict(["how hot is it outside", "banana"])  ->  [("weather", 0.98), (None, 0.21)]
+(intents.FallbackParser puts it behind the keyword patterns.)
+
+Notes:
+- Features are 2- to 4-grams of the padded, lower-cased UTF-8 text. A whole
+  batch is hashed in one vectorized pass (polynomial rolling hash, stable across
+  processes). Only the hashed columns that occur in the examples are kept, so
+  the model is a small dense float32 matrix.
+- An utterance scores against every example. An intent's score is its best
+  example's cosine similarity, and a score under the threshold means no intent.
+  Batches are one (batch x columns) @ (columns x examples) product.
+- The model file holds a JSON header and 64-byte-aligned raw arrays, read with
+  mmap and np.frombuffer (no copy, no parsing). It is rebuilt when EXAMPLES
+  change; the digest in the header says which examples it was built from.
+- "system" and "email" are trained on so near-misses land there, but they are
+  never returned: a guess must not power off the machine or send mail. Nor is
+  "none", a class of chit-chat and requests no skill handles.
+
+===================================================================
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+MAGIC = b"VAINTENT"
+FORMAT_VERSION = 1
+NGRAMS = (2, 3, 4)
+BUCKETS = 1 << 20
+_PRIME = np.uint64(1_000_003)
+_MIX = np.uint64(0x9E3779B97F4A7C15)  # Fibonacci hashing: the top bits pick the bucket
+DEFAULT_THRESHOLD = 0.35
+
+# Trained on, never returned (see Notes). "none" soaks up chit-chat and requests
+# no skill handles, so they don't drift to the nearest real intent.
+NO_ACTION = ("none", "system", "email")
+
+EXAMPLES: Dict[str, Tuple[str, ...]] = {
+    "time": (
+        "what time is it",
+        "what's the time",
+        "what is the time now",
+        "tell me the time",
+        "do you know what time it is",
+        "what hour is it",
+        "how late is it",
+        "current time please",
+        "got the time",
+        "clock",
+        "what time is it in Tokyo",
+        "what's the date today",
+    ),
+    "weather": (
+        "what's the weather like",
+        "weather in Rome",
+        "how hot is it outside",
+        "how cold is it today",
+        "is it going to rain",
+        "will it rain tomorrow",
+        "is it sunny outside",
+        "do I need an umbrella",
+        "should I wear a jacket",
+        "temperature outside",
+        "what's the forecast for tomorrow",
+        "is it snowing in Berlin",
+        "how windy is it",
+        "whether in Rome",
+        "what's it like outside",
+    ),
+    "wikipedia": (
+        "who is Ada Lovelace",
+        "who was Alan Turing",
+        "what is quantum computing",
+        "what's a neutron star",
+        "what's an atom",
+        "what was the Roman Empire",
+        "tell me about black holes",
+        "tell me something about Mars",
+        "explain photosynthesis",
+        "define entropy",
+        "who invented the telephone",
+        "who wrote Hamlet",
+        "what does DNA stand for",
+        "look up Marie Curie on wikipedia",
+        "information about the Eiffel Tower",
+    ),
+    "file": (
+        "open file quarterly report",
+        "open the document budget",
+        "find my resume",
+        "where is my thesis draft",
+        "find file invoice",
+        "show files in Downloads",
+        "list files in Documents",
+        "what's in my downloads folder",
+        "open the spreadsheet",
+        "locate the pdf",
+        "move file notes",
+    ),
+    "web_search": (
+        "search for cheap flights",
+        "google python tutorials",
+        "look up restaurants near me",
+        "search the web for laptops",
+        "open youtube",
+        "open github",
+        "go to reddit",
+        "browse to the news",
+        "find me a recipe for pancakes online",
+        "show me pictures of cats",
+        "look up hotels in Paris",
+        "search youtube for guitar lessons",
+    ),
+    "joke": (
+        "tell me a joke",
+        "make me laugh",
+        "say something funny",
+        "cheer me up",
+        "do you know any jokes",
+        "i want to hear a joke",
+        "tell me something funny",
+        "got any puns",
+    ),
+    "system": (
+        "shut down the computer",
+        "turn off the pc",
+        "put the computer to sleep",
+        "lock the screen",
+        "restart the machine",
+        "power off",
+        "go to sleep",
+    ),
+    "email": (
+        "send an email to bob",
+        "email alice",
+        "write a mail to my boss",
+        "compose a message to john",
+        "send a message to the team",
+        "mail the report to anna",
+    ),
+    "none": (
+        "what's up",
+        "how are you",
+        "how's it going",
+        "what's going on",
+        "hi",
+        "hey assistant",
+        "thank you",
+        "thanks a lot",
+        "hello there",
+        "good morning",
+        "never mind",
+        "stop",
+        "yes",
+        "no",
+        "play some music",
+        "set an alarm for seven",
+        "remind me to call mom",
+        "turn up the volume",
+        "I like turtles",
+        "okay",
+    ),
+}
+
+
+def examples_digest(examples: Dict[str, Sequence[str]]) -> str:
+    blob = json.dumps(
+        {"v": FORMAT_VERSION, "n": NGRAMS, "b": BUCKETS, "x": examples}, sort_keys=True
+    )
+    return hashlib.sha1(blob.encode()).hexdigest()
+
+
+def hashed_ngrams(texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """(text index, bucket) of every n-gram occurrence in ``texts``."""
+    padded = [f" {' '.join(t.lower().split())} ".encode() for t in texts]
+    lengths = np.fromiter(map(len, padded), dtype=np.int64, count=len(padded))
+    data = np.frombuffer(b"".join(padded), dtype=np.uint8).astype(np.uint64)
+    owner = np.repeat(np.arange(len(padded)), lengths)
+    shift = np.uint64(64 - BUCKETS.bit_length() + 1)
+    rows, ids = [], []
+    for n in NGRAMS:
+        m = len(data) - n + 1
+        if m <= 0:
+            continue
+        h = np.zeros(m, dtype=np.uint64)
+        for k in range(n):  # uint64 arithmetic wraps, which is what a hash wants
+            h = h * _PRIME + data[k : k + m]
+        inside = owner[:m] == owner[n - 1 :]  # drop n-grams spanning two texts
+        rows.append(owner[:m][inside])
+        ids.append((((h[inside] + np.uint64(n)) * _MIX) >> shift).astype(np.uint32))
+    if not rows:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.uint32)
+    return np.concatenate(rows), np.concatenate(ids)
+
+
+class IntentClassifier:
+    def __init__(
+        self,
+        intents: List[str],
+        bounds: np.ndarray,
+        cols: np.ndarray,
+        idf: np.ndarray,
+        weights: np.ndarray,
+        digest: str = "",
+    ):
+        self.intents = intents
+        self.bounds = bounds  # first example row of each intent
+        self.cols = cols  # sorted hashed n-gram ids that occur in the examples
+        self.idf = idf
+        self.weights = weights  # (examples, cols), rows L2-normalised
+        self.digest = digest
+
+    # -- build, save, load -------------------------------------------------------
+
+    @classmethod
+    def train(cls, examples: Optional[Dict[str, Sequence[str]]] = None) -> "IntentClassifier":
+        examples = EXAMPLES if examples is None else examples
+        intents = [name for name, phrases in examples.items() if phrases]
+        texts = [t for name in intents for t in examples[name]]
+        bounds = np.cumsum([0] + [len(examples[name]) for name in intents[:-1]], dtype=np.int64)
+        cols = np.unique(hashed_ngrams(texts)[1])
+        terms = _term_counts(texts, cols)
+        df = np.bincount(terms[1], minlength=len(cols))
+        idf = (np.log((1 + len(texts)) / (1 + df)) + 1).astype(np.float32)
+        weights = _tfidf(terms, idf, len(texts))
+        return cls(intents, bounds, cols, idf, weights, examples_digest(examples))
+
+    def save(self, path: str) -> None:
+        """Write the model file atomically (a reader never sees a half-written one)."""
+        header = json.dumps(
+            {
+                "version": FORMAT_VERSION,
+                "digest": self.digest,
+                "intents": self.intents,
+                "bounds": [int(b) for b in self.bounds],
+                "cols": len(self.cols),
+                "rows": int(self.weights.shape[0]),
+            }
+        ).encode()
+        arrays = (
+            np.ascontiguousarray(self.cols, dtype="<u4"),
+            np.ascontiguousarray(self.idf, dtype="<f4"),
+            np.ascontiguousarray(self.weights, dtype="<f4"),
+        )
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(MAGIC + struct.pack("<I", len(header)) + header)
+            for arr in arrays:
+                f.write(b"\0" * (-f.tell() % 64))
+                f.write(arr.tobytes())
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "IntentClassifier":
+        """Map a saved model read-only; raises ValueError if it is not one."""
+        with open(path, "rb") as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if buf[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not an intent model")
+        (size,) = struct.unpack_from("<I", buf, len(MAGIC))
+        start = len(MAGIC) + 4
+        header = json.loads(buf[start : start + size])
+        if header.get("version") != FORMAT_VERSION:
+            raise ValueError(f"{path}: unsupported model version {header.get('version')}")
+        offset = start + size
+        n_cols, n_rows = header["cols"], header["rows"]
+        arrays = []
+        for dtype, count in (("<u4", n_cols), ("<f4", n_cols), ("<f4", n_rows * n_cols)):
+            offset += -offset % 64
+            arrays.append(np.frombuffer(buf, dtype=dtype, count=count, offset=offset))
+            offset += 4 * count
+        cols, idf, weights = arrays
+        return cls(
+            header["intents"],
+            np.asarray(header["bounds"], dtype=np.int64),
+            cols,
+            idf,
+            weights.reshape(n_rows, n_cols),
+            header["digest"],
+        )
+
+    # -- scoring -----------------------------------------------------------------
+
+    def scores(self, texts: Sequence[str]) -> np.ndarray:
+        """(len(texts), len(intents)) cosine similarity of each text's best example."""
+        q = _tfidf(_term_counts(texts, self.cols), self.idf, len(texts))
+        sims = q @ self.weights.T
+        return np.maximum.reduceat(sims, self.bounds, axis=1)
+
+    def classify(self, texts: Sequence[str]) -> List[Tuple[str, float]]:
+        """(best intent, score) per text, over every class including NO_ACTION ones."""
+        if not texts:
+            return []
+        s = self.scores(texts)
+        best = s.argmax(axis=1)
+        return [(self.intents[b], float(s[i, b])) for i, b in enumerate(best)]
+
+    def predict(
+        self, texts: Sequence[str], threshold: float = DEFAULT_THRESHOLD
+    ) -> List[Tuple[Optional[str], float]]:
+        """Like classify, but the intent is None under ``threshold`` or for a NO_ACTION class."""
+        return [
+            (name if score >= threshold and name not in NO_ACTION else None, score)
+            for name, score in self.classify(texts)
+        ]
+
+
+def _term_counts(
+    texts: Sequence[str], cols: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(row, column, count) of each distinct known n-gram per text."""
+    rows, ids = hashed_ngrams(texts)
+    if not len(cols):
+        return rows[:0], rows[:0], rows[:0]
+    pos = np.minimum(np.searchsorted(cols, ids), len(cols) - 1)
+    known = cols[pos] == ids  # n-grams never seen in the examples carry no signal
+    flat, counts = np.unique(rows[known] * len(cols) + pos[known], return_counts=True)
+    return flat // len(cols), flat % len(cols), counts
+
+
+def _tfidf(
+    terms: Tuple[np.ndarray, np.ndarray, np.ndarray], idf: np.ndarray, n_rows: int
+) -> np.ndarray:
+    """Dense L2-normalised rows, computed on the non-zero entries only."""
+    rows, cols, counts = terms
+    vals = np.log1p(counts).astype(np.float32) * idf[cols]  # sublinear tf: repeats count less
+    norms = np.sqrt(np.bincount(rows, vals * vals, minlength=n_rows)).astype(np.float32)
+    out = np.zeros((n_rows, len(idf)), dtype=np.float32)
+    out[rows, cols] = vals / np.maximum(norms[rows], 1e-9)
+    return out
+
+
+def load_classifier(
+    path: Optional[str] = None, examples: Optional[Dict[str, Sequence[str]]] = None
+) -> IntentClassifier:
+    """The model at ``path``, rebuilt there first if missing or stale; in memory without a path."""
+    examples = EXAMPLES if examples is None else examples
+    if not path:
+        return IntentClassifier.train(examples)
+    path = os.path.expanduser(path)
+    try:
+        model = IntentClassifier.load(path)
+        if model.digest == examples_digest(examples):
+            return model
+    except (OSError, ValueError, KeyError):
+        pass
+    model = IntentClassifier.train(examples)
+    try:
+        model.save(path)
+    except OSError:
+        pass  # read-only cache dir: keep the in-memory model
+    return model
\ No newline at end of file
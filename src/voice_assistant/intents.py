@@ -6,7 +6,7 @@ Project: Desktop Voice Assistant
 File: intents.py
 Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
 Created: 2025-10-20
-Updated: 2025-10-20
+Updated: 2026-10-18
 License: MIT License (see LICENSE file for details)
 ===================================================================
 
@@ -16,39 +16,144 @@ Lightweight intent parser based on keyword patterns.
 Usage:
 from voice_assistant.intents import parse_intent; intent, args = parse_intent("what's the time in Rome?")
 
+Notes:
+- All trigger patterns are compiled into one matcher that decides the intent and
+  locates its query slot in a single left-to-right scan; priority follows the
+  order of _PATTERNS.
+- FallbackParser adds a second stage for what the patterns miss: the n-gram
+  classifier in intent_model.py, loaded on the first miss. Its matches carry a
+  score; pattern matches have none. Intents that act on the desktop (opening a
+  browser) need a higher score, and file matches only ever search.
+
 ===================================================================
 """
 from __future__ import annotations
 
 import re
+import threading
 from dataclasses import dataclass
-from typing import Dict, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Pattern, Tuple
 
 
 @dataclass
 class Intent:
     name: str
     slots: Dict[str, str]
+    score: Optional[float] = None  # classifier confidence, for fallback matches only
 
 
 _PATTERNS = [
     ("time", re.compile(r"\b(time|what's the time|time in)\b", re.I)),
     ("weather", re.compile(r"\b(weather|temperature|forecast)\b", re.I)),
     ("wikipedia", re.compile(r"\b(wikipedia|who is|what is|tell me about)\b", re.I)),
+    ("file", re.compile(r"\b(open file|find file|list files|move file)\b", re.I)),
     ("web_search", re.compile(r"\b(search|google|open)\b", re.I)),
     ("joke", re.compile(r"\b(joke|make me laugh)\b", re.I)),
     ("system", re.compile(r"\b(shutdown|sleep|lock)\b", re.I)),
     ("email", re.compile(r"\b(send email|email)\b", re.I)),
-    ("file", re.compile(r"\b(open file|list files|move file)\b", re.I)),
 ]
 
 
+_CITY = re.compile(r"in ([A-Z][a-zA-Z\s,-]+)$")
+_FILE = re.compile(r"\b(open|find|list|move) files?\b\s*(.*)$", re.I)
+
+# Intents whose query slot is the utterance minus its leading trigger phrase.
+_QUERY_PREFIX_INTENTS = ("wikipedia", "web_search")
+
+# Leading question or command words dropped from a classifier match's query slot.
+_LEAD = re.compile(
+    r"^(?:(?:who|what|where)(?:'s|\s+(?:is|was|were|are))|tell me (?:something )?about|"
+    r"explain|define|information about|(?:search|look)(?: up| for)?(?: the web for)?|"
+    r"google|go to|browse to|open)\s+",
+    re.I,
+)
+# The same for a classifier "file" match, which becomes a search for what is left.
+_FILE_LEAD = re.compile(
+    r"^(?:where(?:'s|\s+(?:is|are))|find|locate|look for|search for|open|show me)\s+"
+    r"(?:(?:my|the|a)\s+)?",
+    re.I,
+)
+# Classifier matches that act on the desktop rather than just answer.
+_ACTION_INTENTS = ("web_search",)
+
+
+class IntentMatcher:
+    """Single-pass matcher compiled from an ordered list of (name, pattern) pairs.
+
+    All triggers are joined into one named-group alternation. A search returns the
+    leftmost trigger (the highest-priority one if several start at the same spot);
+    the scan then resumes just after it looking only for higher-priority triggers,
+    so the text is walked left to right once and the result is exactly the first
+    pattern the sequential loop would have matched.
+    """
+
+    def __init__(self, patterns: List[Tuple[str, Pattern[str]]]):
+        self.names = [name for name, _ in patterns]
+        bodies = [pat.pattern for _, pat in patterns]
+        # Triggers start with a word character, so the shared leading \b is a lookbehind;
+        # factoring it out of the alternation lets the engine skip ahead on first chars.
+        bounded = all(b.startswith(r"\b") and b.endswith(r"\b") for b in bodies)
+        if bounded:
+            bodies = [b[2:-2] for b in bodies]
+        alts = [f"(?P<_{i}>{body})" for i, body in enumerate(bodies)]
+        self._index = {f"_{i}": i for i in range(len(alts))}
+        # _scans[k] only knows the first k triggers; _scans[n] is the full matcher.
+        self._scans = []
+        for k in range(len(alts) + 1):
+            alt = "|".join(alts[:k]) or "(?!)"
+            self._scans.append(re.compile(rf"(?<!\w)(?:{alt})\b" if bounded else alt, re.I))
+
+    def match(self, text: str) -> Optional[Intent]:
+        if not text:
+            return None
+        m = self._scans[-1].search(text)
+        if m is None:
+            return None
+        best = self._index[m.lastgroup]
+        head = m if m.start() == 0 else None
+        while best:
+            nxt = self._scans[best].search(text, m.start() + 1)
+            if nxt is None:
+                break
+            m = nxt
+            best = self._index[m.lastgroup]
+        name = self.names[best]
+        if name == "weather":
+            city = _extract_city(text)
+            return Intent("weather", {"city": city} if city else {})
+        if name == "file":
+            return Intent("file", _file_slots(text))
+        if name in _QUERY_PREFIX_INTENTS:
+            q = text
+            if head is not None and head is m:
+                rest = text[m.end():]
+                if rest[:1].isspace():
+                    q = rest.lstrip()
+            return Intent(name, {"query": q} if q else {})
+        return Intent(name, {})
+
+
+_MATCHER = IntentMatcher(_PATTERNS)
+
+
 def _extract_city(text: str) -> Optional[str]:
-    m = re.search(r"in ([A-Z][a-zA-Z\s-]+)$", text.strip())
+    m = _CITY.search(text.strip())
     return m.group(1) if m else None
 
 
-def parse_intent(text: str) -> Optional[Intent]:
+def _file_slots(text: str) -> Dict[str, str]:
+    """{"action": open|find|list|move, "query": what follows the trigger, if anything}."""
+    m = _FILE.search(text)
+    if not m:
+        return {}
+    slots = {"action": m.group(1).lower()}
+    if m.group(2).strip():
+        slots["query"] = m.group(2).strip()
+    return slots
+
+
+def _parse_intent_sequential(text: str) -> Optional[Intent]:
+    """Reference implementation: try each pattern in turn (kept for parity checks)."""
     if not text:
         return None
     for name, pat in _PATTERNS:
@@ -56,6 +161,8 @@ def parse_intent(text: str) -> Optional[Intent]:
             if name == "weather":
                 city = _extract_city(text)
                 return Intent("weather", {"city": city} if city else {})
+            if name == "file":
+                return Intent("file", _file_slots(text))
             if name == "wikipedia":
                 q = re.sub(r"^(wikipedia|who is|what is|tell me about)\s+", "", text, flags=re.I)
                 return Intent("wikipedia", {"query": q} if q else {})
@@ -63,4 +170,79 @@ def parse_intent(text: str) -> Optional[Intent]:
                 q = re.sub(r"^(search|google|open)\s+", "", text, flags=re.I)
                 return Intent("web_search", {"query": q} if q else {})
             return Intent(name, {})
-    return None
\ No newline at end of file
+    return None
+
+
+def parse_intent(text: str) -> Optional[Intent]:
+    return _MATCHER.match(text)
+
+
+def _fallback_intent(name: str, text: str, score: float) -> Intent:
+    # No trigger phrase matched, so slots come from the whole utterance.
+    if name == "weather":
+        city = _extract_city(text)
+        slots = {"city": city} if city else {}
+    elif name == "file":
+        # Never "open" or "list" on a guess: that launches a file or the file manager.
+        q = _FILE_LEAD.sub("", text.strip()).rstrip("?!. ")
+        slots = {"action": "find", "query": q} if q else {"action": "find"}
+    elif name in _QUERY_PREFIX_INTENTS:
+        q = _LEAD.sub("", text.strip()).rstrip("?!. ")
+        slots = {"query": q} if q else {}
+    else:
+        slots = {}
+    return Intent(name, slots, score)
+
+
+class FallbackParser:
+    """parse_intent, then a classifier for the utterances it misses.
+
+    ``load`` returns the classifier (anything with ``predict(texts, threshold)``, see
+    intent_model.py). It is called at the first miss, so the model and NumPy stay
+    unloaded while the patterns cover everything. Matches of _ACTION_INTENTS must
+    score at least ``action_threshold``.
+    """
+
+    def __init__(
+        self,
+        load: Callable[[], Any],
+        threshold: float = 0.35,
+        parse: Callable[[str], Optional[Intent]] = parse_intent,
+        action_threshold: float = 0.5,
+    ):
+        self._load = load
+        self._model: Any = None
+        self._lock = threading.Lock()  # the pre-warm thread may get there first
+        self.threshold = threshold
+        self.action_threshold = action_threshold
+        self.parse = parse
+        self.fallbacks = 0
+
+    @property
+    def model(self) -> Any:
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    self._model = self._load()
+        return self._model
+
+    def prewarm(self) -> None:
+        _ = self.model
+
+    def __call__(self, text: str) -> Optional[Intent]:
+        return self.parse_many([text])[0]
+
+    def parse_many(self, texts: Iterable[str]) -> List[Optional[Intent]]:
+        """Parse a batch; the misses are classified together in one call."""
+        texts = list(texts)
+        out = [self.parse(t) for t in texts]
+        misses = [i for i, (t, it) in enumerate(zip(texts, out)) if it is None and t and t.strip()]
+        if misses:
+            predicted = self.model.predict([texts[i] for i in misses], self.threshold)
+            for i, (name, score) in zip(misses, predicted):
+                if name in _ACTION_INTENTS and score < self.action_threshold:
+                    continue
+                if name is not None:
+                    out[i] = _fallback_intent(name, texts[i], score)
+                    self.fallbacks += 1
+        return out
\ No newline at end of file
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: metrics.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Per-stage latency instrumentation: monotonic-clock spans recorded into HDR-style
+histograms, with Prometheus text and JSON export.
+
+Usage:
+from voice_assistant.metrics import METRICS
+with METRICS.span("stt"): text = backend.transcribe(audio)
+METRICS.enabled = True; print(METRICS.report())
+
+Notes:
+- METRICS is off by default. A disabled span() is one attribute check that
+  returns a shared no-op context manager, so instrumented code costs next to
+  nothing in normal use.
+- Histograms are log-linear over microseconds: exact below 128 us, then 64
+  sub-buckets per power of two (<= 1.6 % relative error) up to any value, in a
+  sparse dict. Memory depends on the spread of values, not on the sample count.
+- serve_prometheus() exposes /metrics as a summary per stage (p50/p95/p99, sum,
+  count); JsonDumper rewrites a JSON snapshot every few seconds.
+
+===================================================================
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+_SUB_BITS = 7
+_SUB = 1 << _SUB_BITS  # 128: values below are exact
+_HALF = _SUB >> 1  # 64 sub-buckets per octave above that
+
+
+def _index(us: int) -> int:
+    if us < _SUB:
+        return us
+    shift = us.bit_length() - _SUB_BITS
+    return shift * _HALF + (us >> shift)
+
+
+def _bucket_high(i: int) -> int:
+    """Largest value (us) that lands in bucket ``i``."""
+    if i < _SUB:
+        return i
+    shift, m = divmod(i - _HALF, _HALF)
+    return ((m + _HALF + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    def __init__(self) -> None:
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        i = _index(max(int(seconds * 1e6), 0))
+        self.counts[i] = self.counts.get(i, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for i, n in other.counts.items():
+            self.counts[i] = self.counts.get(i, 0) + n
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile, in seconds (0 if empty)."""
+        if not self.count:
+            return 0.0
+        rank = max(1, int(q * self.count + 0.5))
+        seen = 0
+        for i in sorted(self.counts):
+            seen += self.counts[i]
+            if seen >= rank:
+                return min(_bucket_high(i) / 1e6, self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        out = {"count": self.count, "sum": self.total, "max": self.max}
+        for q in QUANTILES:
+            out[f"p{round(q * 100)}"] = self.percentile(q)
+        return out
+
+
+class _Span:
+    __slots__ = ("_metrics", "_stage", "_t0")
+
+    def __init__(self, metrics: "Metrics", stage: str):
+        self._metrics = metrics
+        self._stage = stage
+
+    def __enter__(self) -> "_Span":
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._metrics.record(self._stage, time.perf_counter() - self._t0)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Metrics:
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._hists: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def span(self, stage: str):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, stage)
+
+    def record(self, stage: str, seconds: float) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            hist = self._hists.get(stage)
+            if hist is None:
+                hist = self._hists[stage] = LatencyHistogram()
+            hist.record(seconds)
+
+    def snapshot(self) -> Dict[str, LatencyHistogram]:
+        with self._lock:
+            out = {}
+            for stage, hist in self._hists.items():
+                copy = LatencyHistogram()
+                copy.merge(hist)
+                out[stage] = copy
+            return out
+
+    def reset(self) -> None:
+        with self._lock:
+            self._hists.clear()
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        return {stage: h.summary() for stage, h in sorted(self.snapshot().items())}
+
+    def report(self) -> str:
+        rows = self.as_dict()
+        if not rows:
+            return "no stages recorded"
+        width = max(len("stage"), *(len(s) for s in rows))
+        cols = "".join(f"  {c:>9}" for c in ("p50 ms", "p95 ms", "p99 ms", "max ms"))
+        lines = [f"{'stage':<{width}}  {'count':>7}{cols}"]
+        for stage, s in rows.items():
+            lines.append(
+                f"{stage:<{width}}  {s['count']:>7}  {s['p50'] * 1000:>9.2f}"
+                f"  {s['p95'] * 1000:>9.2f}  {s['p99'] * 1000:>9.2f}  {s['max'] * 1000:>9.2f}"
+            )
+        return "\n".join(lines)
+
+    def prometheus(self, prefix: str = "voice_assistant_stage_seconds") -> str:
+        lines = [
+            f"# HELP {prefix} Latency of each assistant pipeline stage.",
+            f"# TYPE {prefix} summary",
+        ]
+        for stage, s in self.as_dict().items():
+            label = stage.replace("\\", "\\\\").replace('"', '\\"')
+            for q in QUANTILES:
+                value = s[f"p{round(q * 100)}"]
+                lines.append(f'{prefix}{{stage="{label}",quantile="{q}"}} {value:.6f}')
+            lines.append(f'{prefix}_sum{{stage="{label}"}} {s["sum"]:.6f}')
+            lines.append(f'{prefix}_count{{stage="{label}"}} {s["count"]}')
+        return "\n".join(lines) + "\n"
+
+
+METRICS = Metrics()
+
+
+def serve_prometheus(
+    metrics: Metrics = METRICS, port: int = 9464, host: str = "127.0.0.1"
+) -> ThreadingHTTPServer:
+    """Serve ``/metrics`` on a daemon thread; call .shutdown() on the result to stop."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+class JsonDumper:
+    """Rewrites ``path`` with a JSON snapshot every ``interval`` s, and once on close()."""
+
+    def __init__(self, path: str, metrics: Metrics = METRICS, interval: float = 60.0):
+        self.path = path
+        self.metrics = metrics
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-json", daemon=True)
+        self._thread.start()
+
+    def dump(self) -> None:
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"time": time.time(), "stages": self.metrics.as_dict()}, f, indent=2)
+        os.replace(tmp, self.path)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.dump()
+
+    def close(self) -> None:
+        self._stop.set()
+        self._thread.join(2)
+        self.dump()
\ No newline at end of file
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: paths.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Default locations shared by the configuration and the one-shot client.
+
+Usage:
+from voice_assistant.paths import default_socket_path
+
+Notes:
+- Standard library only: client.py imports it and must stay cheap to start.
+
+===================================================================
+"""
+from __future__ import annotations
+
+import os
+
+
+def default_socket_path() -> str:
+    runtime = os.getenv("XDG_RUNTIME_DIR")
+    if runtime:
+        return os.path.join(runtime, "voice-assistant.sock")
+    return os.path.join(os.path.expanduser("~"), ".cache", "voice_assistant", "daemon.sock")
\ No newline at end of file
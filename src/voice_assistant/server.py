@@ -0,0 +1,536 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: server.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Multi-session server mode: the asyncio core over HTTP and WebSocket, for thin
+clients. Answers come back as text; nothing is spoken on the server unless it
+was given a TTS engine (the resident daemon).
+
+Usage:
+voice-assistant serve --host 127.0.0.1 --port 8765
+curl -d '{"text": "what time is it"}' http://127.0.0.1:8765/v1/command
+voice-assistant daemon    (the same protocol on a Unix socket; see client.py)
+websocket ws://127.0.0.1:8765/v1/ws  ->  send "tell me a joke", receive {"answer": ...}
+
+Notes:
+- One skill registry is shared by every session. Each session gets its own
+  SessionContext and AssistantCore, so preemption and timeouts stay within the
+  session. Blocking skills run on a shared thread pool (VA_SERVER_WORKERS).
+- POST /v1/command takes {"text", "session"?, "preempt"?} and returns {"session",
+  "answer", "interrupted"}. The session id is chosen by the client, and the
+  session is created on first use. Without one the command runs in a one-off
+  session. Idle sessions expire after VA_SESSION_TTL seconds.
+- A WebSocket connection is one session. Each text frame (plain text, or JSON
+  {"text", "id"?}) is a command, and a newer one preempts the one still running,
+  as at the interactive prompt. Replies are JSON {"id", "answer", "interrupted"}.
+- With VA_SERVER_TOKEN set, requests need "Authorization: Bearer <token>" (or
+  ?token= on the WebSocket URL).
+- start_unix() listens on a Unix domain socket (mode 0600, so no token is asked
+  for). A flock on <socket>.lock, holding the daemon's pid, keeps it to one
+  daemon per socket; a socket file left behind by a dead daemon is replaced.
+- HTTP/1.1 with keep-alive and a minimal RFC 6455 implementation on asyncio
+  streams: no framework dependency.
+
+===================================================================
+"""
+from __future__ import annotations
+
+import asyncio
+import base64
+import errno
+import hashlib
+import hmac
+import json
+import os
+import struct
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .config import Config
+from .core import AssistantCore
+from .intents import Intent, parse_intent
+from .skills.base import SkillRegistry
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+MAX_BODY = 64 * 1024
+MAX_FRAME = 64 * 1024
+
+OP_CONT, OP_TEXT, OP_BINARY, OP_CLOSE, OP_PING, OP_PONG = 0x0, 0x1, 0x2, 0x8, 0x9, 0xA
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    401: "Unauthorized",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    503: "Service Unavailable",
+}
+
+
+class ProtocolError(Exception):
+    pass
+
+
+class SessionContext:
+    """Per-session skill context: speech is only counted unless there is a TTS engine;
+    the answer text goes back either way."""
+
+    def __init__(self, cfg: Config, session_id: str, tts: Any = None):
+        self.cfg = cfg
+        self.session_id = session_id
+        self.tts = tts
+        self.spoken = 0
+
+    def speak(self, text: str) -> None:
+        self.spoken += 1
+        if self.tts is not None:
+            self.tts.say(text)
+
+
+class Session:
+    def __init__(self, session_id: str, core: AssistantCore):
+        self.id = session_id
+        self.core = core
+        self.last_seen = time.monotonic()
+
+
+# -- WebSocket framing ------------------------------------------------------------
+
+
+def ws_accept_key(key: str) -> str:
+    return base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+
+
+def encode_frame(opcode: int, payload: bytes, mask: bool = False) -> bytes:
+    """One unfragmented frame; clients must mask, servers must not."""
+    n = len(payload)
+    head = bytes([0x80 | opcode])
+    bit = 0x80 if mask else 0
+    if n < 126:
+        head += bytes([bit | n])
+    elif n < 1 << 16:
+        head += bytes([bit | 126]) + struct.pack("!H", n)
+    else:
+        head += bytes([bit | 127]) + struct.pack("!Q", n)
+    if not mask:
+        return head + payload
+    key = os.urandom(4)
+    return head + key + _xor(payload, key)
+
+
+def _xor(data: bytes, key: bytes) -> bytes:
+    if not data:
+        return data
+    n = len(data)
+    stream = (key * (n // 4 + 1))[:n]
+    return (int.from_bytes(data, "big") ^ int.from_bytes(stream, "big")).to_bytes(n, "big")
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Tuple[bool, int, bytes]:
+    """(fin, opcode, unmasked payload) of the next frame."""
+    b0, b1 = await reader.readexactly(2)
+    n = b1 & 0x7F
+    if n == 126:
+        (n,) = struct.unpack("!H", await reader.readexactly(2))
+    elif n == 127:
+        (n,) = struct.unpack("!Q", await reader.readexactly(8))
+    if n > MAX_FRAME:
+        raise ProtocolError("frame too large")
+    key = await reader.readexactly(4) if b1 & 0x80 else b""
+    payload = await reader.readexactly(n)
+    return bool(b0 & 0x80), b0 & 0x0F, _xor(payload, key) if key else payload
+
+
+async def read_message(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> Optional[str]:
+    """Next text/binary message, reassembling fragments and answering pings; None on close."""
+    parts: List[bytes] = []
+    while True:
+        fin, opcode, payload = await read_frame(reader)
+        if opcode == OP_CLOSE:
+            return None
+        if opcode == OP_PING:
+            writer.write(encode_frame(OP_PONG, payload))
+            continue
+        if opcode == OP_PONG:
+            continue
+        parts.append(payload)
+        if sum(map(len, parts)) > MAX_FRAME:
+            raise ProtocolError("message too large")
+        if fin:
+            return b"".join(parts).decode("utf-8", "replace")
+
+
+# -- HTTP -------------------------------------------------------------------------
+
+
+async def _read_request(
+    reader: asyncio.StreamReader,
+) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, _ = line.decode("latin-1").split(" ", 2)
+    except ValueError:
+        raise ProtocolError("bad request line")
+    headers: Dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length") or 0)
+    if length > MAX_BODY:
+        raise ProtocolError("body too large")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target, headers, body
+
+
+def _response(status: int, data: Any, keep_alive: bool = True) -> bytes:
+    body = json.dumps(data).encode()
+    head = (
+        f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode() + body
+
+
+class AssistantServer:
+    def __init__(
+        self,
+        cfg: Config,
+        skills: SkillRegistry,
+        session_ttl: Optional[float] = None,
+        max_sessions: Optional[int] = None,
+        workers: Optional[int] = None,
+        token: Optional[str] = None,
+        tts: Any = None,
+        parse: Callable[[str], Optional[Intent]] = parse_intent,
+    ):
+        self.cfg = cfg
+        self.tts = tts
+        self.parse = parse
+        self.skills = skills
+        self.session_ttl = cfg.session_ttl if session_ttl is None else session_ttl
+        self.max_sessions = cfg.server_max_sessions if max_sessions is None else max_sessions
+        self.workers = workers or cfg.server_workers
+        self.token = token if token is not None else cfg.server_token
+        self.sessions: Dict[str, Session] = {}
+        self.requests = 0
+        self.inflight = 0
+        self.last_active = time.monotonic()
+        self._servers: List[asyncio.AbstractServer] = []
+        self._reaper: Optional["asyncio.Task[None]"] = None
+        self._unix_paths: List[str] = []
+        self._lock: Any = None
+
+    # -- lifecycle ------------------------------------------------------------
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765) -> int:
+        """Listen on host:port (0 = any free port); returns the bound port."""
+        self._setup()
+        server = await asyncio.start_server(self._client, host, port, limit=MAX_BODY)
+        self._servers.append(server)
+        return server.sockets[0].getsockname()[1]
+
+    async def start_unix(self, path: str) -> None:
+        """Listen on a Unix domain socket that only this user can connect to.
+
+        Raises OSError(EADDRINUSE) if a daemon already serves ``path``.
+        """
+        self._setup()
+        os.makedirs(os.path.dirname(path) or ".", mode=0o700, exist_ok=True)
+        self._lock = _lock_socket(path)
+        try:
+            os.unlink(path)  # we hold the lock, so any socket file here is stale
+        except FileNotFoundError:
+            pass
+        umask = os.umask(0o177)
+        try:
+            server = await asyncio.start_unix_server(self._client, path, limit=MAX_BODY)
+        finally:
+            os.umask(umask)
+        self._servers.append(server)
+        self._unix_paths.append(path)
+
+    async def wait_idle(self, idle: float) -> None:
+        """Return once no command has come in for ``idle`` seconds."""
+        while True:
+            left = self.last_active + idle - time.monotonic()
+            if left <= 0 and not self.inflight:
+                return
+            await asyncio.sleep(max(left, 1.0))
+
+    def _setup(self) -> None:
+        if self._reaper is not None:
+            return
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(ThreadPoolExecutor(self.workers, thread_name_prefix="skill"))
+        self._reaper = asyncio.ensure_future(self._expire_sessions())
+
+    async def close(self) -> None:
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        if self._reaper is not None:
+            self._reaper.cancel()
+        for session in self.sessions.values():
+            session.core.preempt()
+        for path in self._unix_paths:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+        if self._lock is not None:
+            self._lock.close()  # releases the flock
+            self._lock = None
+
+    async def serve_forever(self) -> None:
+        await asyncio.gather(*(s.serve_forever() for s in self._servers))
+
+    async def _expire_sessions(self) -> None:
+        while True:
+            await asyncio.sleep(max(1.0, min(self.session_ttl / 4, 60.0)))
+            cutoff = time.monotonic() - self.session_ttl
+            for sid in [s.id for s in self.sessions.values() if s.last_seen < cutoff]:
+                self.sessions.pop(sid).core.preempt()
+
+    # -- sessions -------------------------------------------------------------
+
+    def open_session(
+        self, session_id: Optional[str] = None, keep: bool = True
+    ) -> Optional[Session]:
+        """The session with this id, created if new; None when the server is full.
+
+        With keep=False the session is one-off and not tracked.
+        """
+        if session_id in self.sessions:
+            session = self.sessions[session_id]
+            session.last_seen = time.monotonic()
+            return session
+        if keep and len(self.sessions) >= self.max_sessions:
+            return None
+        sid = session_id or uuid.uuid4().hex
+        core = AssistantCore(
+            SessionContext(self.cfg, sid, self.tts),
+            self.skills,
+            timeout=self.cfg.skill_timeout or None,
+            on_preempt=self.tts.stop if self.tts is not None else None,
+            parse=self.parse,
+            speculate_after=0,
+        )
+        session = Session(sid, core)
+        if keep:
+            self.sessions[sid] = session
+        return session
+
+    # -- connections ----------------------------------------------------------
+
+    def _authorized(self, target: str, headers: Dict[str, str]) -> bool:
+        if not self.token:
+            return True
+        given = headers.get("authorization", "")
+        given = given[7:] if given.lower().startswith("bearer ") else ""
+        if not given:
+            given = parse_qs(urlsplit(target).query).get("token", [""])[0]
+        return hmac.compare_digest(given.encode(), self.token.encode())
+
+    async def _client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except ProtocolError as e:
+                    writer.write(_response(400, {"error": str(e)}, keep_alive=False))
+                    break
+                if request is None:
+                    break
+                method, target, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                path = urlsplit(target).path
+                if not self._authorized(target, headers):
+                    writer.write(_response(401, {"error": "unauthorized"}, keep_alive))
+                elif path == "/v1/ws" and headers.get("upgrade", "").lower() == "websocket":
+                    await self._websocket(reader, writer, headers)
+                    break
+                else:
+                    status, data = await self._http(method, path, body)
+                    writer.write(_response(status, data, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _http(self, method: str, path: str, body: bytes) -> Tuple[int, Any]:
+        if path == "/v1/health":
+            return 200, {"status": "ok", "sessions": len(self.sessions)}
+        if path != "/v1/command":
+            return 404, {"error": "not found"}
+        if method != "POST":
+            return 405, {"error": "use POST"}
+        try:
+            req = json.loads(body or b"{}")
+            text = str(req["text"])
+        except (ValueError, KeyError, TypeError):
+            return 400, {"error": 'expected JSON {"text": ...}'}
+        sid = req.get("session")
+        session = self.open_session(str(sid) if sid else None, keep=bool(sid))
+        if session is None:
+            return 503, {"error": "too many sessions"}
+        self.requests += 1
+        self.inflight += 1
+        try:
+            ans = await session.core.handle(text, preempt=bool(req.get("preempt", False)))
+        finally:
+            self.inflight -= 1
+        session.last_seen = self.last_active = time.monotonic()
+        return 200, {"session": sid, "answer": ans, "interrupted": ans is None}
+
+    async def _websocket(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, headers: Dict[str, str]
+    ) -> None:
+        key = headers.get("sec-websocket-key")
+        if not key:
+            writer.write(_response(400, {"error": "missing Sec-WebSocket-Key"}, keep_alive=False))
+            return
+        session = self.open_session()
+        if session is None:
+            writer.write(_response(503, {"error": "too many sessions"}, keep_alive=False))
+            return
+        writer.write(
+            (
+                "HTTP/1.1 101 Switching Protocols\r\n"
+                "Upgrade: websocket\r\nConnection: Upgrade\r\n"
+                f"Sec-WebSocket-Accept: {ws_accept_key(key)}\r\n\r\n"
+            ).encode()
+        )
+        running: set = set()
+
+        async def answer(text: str, msg_id: Any) -> None:
+            self.requests += 1
+            self.inflight += 1
+            try:
+                ans = await session.core.handle(text)
+            finally:
+                self.inflight -= 1
+            session.last_seen = self.last_active = time.monotonic()
+            reply = {"id": msg_id, "answer": ans, "interrupted": ans is None}
+            writer.write(encode_frame(OP_TEXT, json.dumps(reply).encode()))
+
+        code = 1000
+        try:
+            while True:
+                message = await read_message(reader, writer)
+                if message is None:
+                    break
+                text, msg_id = message, None
+                if message.lstrip().startswith("{"):
+                    try:
+                        req = json.loads(message)
+                        text, msg_id = str(req.get("text", "")), req.get("id")
+                    except ValueError:
+                        pass
+                task = asyncio.ensure_future(answer(text, msg_id))
+                running.add(task)
+                task.add_done_callback(running.discard)
+        except ProtocolError:
+            code = 1009
+        finally:
+            for task in running:
+                task.cancel()  # nobody is left to read the answers
+            await asyncio.gather(*running, return_exceptions=True)
+            self.sessions.pop(session.id, None)
+        writer.write(encode_frame(OP_CLOSE, struct.pack("!H", code)))
+        await writer.drain()
+
+
+def _lock_socket(path: str) -> Any:
+    """Exclusive flock on <path>.lock, with our pid in it; EADDRINUSE if already held."""
+    import fcntl
+
+    fd = os.open(path + ".lock", os.O_RDWR | os.O_CREAT, 0o600)
+    lock = os.fdopen(fd, "r+")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock.close()
+        raise OSError(errno.EADDRINUSE, f"a daemon is already serving {path}")
+    lock.truncate(0)
+    lock.write(str(os.getpid()))
+    lock.flush()
+    return lock
+
+
+def daemon_pid(path: str) -> Optional[int]:
+    """Pid of the daemon serving ``path``, or None if there is none."""
+    import fcntl
+
+    try:
+        with open(path + ".lock", "r+") as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                return int(lock.read().strip() or 0) or None
+            return None  # nobody holds the lock
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+async def serve(
+    cfg: Config,
+    skills: SkillRegistry,
+    host: str,
+    port: int,
+    parse: Callable[[str], Optional[Intent]] = parse_intent,
+) -> None:
+    server = AssistantServer(cfg, skills, parse=parse)
+    bound = await server.start(host, port)
+    print(f"Serving on http://{host}:{bound} (POST /v1/command, WebSocket /v1/ws)")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+async def serve_unix(
+    cfg: Config,
+    skills: SkillRegistry,
+    path: str,
+    tts: Any = None,
+    idle: float = 0.0,
+    parse: Callable[[str], Optional[Intent]] = parse_intent,
+) -> None:
+    """The resident daemon: serve ``path`` until SIGTERM, or ``idle`` seconds without a command."""
+    import signal
+
+    server = AssistantServer(cfg, skills, token="", tts=tts, parse=parse)
+    await server.start_unix(path)
+    print(f"Listening on {path} (pid {os.getpid()})", flush=True)
+    stop = asyncio.ensure_future(server.wait_idle(idle) if idle > 0 else server.serve_forever())
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.cancel)
+    try:
+        await stop
+    except asyncio.CancelledError:
+        pass
+    finally:
+        await server.close()
\ No newline at end of file
@@ -6,7 +6,7 @@ Project: Desktop Voice Assistant
 File: base.py
 Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
 Created: 2025-10-20
-Updated: 2025-10-20
+Updated: 2026-10-18
 License: MIT License (see LICENSE file for details)
 ===================================================================
 
@@ -14,13 +14,37 @@ Description:
 Skill base class and registry utilities.
 
 Usage:
-Subclass Skill and implement can_handle/handle.
+Subclass Skill, declare the intent names it serves in `intents`, and implement handle.
+
+Notes:
+- SkillRegistry indexes skills by intent once, so routing is a dict lookup.
+  Several skills may serve one intent: they run in descending `priority` (then
+  registration order) until one returns a non-None answer.
+- Skills that only override can_handle (no `intents`) still work through a
+  linear fallback scan.
+- LazySkill registers a skill by its intents and a "module:Class" path; the module
+  is imported and the skill built on first dispatch (or by SkillRegistry.prewarm),
+  so startup does not pay for skills the session never uses.
+- `speculative = True` marks a skill as free of side effects other than speaking,
+  so the core may start it from an interim transcript and throw the result away.
+- handle_async is what the asyncio core awaits: by default it runs the blocking
+  handle on the loop's executor. AsyncSkill subclasses implement handle_async
+  directly and keep a blocking handle for synchronous callers.
+- Third-party skills are discovered through the "voice_assistant.skills" entry-point
+  group; each entry point is a callable taking the Config and returning a Skill.
 
 ===================================================================
 """
 from __future__ import annotations
 
-from typing import Optional, Protocol
+import asyncio
+import importlib
+import sys
+import threading
+from importlib import metadata
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Protocol, Tuple
+
+ENTRY_POINT_GROUP = "voice_assistant.skills"
 
 
 class Context(Protocol):
@@ -29,9 +53,148 @@ class Context(Protocol):
 
 class Skill:
     name: str = "base"
+    intents: Tuple[str, ...] = ()
+    priority: int = 0
+    speculative: bool = False
 
     def can_handle(self, intent_name: str) -> bool:
-        return False
+        return intent_name in self.intents
+
+    def handle(self, ctx: Context, intent_name: str, slots: dict) -> Optional[str]:
+        raise NotImplementedError
+
+    async def handle_async(self, ctx: Context, intent_name: str, slots: dict) -> Optional[str]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.handle, ctx, intent_name, slots)
+
+
+class AsyncSkill(Skill):
+    """Skill written as a coroutine; it runs on the event loop, not in a thread."""
+
+    async def handle_async(self, ctx: Context, intent_name: str, slots: dict) -> Optional[str]:
+        raise NotImplementedError
+
+    def handle(self, ctx: Context, intent_name: str, slots: dict) -> Optional[str]:
+        return asyncio.run(self.handle_async(ctx, intent_name, slots))
+
+
+class LazySkill(Skill):
+    """Stand-in for a skill that is imported and instantiated on first use.
+
+    ``intents``, ``priority`` and ``speculative`` must mirror the real skill's so the
+    registry can index it without importing anything.  ``factory`` receives the skill class and
+    returns the instance (default: ``cls()``).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        intents: Iterable[str],
+        target: str,
+        factory: Optional[Callable[[type], Skill]] = None,
+        priority: int = 0,
+        speculative: bool = False,
+    ):
+        self.name = name
+        self.intents = tuple(intents)
+        self.priority = priority
+        self.speculative = speculative
+        self.target = target
+        self._factory = factory
+        self._skill: Optional[Skill] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._skill is not None
+
+    def load(self) -> Skill:
+        if self._skill is None:
+            with self._lock:
+                if self._skill is None:
+                    module, _, attr = self.target.partition(":")
+                    cls = getattr(importlib.import_module(module), attr)
+                    self._skill = self._factory(cls) if self._factory else cls()
+        return self._skill
 
     def handle(self, ctx: Context, intent_name: str, slots: dict) -> Optional[str]:
-        raise NotImplementedError
\ No newline at end of file
+        return self.load().handle(ctx, intent_name, slots)
+
+    async def handle_async(self, ctx: Context, intent_name: str, slots: dict) -> Optional[str]:
+        skill = self._skill
+        if skill is None:  # importing may block, keep it off the loop
+            skill = await asyncio.get_running_loop().run_in_executor(None, self.load)
+        return await skill.handle_async(ctx, intent_name, slots)
+
+
+class SkillRegistry:
+    def __init__(self, skills: Iterable[Skill] = ()):
+        self.skills: List[Skill] = []
+        self._index: Dict[str, List[Skill]] = {}
+        self._legacy: List[Skill] = []
+        for skill in skills:
+            self.register(skill)
+
+    def register(self, skill: Skill) -> None:
+        self.skills.append(skill)
+        if not skill.intents:
+            self._legacy.append(skill)
+            return
+        for intent in skill.intents:
+            handlers = self._index.setdefault(intent, [])
+            handlers.append(skill)
+            # sort is stable, so equal priorities keep registration order
+            handlers.sort(key=lambda s: -s.priority)
+
+    def handlers(self, intent_name: str) -> List[Skill]:
+        found = self._index.get(intent_name)
+        if found is not None:
+            return found
+        return [s for s in self._legacy if s.can_handle(intent_name)]
+
+    def dispatch(self, ctx: Context, intent_name: str, slots: dict) -> Optional[str]:
+        """Run the handlers for ``intent_name`` in priority order; None if none answered."""
+        for skill in self.handlers(intent_name):
+            ans = skill.handle(ctx, intent_name, slots)
+            if ans is not None:
+                return ans
+        return None
+
+    def prewarm(self) -> int:
+        """Load every LazySkill not loaded yet; returns how many were loaded.
+
+        Failures are reported and left for the first dispatch to raise again.
+        """
+        n = 0
+        for skill in self.skills:
+            if isinstance(skill, LazySkill) and not skill.loaded:
+                try:
+                    skill.load()
+                    n += 1
+                except Exception as e:
+                    print(f"Could not pre-load skill {skill.name!r}: {e}", file=sys.stderr)
+        return n
+
+    def __iter__(self) -> Iterator[Skill]:
+        return iter(self.skills)
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+
+def load_entry_point_skills(cfg: Any) -> List[Skill]:
+    try:
+        eps = metadata.entry_points()
+        if hasattr(eps, "select"):
+            group = eps.select(group=ENTRY_POINT_GROUP)
+        else:
+            group = eps.get(ENTRY_POINT_GROUP, [])
+    except Exception:  # pragma: no cover
+        return []
+    skills = []
+    for ep in group:
+        try:
+            skills.append(ep.load()(cfg))
+        except Exception as e:
+            print(f"Skipping skill plugin {ep.name!r}: {e}", file=sys.stderr)
+    return skills
\ No newline at end of file
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: cache.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Shared TTL response cache for network-backed skills (weather, Wikipedia, ...).
+
+Usage:
+cache.get_or_fetch("weather", city, lambda: _wttr(city), ttl=600, stale_ttl=3600)
+
+Notes:
+- In-memory LRU in front of an optional SQLite file, so warm answers survive restarts.
+- Stale-while-revalidate: an entry older than ttl but younger than stale_ttl is
+  returned at once while a background thread refreshes it.
+- Failed lookups (None) are never cached.
+
+===================================================================
+"""
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Optional, Set, Tuple
+
+Entry = Tuple[str, float]  # (value, stored_at)
+
+
+class ResponseCache:
+    def __init__(
+        self, path: Optional[str] = None, max_entries: int = 1024, max_disk_entries: int = 50_000
+    ):
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self._mem: "OrderedDict[Tuple[str, str], Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._refreshing: Set[Tuple[str, str]] = set()
+        self._writes = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self._db: Optional[sqlite3.Connection] = None
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " ns TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,"
+                " stored_at REAL NOT NULL, accessed_at REAL NOT NULL,"
+                " PRIMARY KEY (ns, key))"
+            )
+            self._db.commit()
+
+    def get_or_fetch(
+        self,
+        ns: str,
+        key: str,
+        fetch: Callable[[], Optional[str]],
+        ttl: float,
+        stale_ttl: Optional[float] = None,
+    ) -> Optional[str]:
+        k = (ns, key)
+        entry = self._get(k)
+        if entry is not None:
+            value, stored_at = entry
+            age = time.time() - stored_at
+            if age < ttl:
+                with self._lock:
+                    self.hits += 1
+                return value
+            if stale_ttl is not None and age < stale_ttl:
+                with self._lock:
+                    self.stale_hits += 1
+                self._refresh_in_background(k, fetch)
+                return value
+        with self._lock:
+            self.misses += 1
+        value = fetch()
+        if value:
+            self.put(ns, key, value)
+        return value
+
+    def put(self, ns: str, key: str, value: str, stored_at: Optional[float] = None) -> None:
+        k = (ns, key)
+        now = time.time() if stored_at is None else stored_at
+        with self._lock:
+            self._remember(k, (value, now))
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                    (ns, key, value, now, now),
+                )
+                self._writes += 1
+                if self._writes % 100 == 0:
+                    self._prune_disk()
+                self._db.commit()
+
+    def _get(self, k: Tuple[str, str]) -> Optional[Entry]:
+        with self._lock:
+            entry = self._mem.get(k)
+            if entry is not None:
+                self._mem.move_to_end(k)
+                return entry
+            if self._db is None:
+                return None
+            row = self._db.execute(
+                "SELECT value, stored_at FROM responses WHERE ns = ? AND key = ?", k
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute(
+                "UPDATE responses SET accessed_at = ? WHERE ns = ? AND key = ?", (time.time(), *k)
+            )
+            self._db.commit()
+            entry = (row[0], row[1])
+            self._remember(k, entry)
+            return entry
+
+    def _remember(self, k: Tuple[str, str], entry: Entry) -> None:
+        self._mem[k] = entry
+        self._mem.move_to_end(k)
+        while len(self._mem) > self.max_entries:
+            self._mem.popitem(last=False)
+
+    def _prune_disk(self) -> None:
+        self._db.execute(
+            "DELETE FROM responses WHERE rowid IN (SELECT rowid FROM responses"
+            " ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_disk_entries,),
+        )
+
+    def _refresh_in_background(
+        self, k: Tuple[str, str], fetch: Callable[[], Optional[str]]
+    ) -> None:
+        with self._lock:
+            if k in self._refreshing:
+                return
+            self._refreshing.add(k)
+
+        def run():
+            try:
+                value = fetch()
+                if value:
+                    self.put(k[0], k[1], value)
+            except Exception:
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing.discard(k)
+
+        threading.Thread(target=run, name=f"cache-refresh-{k[0]}", daemon=True).start()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._mem),
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
\ No newline at end of file
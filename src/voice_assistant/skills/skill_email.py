@@ -6,7 +6,7 @@ Project: Desktop Voice Assistant
 File: skill_email.py
 Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
 Created: 2025-10-20
-Updated: 2025-10-20
+Updated: 2026-10-18
 License: MIT License (see LICENSE file for details)
 ===================================================================
 
@@ -16,25 +16,33 @@ Send a short email via SMTP when enabled.
 Usage:
 Programmatic invocation by intent "email".
 
+Notes:
+- With a MailQueue the message is only enqueued: handle() answers at once and the
+  queue sends it over a reused SMTP session. A failed delivery is reported on the
+  console, since the command has already been answered by then.
+- Without one, the message is sent before handle() returns.
+
 ===================================================================
 """
 from __future__ import annotations
 
-import smtplib
+import sys
+from concurrent.futures import Future
 from email.message import EmailMessage
+from typing import Optional
 
 from .base import Skill
 from ..config import Config
+from ..smtp_client import MailQueue, SMTPConnection
 
 
 class EmailSkill(Skill):
     name = "email"
+    intents = ("email",)
 
-    def __init__(self, cfg: Config):
+    def __init__(self, cfg: Config, mailer: Optional[MailQueue] = None):
         self.cfg = cfg
-
-    def can_handle(self, intent_name: str) -> bool:
-        return intent_name == "email"
+        self.mailer = mailer
 
     def handle(self, ctx, intent_name: str, slots: dict):
         if not self.cfg.allow_email:
@@ -48,23 +56,27 @@ class EmailSkill(Skill):
             msg = "No recipient configured. Set VA_EMAIL_SENDER or provide 'to' slot."
             ctx.speak(msg)
             return msg
-        try:
-            m = EmailMessage()
-            m["From"] = self.cfg.email_sender
-            m["To"] = to
-            m["Subject"] = subject
-            m.set_content(body)
-
-            if self.cfg.smtp_use_tls:
-                server = smtplib.SMTP(self.cfg.smtp_host, self.cfg.smtp_port)
-                server.starttls()
-            else:
-                server = smtplib.SMTP_SSL(self.cfg.smtp_host, self.cfg.smtp_port)
-            server.login(self.cfg.smtp_user, self.cfg.smtp_password)
-            server.send_message(m)
-            server.quit()
-            msg = f"Email sent to {to}."
-        except Exception as e:
-            msg = f"Failed to send email: {e}"
+        m = EmailMessage()
+        m["From"] = self.cfg.email_sender
+        m["To"] = to
+        m["Subject"] = subject
+        m.set_content(body)
+        if self.mailer is not None:
+            self.mailer.send(m).add_done_callback(lambda fut: _report_failure(fut, to))
+            msg = f"Sending email to {to}."
+        else:
+            conn = SMTPConnection.from_config(self.cfg)
+            try:
+                conn.send(m)
+                msg = f"Email sent to {to}."
+            except Exception as e:
+                msg = f"Failed to send email: {e}"
+            finally:
+                conn.close()
         ctx.speak(msg)
-        return msg
\ No newline at end of file
+        return msg
+
+
+def _report_failure(fut: Future, to: str) -> None:
+    if not fut.cancelled() and fut.exception() is not None:
+        print(f"Failed to send email to {to}: {fut.exception()}", file=sys.stderr)
\ No newline at end of file
@@ -6,15 +6,24 @@ Project: Desktop Voice Assistant
 File: skill_files.py
 Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
 Created: 2025-10-20
-Updated: 2025-10-20
+Updated: 2026-10-18
 License: MIT License (see LICENSE file for details)
 ===================================================================
 
 Description:
-Lightweight file operations (list/open) in a safe manner.
+Lightweight file operations (list/open/find) in a safe manner.
 
 Usage:
-Intent: "file"; operations could be extended.
+Intent: "file" with slots action (open|find|list|move) and query, e.g.
+"open file quarterly report", "find file budget", "list files in Downloads".
+
+Notes:
+- open/find look names up in the background FileIndex (see file_index.py). While
+  the first crawl is still running, only already-indexed files can be found.
+- "open" only launches a file whose name contains the query or matches it closely;
+  weaker matches are read out like "find" results.
+- Listings keep the first entries with a bounded heap rather than sorting the
+  whole directory.
 
 ===================================================================
 """
@@ -24,29 +33,75 @@ import os
 import subprocess
 import sys
 from pathlib import Path
+from typing import Optional
 
 from .base import Skill
+from ..file_index import FileIndex, strong_match, top_entries
+
+LIST_LIMIT = 10
 
 
 class FilesSkill(Skill):
     name = "file"
+    intents = ("file",)
 
-    def can_handle(self, intent_name: str) -> bool:
-        return intent_name == "file"
+    def __init__(self, index: Optional[FileIndex] = None):
+        self.index = index
 
     def handle(self, ctx, intent_name: str, slots: dict):
-        # Demo: list current directory and open it
-        cwd = Path.cwd()
-        entries = ", ".join(sorted(p.name for p in cwd.iterdir())[:10])
-        msg = f"Here are some files in {cwd}: {entries}"
-        try:
-            if sys.platform.startswith("win"):
-                os.startfile(str(cwd))  # type: ignore
-            elif sys.platform == "darwin":
-                subprocess.run(["open", str(cwd)], check=False)
-            else:
-                subprocess.run(["xdg-open", str(cwd)], check=False)
-        except Exception:
-            pass
+        action = slots.get("action", "list")
+        query = slots.get("query", "")
+        if action == "move":
+            msg = "I can't move files."
+        elif action in ("open", "find") and query:
+            msg = self._search(action, query)
+        else:
+            msg = self._list(query)
         ctx.speak(msg)
-        return msg
\ No newline at end of file
+        return msg
+
+    def _search(self, action: str, query: str) -> str:
+        if self.index is None:
+            return "File search is off. Set VA_FILE_ROOTS to the folders to index."
+        matches = self.index.search(query, k=3)
+        if not matches:
+            if not self.index.ready.is_set():
+                return f"I'm still indexing your files and haven't found '{query}' yet."
+            return f"I couldn't find a file matching '{query}'."
+        if action == "open" and strong_match(query, matches[0]):
+            _open(matches[0])
+            return f"Opening {os.path.basename(matches[0])}."
+        names = ", ".join(f"{os.path.basename(p)} in {os.path.dirname(p)}" for p in matches)
+        return f"I found {names}."
+
+    def _list(self, query: str) -> str:
+        folder = self._folder(query)
+        entries, total = top_entries(str(folder), LIST_LIMIT)
+        more = f" and {total - len(entries)} more" if total > len(entries) else ""
+        _open(str(folder))
+        return f"Here are some files in {folder}: {', '.join(entries)}{more}"
+
+    def _folder(self, query: str) -> Path:
+        """For "in Downloads": an indexed folder of that name, else ~/Downloads, else cwd."""
+        name = query[3:].strip() if query.lower().startswith("in ") else query.strip()
+        if name:
+            if self.index is not None:
+                folders = self.index.directories(name)
+                if folders:
+                    return Path(folders[0])
+            home = Path.home() / name
+            if home.is_dir():
+                return home
+        return Path.cwd()
+
+
+def _open(path: str) -> None:
+    try:
+        if sys.platform.startswith("win"):
+            os.startfile(path)  # type: ignore
+        elif sys.platform == "darwin":
+            subprocess.run(["open", path], check=False)
+        else:
+            subprocess.run(["xdg-open", path], check=False)
+    except Exception:
+        pass
\ No newline at end of file
@@ -6,7 +6,7 @@ Project: Desktop Voice Assistant
 File: skill_jokes.py
 Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
 Created: 2025-10-20
-Updated: 2025-10-20
+Updated: 2026-10-18
 License: MIT License (see LICENSE file for details)
 ===================================================================
 
@@ -27,9 +27,7 @@ from .base import Skill
 
 class JokeSkill(Skill):
     name = "joke"
-
-    def can_handle(self, intent_name: str) -> bool:
-        return intent_name == "joke"
+    intents = ("joke",)
 
     def handle(self, ctx, intent_name: str, slots: dict):
         joke = pyjokes.get_joke(category="neutral")
@@ -6,7 +6,7 @@ Project: Desktop Voice Assistant
 File: skill_system.py
 Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
 Created: 2025-10-20
-Updated: 2025-10-20
+Updated: 2026-10-18
 License: MIT License (see LICENSE file for details)
 ===================================================================
 
@@ -29,13 +29,11 @@ from ..config import Config
 
 class SystemSkill(Skill):
     name = "system"
+    intents = ("system",)
 
     def __init__(self, cfg: Config):
         self.cfg = cfg
 
-    def can_handle(self, intent_name: str) -> bool:
-        return intent_name == "system"
-
     def handle(self, ctx, intent_name: str, slots: dict):
         if not self.cfg.allow_system_power:
             msg = "System power actions are disabled for safety."
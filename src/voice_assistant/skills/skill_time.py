@@ -6,7 +6,7 @@ Project: Desktop Voice Assistant
 File: skill_time.py
 Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
 Created: 2025-10-20
-Updated: 2025-10-20
+Updated: 2026-10-18
 License: MIT License (see LICENSE file for details)
 ===================================================================
 
@@ -27,9 +27,8 @@ from .base import Skill
 
 class TimeSkill(Skill):
     name = "time"
-
-    def can_handle(self, intent_name: str) -> bool:
-        return intent_name == "time"
+    intents = ("time",)
+    speculative = True
 
     def handle(self, ctx, intent_name: str, slots: dict):
         now = datetime.now().strftime("%H:%M")
@@ -6,7 +6,7 @@ Project: Desktop Voice Assistant
 File: skill_weather.py
 Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
 Created: 2025-10-20
-Updated: 2025-10-20
+Updated: 2026-10-18
 License: MIT License (see LICENSE file for details)
 ===================================================================
 
@@ -15,22 +15,34 @@ Fetches simple weather info using wttr.in JSON (no API key required).
 
 Usage:
 Say: "weather in Rome" or "what's the weather" (uses default city).
+Say: "weather in Rome and Paris" to look up several cities at once.
+
+Notes:
+- Answers are cached per city for cfg.weather_cache_ttl when a ResponseCache is given.
+- Requests go through the shared pooled HttpClient when one is given; several
+  cities are fetched concurrently.
+- "and" splits cities without a lookup, except in the few place names that contain
+  it. If a piece of "X and Y" can't be resolved, the whole phrase is tried once.
 
 ===================================================================
 """
 from __future__ import annotations
 
-import json
-from typing import Optional
+import re
+from typing import List, Optional, Tuple
 import requests
 
 from .base import Skill
+from .cache import ResponseCache
 from ..config import Config
+from ..http_client import HttpClient
 
 
-def _wttr(city: str) -> Optional[str]:
-    url = f"https://wttr.in/{city}?format=j1"
-    r = requests.get(url, timeout=6)
+def _wttr(
+    city: str, http: Optional[HttpClient] = None, base_url: str = "https://wttr.in"
+) -> Optional[str]:
+    url = f"{base_url.rstrip('/')}/{city}?format=j1"
+    r = http.get(url) if http is not None else requests.get(url, timeout=6)
     if r.status_code != 200:
         return None
     data = r.json()
@@ -41,22 +53,86 @@ def _wttr(city: str) -> Optional[str]:
     return f"Weather in {city}: {desc}, {temp_c}°C (feels {feels}°C)."
 
 
+# Places whose own name contains "and"; anything else is split without a lookup.
+_JOINED_PLACES = frozenset(
+    {
+        "antigua and barbuda",
+        "bosnia and herzegovina",
+        "saint kitts and nevis",
+        "saint vincent and the grenadines",
+        "sao tome and principe",
+        "trinidad and tobago",
+        "turks and caicos islands",
+        "wallis and futuna",
+    }
+)
+
+
+def _split_cities(city: str) -> List[Tuple[str, List[str]]]:
+    """("Paris and Oslo", ["Paris", "Oslo"]) per comma-separated phrase of ``city``."""
+    groups: List[Tuple[str, List[str]]] = []
+    for piece in (c.strip() for c in city.split(",")):
+        if not piece:
+            continue
+        parts = [c.strip() for c in re.split(r"\band\b", piece) if c.strip()]
+        if piece.lower() in _JOINED_PLACES or not parts:
+            parts = [piece]
+        groups.append((piece, parts))
+    return groups or [(city, [city])]
+
+
 class WeatherSkill(Skill):
     name = "weather"
+    intents = ("weather",)
+    speculative = True
 
-    def __init__(self, cfg: Config):
+    def __init__(
+        self, cfg: Config, cache: Optional[ResponseCache] = None, http: Optional[HttpClient] = None
+    ):
         self.cfg = cfg
-
-    def can_handle(self, intent_name: str) -> bool:
-        return intent_name == "weather"
+        self.cache = cache
+        self.http = http
 
     def handle(self, ctx, intent_name: str, slots: dict):
-        city = slots.get("city") or self.cfg.default_city
+        groups = _split_cities(slots.get("city") or self.cfg.default_city)
+        cities = [c for _, parts in groups for c in parts]
+        if len(cities) > 1 and self.http is not None:
+            found = iter(self.http.map(self._lookup, cities))
+        else:
+            found = iter([self._lookup(c) for c in cities])
+        answers = []
+        for phrase, parts in groups:
+            got = [next(found) for _ in parts]
+            if len(parts) > 1 and not all(got):
+                # "X and Y" may be one place we don't know of; ask for it whole once.
+                answers.append(self._answer(phrase))
+            else:
+                answers += [a or self._sorry(c) for a, c in zip(got, parts)]
+        msg = " ".join(answers)
+        ctx.speak(msg)
+        return msg
+
+    def _answer(self, city: str) -> str:
+        return self._lookup(city) or self._sorry(city)
+
+    def _lookup(self, city: str) -> Optional[str]:
+        if self.cache is None:
+            return self._fetch(city)
+        ttl = self.cfg.weather_cache_ttl
+        return self.cache.get_or_fetch(
+            "weather",
+            city.lower(),
+            lambda: self._fetch(city),
+            ttl,
+            ttl * self.cfg.cache_stale_factor,
+        )
+
+    @staticmethod
+    def _sorry(city: str) -> str:
+        return f"Sorry, I couldn't fetch the weather for {city}."
+
+    def _fetch(self, city: str) -> Optional[str]:
         try:
-            msg = _wttr(city)
+            return _wttr(city, self.http, self.cfg.weather_url)
         except Exception:
-            msg = None
-        if not msg:
-            msg = f"Sorry, I couldn't fetch the weather for {city}."
-        ctx.speak(msg)
-        return msg
\ No newline at end of file
+            return None
\ No newline at end of file
@@ -6,7 +6,7 @@ Project: Desktop Voice Assistant
 File: skill_web.py
 Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
 Created: 2025-10-20
-Updated: 2025-10-20
+Updated: 2026-10-18
 License: MIT License (see LICENSE file for details)
 ===================================================================
 
@@ -28,9 +28,7 @@ from .base import Skill
 
 class WebSkill(Skill):
     name = "web_search"
-
-    def can_handle(self, intent_name: str) -> bool:
-        return intent_name == "web_search"
+    intents = ("web_search",)
 
     def handle(self, ctx, intent_name: str, slots: dict):
         q = slots.get("query") or "google"
@@ -6,7 +6,7 @@ Project: Desktop Voice Assistant
 File: skill_wikipedia.py
 Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
 Created: 2025-10-20
-Updated: 2025-10-20
+Updated: 2026-10-18
 License: MIT License (see LICENSE file for details)
 ===================================================================
 
@@ -16,15 +16,31 @@ Answers general knowledge questions via Wikipedia; falls back to WolframAlpha wh
 Usage:
 "wikipedia Alan Turing" or "who is Ada Lovelace".
 
+Notes:
+- A local index built from an abstracts dump (wiki_index.py, "voice-assistant
+  wiki-import") is tried first; only a miss goes online, and with
+  cfg.wikipedia_offline not even then.
+- Answers are cached per query for cfg.wikipedia_cache_ttl when a ResponseCache is given.
+- With an HttpClient, the wikipedia library's requests go through the shared pool.
+- Hedged mode (cfg.wikipedia_hedge, needs Wolfram) queries both backends at once:
+  a good Wikipedia answer wins outright; a Wolfram answer is used if Wikipedia
+  misses or is still pending after cfg.wikipedia_prefer_ms. The loser is cancelled
+  if it has not started yet, otherwise its result is ignored.
+
 ===================================================================
 """
 from __future__ import annotations
 
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 import wikipedia
-from typing import Optional
+from typing import Dict, Optional
 
 from .base import Skill
+from .cache import ResponseCache
 from ..config import Config
+from ..http_client import HttpClient
+from ..wiki_index import WikiIndex
 
 try:
     import wolframalpha  # type: ignore
@@ -34,10 +50,28 @@ except Exception:  # pragma: no cover
 
 class WikipediaSkill(Skill):
     name = "wikipedia"
+    intents = ("wikipedia",)
+    speculative = True
 
-    def __init__(self, cfg: Config):
+    def __init__(
+        self,
+        cfg: Config,
+        cache: Optional[ResponseCache] = None,
+        http: Optional[HttpClient] = None,
+        index: Optional[WikiIndex] = None,
+    ):
         self.cfg = cfg
+        self.cache = cache
+        self.index = index
         wikipedia.set_lang("en")
+        if cfg.wikipedia_api_url:
+            wikipedia.wikipedia.API_URL = cfg.wikipedia_api_url
+        if http is not None:
+            # The library only ever calls requests.get(url, params=..., headers=...), so the
+            # pooled client can stand in for its module-level `requests` (process-wide, like
+            # set_lang above).
+            wikipedia.wikipedia.requests = http
+        self._pool: Optional[ThreadPoolExecutor] = None
         self._wolfram_client = None
         if self.cfg.wolfram_app_id and wolframalpha:
             try:
@@ -45,23 +79,75 @@ class WikipediaSkill(Skill):
             except Exception:
                 self._wolfram_client = None
 
-    def can_handle(self, intent_name: str) -> bool:
-        return intent_name == "wikipedia"
-
     def handle(self, ctx, intent_name: str, slots: dict):
         q = slots.get("query") or "Python (programming language)"
-        try:
-            summary = wikipedia.summary(q, sentences=2, auto_suggest=True, redirect=True)
-            msg = summary
-        except Exception:
-            msg = None
-        if not msg and self._wolfram_client:
-            try:
-                res = self._wolfram_client.query(q)
-                msg = next(res.results).text  # type: ignore
-            except Exception:
-                msg = None
+        msg = self._from_index(q)
+        if not msg and not self.cfg.wikipedia_offline:
+            msg = self._online(q)
         if not msg:
             msg = f"Sorry, I couldn't find an answer for '{q}'."
         ctx.speak(msg)
-        return msg
\ No newline at end of file
+        return msg
+
+    def _online(self, q: str) -> Optional[str]:
+        if self.cache is None:
+            return self._lookup(q)
+        ttl = self.cfg.wikipedia_cache_ttl
+        return self.cache.get_or_fetch(
+            "wikipedia", q.lower(), lambda: self._lookup(q), ttl, ttl * self.cfg.cache_stale_factor
+        )
+
+    def _lookup(self, q: str) -> Optional[str]:
+        if self.cfg.wikipedia_hedge and self._wolfram_client:
+            return self._lookup_hedged(q)
+        msg = self._from_wikipedia(q)
+        if not msg and self._wolfram_client:
+            msg = self._from_wolfram(q)
+        return msg
+
+    def _lookup_hedged(self, q: str) -> Optional[str]:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="wiki-hedge")
+        futures: Dict[Future, str] = {
+            self._pool.submit(self._from_wikipedia, q): "wikipedia",
+            self._pool.submit(self._from_wolfram, q): "wolfram",
+        }
+        window_end = time.monotonic() + self.cfg.wikipedia_prefer_ms / 1000.0
+        pending = set(futures)
+        fallback = None
+        while pending:
+            timeout = None if fallback is None else max(0.0, window_end - time.monotonic())
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:  # preference window over, Wikipedia still out
+                break
+            for fut in done:
+                ans = fut.result()
+                if ans and futures[fut] == "wikipedia":
+                    fallback = ans
+                    pending.clear()
+                    break
+                fallback = fallback or ans
+        for fut in futures:
+            fut.cancel()
+        return fallback
+
+    def _from_index(self, q: str) -> Optional[str]:
+        if self.index is None:
+            return None
+        try:
+            return self.index.summary(q, sentences=2)
+        except Exception:
+            return None
+
+    def _from_wikipedia(self, q: str) -> Optional[str]:
+        try:
+            return wikipedia.summary(q, sentences=2, auto_suggest=True, redirect=True) or None
+        except Exception:
+            return None
+
+    def _from_wolfram(self, q: str) -> Optional[str]:
+        try:
+            res = self._wolfram_client.query(q)
+            return next(res.results).text  # type: ignore
+        except Exception:
+            return None
\ No newline at end of file
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: smtp_client.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Persistent SMTP session and a background outbound mail queue for the email skill.
+
+Usage:
+mailer = MailQueue.from_config(cfg); fut = mailer.send(message); mailer.close()
+
+Notes:
+- SMTPConnection connects, runs STARTTLS and logs in once, then reuses the
+  session. It closes the session after idle_timeout seconds without use, and
+  reconnects and resends once if the server dropped it before DATA. A failure
+  after DATA is never resent: the server may already have queued the message.
+- MailQueue.send() only enqueues and returns a Future. A worker thread collects
+  up to batch_size messages (waiting at most batch_window s after the first) and
+  sends them over one session. Failures before DATA are retried with backoff;
+  anything else is set on the message's Future.
+- close() delivers everything still queued before returning (up to a timeout).
+
+===================================================================
+"""
+from __future__ import annotations
+
+import queue
+import smtplib
+import threading
+import time
+from concurrent.futures import Future
+from email.message import EmailMessage
+from typing import Callable, List, Optional, Tuple
+
+from .config import Config
+
+_FLUSH = object()
+
+
+def _connection_error(e: BaseException) -> bool:
+    """True if the session is unusable after ``e`` and a new one may succeed."""
+    if isinstance(e, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)):
+        return True
+    # Other SMTP errors (refused recipients, bad auth, ...) are OSErrors too, but the
+    # server answered them.
+    return isinstance(e, OSError) and not isinstance(e, smtplib.SMTPException)
+
+
+class SMTPConnection:
+    """One SMTP session, opened on first use and kept until idle or broken."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 587,
+        user: Optional[str] = None,
+        password: Optional[str] = None,
+        security: str = "starttls",
+        timeout: float = 10.0,
+        idle_timeout: float = 60.0,
+    ):
+        if security not in ("starttls", "ssl", "plain"):
+            raise ValueError(f"unknown SMTP security {security!r}")
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.security = security
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.connects = 0
+        self.reached_data = False  # whether the last send() got as far as DATA
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._last_used = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, cfg: Config) -> "SMTPConnection":
+        if cfg.smtp_plain:
+            security = "plain"
+        else:
+            security = "starttls" if cfg.smtp_use_tls else "ssl"
+        return cls(
+            cfg.smtp_host,
+            cfg.smtp_port,
+            cfg.smtp_user,
+            cfg.smtp_password,
+            security=security,
+            idle_timeout=cfg.smtp_idle_timeout,
+        )
+
+    @property
+    def connected(self) -> bool:
+        return self._smtp is not None
+
+    def _open(self) -> smtplib.SMTP:
+        if self.security == "ssl":
+            smtp: smtplib.SMTP = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout)
+        else:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.security == "starttls":
+                smtp.starttls()
+        try:
+            if self.user:
+                smtp.login(self.user, self.password or "")
+        except Exception:
+            smtp.close()
+            raise
+        putcmd = smtp.putcmd
+
+        def tracked(cmd: str, args: str = "") -> None:
+            if cmd.lower() == "data":
+                self.reached_data = True
+            putcmd(cmd, args)
+
+        smtp.putcmd = tracked  # type: ignore[method-assign]
+        self.connects += 1
+        return smtp
+
+    def _session(self) -> smtplib.SMTP:
+        if self._smtp is not None and time.monotonic() - self._last_used > self.idle_timeout:
+            self._drop()
+        if self._smtp is None:
+            self._smtp = self._open()
+        return self._smtp
+
+    def send(self, msg: EmailMessage) -> None:
+        """Send over the current session.
+
+        If a reused session turns out to have been dropped before DATA, reconnect and
+        resend once. Any other failure is raised; see ``reached_data``.
+        """
+        with self._lock:
+            reused = self._smtp is not None
+            try:
+                self._attempt(msg)
+            except smtplib.SMTPServerDisconnected:
+                if not reused or self.reached_data:
+                    raise
+                self._attempt(msg)
+            self._last_used = time.monotonic()
+
+    def _attempt(self, msg: EmailMessage) -> None:
+        self.reached_data = False
+        try:
+            self._session().send_message(msg)
+        except Exception as e:
+            if _connection_error(e):
+                self._drop()
+            raise
+
+    def close_if_idle(self) -> bool:
+        with self._lock:
+            if self._smtp is None or time.monotonic() - self._last_used < self.idle_timeout:
+                return False
+            self._drop()
+            return True
+
+    def close(self) -> None:
+        with self._lock:
+            self._drop()
+
+    def _drop(self) -> None:
+        smtp, self._smtp = self._smtp, None
+        if smtp is None:
+            return
+        try:
+            smtp.quit()
+        except Exception:
+            smtp.close()
+
+
+class MailQueue:
+    """Background outbound queue that sends messages in batches over one SMTPConnection."""
+
+    def __init__(
+        self,
+        connection: SMTPConnection,
+        batch_size: int = 20,
+        batch_window: float = 0.05,
+        max_queued: int = 1000,
+        retries: int = 2,
+        backoff: float = 0.5,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.connection = connection
+        self.batch_size = max(1, batch_size)
+        self.batch_window = batch_window
+        self.retries = retries
+        self.backoff = backoff
+        self.batches = 0
+        self._sleep = sleep
+        self._queue: "queue.Queue[object]" = queue.Queue(maxsize=max_queued)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="smtp-queue", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def from_config(cls, cfg: Config) -> "MailQueue":
+        return cls(SMTPConnection.from_config(cfg), batch_size=cfg.smtp_batch_size)
+
+    def send(self, msg: EmailMessage) -> "Future[None]":
+        """Enqueue ``msg``; the Future resolves once the server has accepted it."""
+        fut: "Future[None]" = Future()
+        if self._closed:
+            fut.set_exception(RuntimeError("mail queue is closed"))
+            return fut
+        try:
+            self._queue.put_nowait((msg, fut))
+        except queue.Full:
+            fut.set_exception(RuntimeError("outbound mail queue is full"))
+        return fut
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything queued so far has been sent or has failed."""
+        if self._closed:  # close() has drained the queue, or given up on it
+            return not self._thread.is_alive()
+        done = threading.Event()
+        self._queue.put((_FLUSH, done))
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self.connection.close()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                item = self._queue.get(timeout=self.connection.idle_timeout)
+            except queue.Empty:
+                self.connection.close_if_idle()
+                continue
+            if item is None:
+                return
+            batch: List[Tuple[EmailMessage, Future]] = []
+            deadline = time.monotonic() + self.batch_window
+            while True:
+                msg, waiter = item
+                if msg is _FLUSH:
+                    self._send_batch(batch)
+                    batch = []
+                    waiter.set()
+                else:
+                    batch.append((msg, waiter))
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._send_batch(batch)
+                    return
+            self._send_batch(batch)
+
+    def _send_batch(self, batch: List[Tuple[EmailMessage, Future]]) -> None:
+        if not batch:
+            return
+        self.batches += 1
+        for msg, fut in batch:
+            if not fut.set_running_or_notify_cancel():
+                continue
+            for attempt in range(self.retries + 1):
+                try:
+                    self.connection.send(msg)
+                except Exception as e:
+                    retry = _connection_error(e) and not self.connection.reached_data
+                    if attempt == self.retries or not retry:
+                        fut.set_exception(e)
+                        break
+                    self._sleep(self.backoff * 2**attempt)
+                else:
+                    fut.set_result(None)
+                    break
\ No newline at end of file
@@ -6,7 +6,7 @@ Project: Desktop Voice Assistant
 File: stt.py
 Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
 Created: 2025-10-20
-Updated: 2025-10-20
+Updated: 2026-10-18
 License: MIT License (see LICENSE file for details)
 ===================================================================
 
@@ -15,23 +15,227 @@ Speech-to-text using SpeechRecognition; falls back to keyboard input when needed
 
 Usage:
 from voice_assistant.stt import recognize_once; text = recognize_once()
+from voice_assistant.stt import CaptureSession; s = CaptureSession().start(); s.listen()
+
+Notes:
+- CaptureSession keeps one Recognizer and one open microphone stream. Ambient noise
+  is calibrated once at start and again after quiet spells every calibrate_every s.
+- A background thread segments phrases continuously into a bounded queue of audio;
+  recognition happens when a consumer takes a phrase, so stale audio never leaves
+  the machine.
+- Recognition goes through a pluggable STTBackend (Google by default); an optional
+  VoiceActivityDetector trims or drops each phrase before the backend sees it.
+- With streaming=True, each phrase is queued as a live Hypothesis iterator fed
+  chunk by chunk while the user is still talking (next_stream). The VAD stage is
+  skipped in this mode; the backend sees audio as it arrives. SpeechRecognition
+  releases whose listen() has no ``stream`` argument fall back to whole phrases.
 
 ===================================================================
 """
 from __future__ import annotations
 
+import inspect
+import queue
+import threading
+import time
+from typing import Iterable, Iterator, Optional, Union
+
 import speech_recognition as sr
 
+from .metrics import METRICS
+from .stt_backends import GoogleBackend, Hypothesis, STTBackend, pcm16
+from .vad import VoiceActivityDetector
+
 
-def recognize_once(timeout: int = 6, phrase_time_limit: int = 6, language: str = "en-US") -> str:
+def recognize_once(
+    timeout: int = 6,
+    phrase_time_limit: int = 6,
+    language: str = "en-US",
+    backend: Optional[STTBackend] = None,
+    vad: Optional[VoiceActivityDetector] = None,
+) -> str:
     r = sr.Recognizer()
     with sr.Microphone() as source:
         r.pause_threshold = 0.8
         r.energy_threshold = 300
         audio = r.listen(source, timeout=timeout, phrase_time_limit=phrase_time_limit)
-    try:
-        return r.recognize_google(audio, language=language)
-    except sr.UnknownValueError:
+    if vad is not None:
+        with METRICS.span("vad"):
+            audio = vad.apply(audio)
+        if audio is None:
+            return ""
+    with METRICS.span("stt"):
+        return (backend or GoogleBackend()).transcribe(audio, language)
+
+
+class CaptureSession:
+    def __init__(
+        self,
+        language: str = "en-US",
+        phrase_time_limit: Optional[float] = 6,
+        calibrate_every: float = 300.0,
+        calibration_duration: float = 0.5,
+        max_pending: int = 8,
+        backend: Optional[STTBackend] = None,
+        vad: Optional[VoiceActivityDetector] = None,
+        streaming: bool = False,
+    ):
+        self.language = language
+        self.backend = backend or GoogleBackend()
+        self.vad = vad
+        self.phrase_time_limit = phrase_time_limit
+        self.calibrate_every = calibrate_every
+        self.calibration_duration = calibration_duration
+        self.recognizer = sr.Recognizer()
+        self.recognizer.pause_threshold = 0.8
+        self.recognizer.dynamic_energy_threshold = True
+        self.streaming = streaming and _listen_streams(self.recognizer)
+        self._segments: "queue.Queue[Union[sr.AudioData, Iterator[Hypothesis]]]" = queue.Queue(
+            maxsize=max_pending
+        )
+        self._running = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._source: Optional[sr.Microphone] = None
+        self._last_calibration = 0.0
+
+    def start(self) -> "CaptureSession":
+        if self._thread is not None:
+            return self
+        self._source = sr.Microphone()
+        self._source.__enter__()
+        self._calibrate()
+        self._running.set()
+        self._thread = threading.Thread(target=self._capture, name="stt-capture", daemon=True)
+        self._thread.start()
+        return self
+
+    def _calibrate(self) -> None:
+        self.recognizer.adjust_for_ambient_noise(self._source, duration=self.calibration_duration)
+        self._last_calibration = time.monotonic()
+
+    def _capture(self) -> None:
+        while self._running.is_set():
+            try:
+                if self.streaming:
+                    self._capture_stream()
+                    continue
+                # A short timeout keeps the loop responsive to stop() during silence.
+                audio = self.recognizer.listen(
+                    self._source, timeout=1, phrase_time_limit=self.phrase_time_limit
+                )
+            except sr.WaitTimeoutError:
+                if time.monotonic() - self._last_calibration > self.calibrate_every:
+                    self._calibrate()
+                continue
+            except Exception:
+                if not self._running.is_set():
+                    break
+                time.sleep(0.1)
+                continue
+            if self.vad is not None:
+                with METRICS.span("vad"):
+                    audio = self.vad.apply(audio)
+                if audio is None:  # noise only
+                    continue
+            self._offer(audio)
+
+    def _capture_stream(self) -> None:
+        chunks = self.recognizer.listen(
+            self._source, timeout=1, phrase_time_limit=self.phrase_time_limit, stream=True
+        )
+        first = next(chunks)  # raises WaitTimeoutError while it is quiet
+        pcm: "queue.Queue[Optional[bytes]]" = queue.Queue()
+        self._offer(self.backend.stream(_until_none(pcm), self.language))
+        try:
+            pcm.put(pcm16(first))
+            for chunk in chunks:
+                pcm.put(pcm16(chunk))
+        finally:
+            pcm.put(None)
+
+    def _offer(self, audio: Union[sr.AudioData, Iterator[Hypothesis]]) -> None:
+        while True:
+            try:
+                self._segments.put_nowait(audio)
+                return
+            except queue.Full:  # drop the oldest phrase rather than block capture
+                try:
+                    self._segments.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def clear(self) -> None:
+        while True:
+            try:
+                self._segments.get_nowait()
+            except queue.Empty:
+                return
+
+    def next_phrase(self, timeout: Optional[float] = None) -> str:
+        """Recognize the next captured phrase; "" on timeout or if nothing was understood."""
+        try:
+            item = self._segments.get(timeout=timeout)
+        except queue.Empty:
+            return ""
+        if isinstance(item, sr.AudioData):
+            with METRICS.span("stt"):
+                return self.backend.transcribe(item, self.language)
+        for text, final in item:
+            if final:
+                return text
         return ""
-    except sr.RequestError:
-        return ""
\ No newline at end of file
+
+    def next_stream(self, timeout: Optional[float] = None) -> Optional[Iterable[Hypothesis]]:
+        """Hypotheses for the next phrase, arriving while it is spoken; None on timeout."""
+        try:
+            item = self._segments.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        if isinstance(item, sr.AudioData):
+            return [Hypothesis(self.backend.transcribe(item, self.language), True)]
+        return item
+
+    def listen(self, timeout: Optional[float] = None) -> str:
+        """Push-to-talk on top of the live stream: ignore earlier speech, wait for new.
+
+        Like recognize_once, ``timeout`` bounds the wait for speech to start; the phrase
+        itself may then run for up to phrase_time_limit seconds.
+        """
+        self.clear()
+        if timeout is not None and self.phrase_time_limit:
+            timeout += self.phrase_time_limit
+        return self.next_phrase(timeout=timeout)
+
+    def phrases(self) -> Iterator[str]:
+        while self._running.is_set():
+            text = self.next_phrase(timeout=0.5)
+            if text:
+                yield text
+
+    def stop(self) -> None:
+        self._running.clear()
+        if self._thread is not None:
+            self._thread.join(timeout=3)
+            self._thread = None
+        if self._source is not None:
+            try:
+                self._source.__exit__(None, None, None)
+            except Exception:
+                pass
+            self._source = None
+
+
+def _listen_streams(recognizer: sr.Recognizer) -> bool:
+    """True if ``recognizer.listen`` takes ``stream=True`` (newer SpeechRecognition only)."""
+    try:
+        return "stream" in inspect.signature(recognizer.listen).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def _until_none(q: "queue.Queue[Optional[bytes]]") -> Iterator[bytes]:
+    while True:
+        item = q.get()
+        if item is None:
+            return
+        yield item
\ No newline at end of file
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: stt_backends.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Pluggable speech-to-text backends selected by Config.stt_backend.
+
+Usage:
+from voice_assistant.stt_backends import make_backend; text = make_backend(cfg).transcribe(audio)
+
+Notes:
+- "google": Google Web Speech API via SpeechRecognition (network, the default).
+- "vosk" / "whisper": offline engines, used when vosk / pywhispercpp are installed;
+  VA_STT_MODEL points at the model directory (vosk) or model name/path (whisper).
+- "wav": deterministic test backend. Every <clip>.wav under VA_STT_WAV_DIR with a
+  <clip>.txt sidecar is indexed by its PCM content; transcribing that audio returns
+  the sidecar text, so pipelines can be replayed and benchmarked without a model.
+- stream() turns 16 kHz PCM chunks into interim hypotheses (one per chunk once
+  something has been heard, repeated while unchanged) plus one final result.
+  Vosk reports real partials. The wav backend reveals the sidecar words in step
+  with the voiced part of the clip. Other backends yield only the final text.
+
+===================================================================
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+import speech_recognition as sr
+
+from .config import Config
+
+try:
+    import vosk  # type: ignore
+except Exception:  # pragma: no cover
+    vosk = None
+
+try:
+    from pywhispercpp.model import Model as WhisperModel  # type: ignore
+except Exception:  # pragma: no cover
+    WhisperModel = None
+
+SAMPLE_RATE = 16000
+STREAM_CHUNK = 3200  # bytes: 100 ms of 16 kHz 16-bit mono
+
+
+class Hypothesis(NamedTuple):
+    text: str
+    final: bool
+
+
+def load_wav(path: str) -> sr.AudioData:
+    with sr.AudioFile(str(path)) as source:
+        return sr.Recognizer().record(source)
+
+
+def audio_seconds(audio: sr.AudioData) -> float:
+    return len(audio.frame_data) / float(audio.sample_rate * audio.sample_width)
+
+
+def pcm16(audio: sr.AudioData) -> bytes:
+    """Mono 16 kHz 16-bit PCM, the format every offline engine here expects."""
+    return audio.get_raw_data(convert_rate=SAMPLE_RATE, convert_width=2)
+
+
+def pcm_chunks(pcm: bytes, size: int = STREAM_CHUNK) -> Iterator[bytes]:
+    for i in range(0, len(pcm), size):
+        yield pcm[i : i + size]
+
+
+class STTBackend:
+    name: str = "base"
+    streaming: bool = False  # True if stream() yields interim hypotheses
+
+    def transcribe(self, audio: sr.AudioData, language: str = "en-US") -> str:
+        raise NotImplementedError
+
+    def stream(self, chunks: Iterable[bytes], language: str = "en-US") -> Iterator[Hypothesis]:
+        """Consume 16 kHz 16-bit PCM chunks; the last hypothesis is the final one."""
+        audio = sr.AudioData(b"".join(chunks), SAMPLE_RATE, 2)
+        yield Hypothesis(self.transcribe(audio, language), True)
+
+    def transcribe_file(self, path: str, language: str = "en-US") -> str:
+        return self.transcribe(load_wav(path), language)
+
+
+class GoogleBackend(STTBackend):
+    name = "google"
+
+    def __init__(self):
+        self.recognizer = sr.Recognizer()
+
+    def transcribe(self, audio: sr.AudioData, language: str = "en-US") -> str:
+        try:
+            return self.recognizer.recognize_google(audio, language=language)
+        except sr.UnknownValueError:
+            return ""
+        except sr.RequestError:
+            return ""
+
+
+class VoskBackend(STTBackend):
+    name = "vosk"
+    streaming = True
+
+    def __init__(self, model_path: Optional[str] = None):
+        if vosk is None:
+            raise RuntimeError("The vosk backend needs the 'vosk' package (pip install vosk).")
+        vosk.SetLogLevel(-1)
+        self.model = vosk.Model(model_path) if model_path else vosk.Model(lang="en-us")
+
+    def transcribe(self, audio: sr.AudioData, language: str = "en-US") -> str:
+        rec = vosk.KaldiRecognizer(self.model, SAMPLE_RATE)
+        rec.AcceptWaveform(pcm16(audio))
+        return json.loads(rec.FinalResult()).get("text", "")
+
+    def stream(self, chunks: Iterable[bytes], language: str = "en-US") -> Iterator[Hypothesis]:
+        rec = vosk.KaldiRecognizer(self.model, SAMPLE_RATE)
+        done: List[str] = []  # segments vosk has already closed on short pauses
+        for chunk in chunks:
+            if rec.AcceptWaveform(chunk):
+                done.append(json.loads(rec.Result()).get("text", ""))
+                partial = ""
+            else:
+                partial = json.loads(rec.PartialResult()).get("partial", "")
+            text = " ".join(t for t in done + [partial] if t)
+            if text:
+                yield Hypothesis(text, False)
+        done.append(json.loads(rec.FinalResult()).get("text", ""))
+        yield Hypothesis(" ".join(t for t in done if t), True)
+
+
+class WhisperCppBackend(STTBackend):
+    name = "whisper"
+
+    def __init__(self, model_path: Optional[str] = None):
+        if WhisperModel is None:
+            raise RuntimeError(
+                "The whisper backend needs whisper.cpp bindings (pip install pywhispercpp)."
+            )
+        self.model = WhisperModel(model_path or "base.en", print_progress=False)
+
+    def transcribe(self, audio: sr.AudioData, language: str = "en-US") -> str:
+        import numpy as np
+
+        samples = np.frombuffer(pcm16(audio), dtype=np.int16).astype(np.float32) / 32768.0
+        segments = self.model.transcribe(samples, language=language.split("-")[0])
+        return " ".join(seg.text.strip() for seg in segments).strip()
+
+
+class WavFileBackend(STTBackend):
+    name = "wav"
+    streaming = True
+    SILENCE = 500  # |sample| at or below this counts as silence for partials
+
+    def __init__(self, root: Optional[str] = None):
+        self.transcripts: Dict[str, str] = {}
+        self.partials: Dict[str, str] = {}  # sha1 of each STREAM_CHUNK-aligned prefix
+        if root:
+            self.index(root)
+
+    @staticmethod
+    def _key(audio: sr.AudioData) -> str:
+        return hashlib.sha1(pcm16(audio)).hexdigest()
+
+    def index(self, root: str) -> int:
+        for wav in sorted(Path(root).rglob("*.wav")):
+            txt = wav.with_suffix(".txt")
+            if txt.exists():
+                self.add(load_wav(str(wav)), txt.read_text(encoding="utf-8").strip())
+        return len(self.transcripts)
+
+    def add(self, audio: sr.AudioData, text: str) -> None:
+        import numpy as np
+
+        pcm = pcm16(audio)
+        self.transcripts[hashlib.sha1(pcm).hexdigest()] = text
+        # Words appear in proportion to how much of the voiced span has been heard.
+        samples = np.abs(np.frombuffer(pcm, dtype=np.int16).astype(np.int32))
+        voiced = np.flatnonzero(samples > self.SILENCE)
+        if not len(voiced):
+            return
+        start, end = 2 * int(voiced[0]), 2 * (int(voiced[-1]) + 1)
+        words = text.split()
+        h = hashlib.sha1()
+        for pos in range(STREAM_CHUNK, len(pcm) + 1, STREAM_CHUNK):
+            h.update(pcm[pos - STREAM_CHUNK : pos])
+            heard = min(max((pos - start) / (end - start), 0.0), 1.0)
+            n = math.ceil(heard * len(words))
+            if n:
+                self.partials[h.hexdigest()] = " ".join(words[:n])
+
+    def transcribe(self, audio: sr.AudioData, language: str = "en-US") -> str:
+        return self.transcripts.get(self._key(audio), "")
+
+    def stream(self, chunks: Iterable[bytes], language: str = "en-US") -> Iterator[Hypothesis]:
+        h = hashlib.sha1()
+        pending = b""
+        for chunk in chunks:
+            pending += chunk
+            while len(pending) >= STREAM_CHUNK:
+                h.update(pending[:STREAM_CHUNK])
+                pending = pending[STREAM_CHUNK:]
+                text = self.partials.get(h.hexdigest(), "")
+                if text:
+                    yield Hypothesis(text, False)
+        h.update(pending)
+        yield Hypothesis(self.transcripts.get(h.hexdigest(), ""), True)
+
+
+BACKENDS: Dict[str, Callable[[Config], STTBackend]] = {
+    "google": lambda cfg: GoogleBackend(),
+    "vosk": lambda cfg: VoskBackend(cfg.stt_model_path),
+    "whisper": lambda cfg: WhisperCppBackend(cfg.stt_model_path),
+    "wav": lambda cfg: WavFileBackend(cfg.stt_wav_dir),
+}
+
+
+def make_backend(cfg: Config, name: Optional[str] = None) -> STTBackend:
+    name = (name or cfg.stt_backend).lower()
+    try:
+        factory = BACKENDS[name]
+    except KeyError:
+        choices = ", ".join(BACKENDS)
+        raise ValueError(f"Unknown STT backend {name!r}; choose from {choices}") from None
+    return factory(cfg)
\ No newline at end of file
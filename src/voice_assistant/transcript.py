@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: transcript.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Bounded transcript model backing the GUI log pane.
+
+Usage:
+from voice_assistant.transcript import Transcript; t = Transcript(max_lines=5000)
+
+Notes:
+- The newest max_lines lines are kept in memory; once that overflows, the oldest
+  lines are dropped in whole trim_chunk blocks so the widget is trimmed in chunks.
+- Dropped lines are appended to an on-disk log; a sparse offset index (one entry
+  per CHECKPOINT lines) lets history be paged back in without keeping it in memory.
+
+===================================================================
+"""
+from __future__ import annotations
+
+import os
+import tempfile
+from array import array
+from typing import Iterable, List, Optional
+
+CHECKPOINT = 1024
+
+
+class Transcript:
+    def __init__(
+        self, max_lines: int = 5000, trim_chunk: int = 500, spill_path: Optional[str] = None
+    ):
+        self.max_lines = max_lines
+        self.trim_chunk = max(1, min(trim_chunk, max_lines))
+        self.lines: List[str] = []
+        self._temp = spill_path is None
+        if spill_path is None:
+            fd, spill_path = tempfile.mkstemp(prefix="va-transcript-", suffix=".log")
+            os.close(fd)
+        self.spill_path = spill_path
+        # Append-only; offsets come from tell(), so older sessions' history is skipped.
+        self._spill = open(spill_path, "ab")
+        self._checkpoints = array("q")
+        self.spilled = 0
+
+    def extend(self, lines: Iterable[str]) -> int:
+        """Append lines; returns how many of the oldest lines were trimmed."""
+        self.lines.extend(lines)
+        if len(self.lines) <= self.max_lines:
+            return 0
+        n = len(self.lines) - self.max_lines
+        n += (-n) % self.trim_chunk  # round up to whole chunks
+        n = min(n, len(self.lines))
+        dropped = self.lines[:n]
+        del self.lines[:n]
+        self._write_spill(dropped)
+        return n
+
+    def append(self, line: str) -> int:
+        return self.extend((line,))
+
+    def _write_spill(self, dropped: List[str]) -> None:
+        f = self._spill
+        i = 0
+        while i < len(dropped):
+            # Encode one checkpoint-aligned segment at a time to record its offset.
+            if self.spilled % CHECKPOINT == 0:
+                self._checkpoints.append(f.tell())
+            j = min(len(dropped), i + CHECKPOINT - self.spilled % CHECKPOINT)
+            f.write(("\n".join(dropped[i:j]) + "\n").encode("utf-8", "replace"))
+            self.spilled += j - i
+            i = j
+        f.flush()
+
+    def history(self, skip: int, count: int) -> List[str]:
+        """Return up to ``count`` spilled lines older than the newest ``skip`` spilled ones."""
+        end = max(0, self.spilled - skip)
+        start = max(0, end - count)
+        if start >= end:
+            return []
+        out = []
+        with open(self.spill_path, "rb") as f:
+            f.seek(self._checkpoints[start // CHECKPOINT])
+            for i in range(start - start % CHECKPOINT, end):
+                raw = f.readline()
+                if i >= start:
+                    out.append(raw.rstrip(b"\n").decode("utf-8", "replace"))
+        return out
+
+    def close(self) -> None:
+        self._spill.close()
+        if self._temp:
+            try:
+                os.unlink(self.spill_path)
+            except OSError:
+                pass
\ No newline at end of file
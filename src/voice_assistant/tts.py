@@ -6,7 +6,7 @@ Project: Desktop Voice Assistant
 File: tts.py
 Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
 Created: 2025-10-20
-Updated: 2025-10-20
+Updated: 2026-10-18
 License: MIT License (see LICENSE file for details)
 ===================================================================
 
@@ -16,17 +16,179 @@ Thin wrapper around pyttsx3 for text-to-speech.
 Usage:
 from voice_assistant.tts import TTS; TTS().say("Hello")
 
+Notes:
+- A dedicated worker thread owns the pyttsx3 engine and drains a bounded queue, so
+  say() returns a SpeechHandle immediately instead of blocking on runAndWait().
+- stop() is barge-in: it drops every queued utterance and interrupts the current one.
+  The worker stops its own engine, from pyttsx3's started-word callback.
+- say() never blocks: when the queue is full the new utterance is dropped (its
+  handle comes back done and cancelled).
+- With an AudioCache, a short phrase heard a second time is rendered once to WAV
+  (save_to_file) and then played straight from the cached buffer. A first use is
+  spoken directly: rendering it before playing would only delay it.
+- wait_ready=False lets the engine start in the background; if start-up fails,
+  `available` turns False and queued utterances complete without sound.
+- Long text, or an iterator of text fragments, is spoken sentence by sentence: the
+  first sentence starts playing while the next one is rendered (when a WavPlayer is
+  available), instead of after the whole answer has been synthesized. Barge-in drops
+  the sentences not yet played. stream=False speaks every utterance as one block.
+
 ===================================================================
 """
 from __future__ import annotations
 
+import os
+import queue
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Union
+
 import pyttsx3
-from typing import Optional
+
+from .audio import AudioCache, WavPlayer
+from .metrics import METRICS
+
+SEEN_MAX = 4096  # phrases remembered while waiting for a second use
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_CLAUSE_END = re.compile(r"[,;:]\s+")
+_SPACE = re.compile(r"\s+")
+
+
+def _cut(text: str, max_chars: int) -> int:
+    """Where to break ``text`` before ``max_chars``: after a comma, else after a space."""
+    for pattern in (_CLAUSE_END, _SPACE):
+        cuts = [m.end() for m in pattern.finditer(text, max_chars // 3, max_chars + 1)]
+        if cuts:
+            return cuts[-1]
+    return max_chars
+
+
+def _wrap(sentence: str, max_chars: int) -> Iterator[str]:
+    sentence = sentence.strip()
+    while len(sentence) > max_chars:
+        cut = _cut(sentence, max_chars)
+        yield sentence[:cut].strip()
+        sentence = sentence[cut:].strip()
+    if sentence:
+        yield sentence
+
+
+def iter_sentences(parts: Iterable[str], max_chars: int = 200) -> Iterator[str]:
+    """Sentences from a stream of text fragments, each yielded as soon as it ends."""
+    buf = ""
+    for part in parts:
+        buf += part
+        *done, buf = _SENTENCE_END.split(buf)
+        for sentence in done:
+            yield from _wrap(sentence, max_chars)
+        while len(buf.strip()) > max_chars:  # no sentence end in sight: speak what we have
+            buf = buf.lstrip()
+            cut = _cut(buf, max_chars)
+            yield buf[:cut].strip()
+            buf = buf[cut:]
+    yield from _wrap(buf, max_chars)
+
+
+def split_sentences(text: str, max_chars: int = 200) -> List[str]:
+    return list(iter_sentences([text], max_chars))
+
+
+def _collect(handle: "SpeechHandle", chunks: Iterator[str]) -> Iterator[str]:
+    # A streamed utterance's text is only known as it is spoken.
+    for chunk in chunks:
+        handle.text += (" " if handle.text else "") + chunk
+        yield chunk
+
+
+class SpeechHandle:
+    """Tracks one queued utterance; wait() blocks until spoken, cancel() drops it."""
+
+    def __init__(
+        self, text: str, tts: "TTS", chunks: Optional[Iterator[str]] = None, whole: bool = False
+    ):
+        self.text = text
+        self._tts = tts
+        self._chunks = chunks
+        self._whole = whole  # speak the chunks joined, as one block
+        self.queued_at = time.perf_counter()
+        self.first_audio_at: Optional[float] = None
+        self._done = threading.Event()
+        self.cancelled = False
+
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    def cancel(self) -> None:
+        if self._done.is_set():
+            return
+        self.cancelled = True
+        self._tts._interrupt(self)
+
+    def _started(self) -> None:
+        if self.first_audio_at is None:
+            self.first_audio_at = time.perf_counter()
+            METRICS.record("tts.first_audio", self.first_audio_at - self.queued_at)
+
+    def _finish(self) -> None:
+        self._done.set()
 
 
 class TTS:
-    def __init__(self, rate: int = 180, volume: float = 1.0, voice_contains: Optional[str] = None):
-        self.engine = pyttsx3.init()
+    def __init__(
+        self,
+        rate: int = 180,
+        volume: float = 1.0,
+        voice_contains: Optional[str] = None,
+        max_queue: int = 32,
+        engine_factory: Callable[[], Any] = pyttsx3.init,
+        cache: Optional[AudioCache] = None,
+        cache_max_chars: int = 200,
+        player: Optional[WavPlayer] = None,
+        wait_ready: bool = True,
+        stream: bool = True,
+    ):
+        self.rate = rate
+        self.volume = volume
+        self.cache = cache
+        self.cache_max_chars = cache_max_chars
+        self.stream = stream
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        if player is not None:
+            self.player = player
+        else:
+            self.player = WavPlayer() if cache is not None else None
+        self._interrupted = threading.Event()
+        self._queue: "queue.Queue[Optional[SpeechHandle]]" = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._current: Optional[SpeechHandle] = None
+        self._ready = threading.Event()
+        self._init_error: Optional[BaseException] = None
+        self.engine = None
+        self._worker = threading.Thread(
+            target=self._run,
+            args=(engine_factory, rate, volume, voice_contains),
+            name="tts-worker",
+            daemon=True,
+        )
+        self._worker.start()
+        if wait_ready:
+            self._ready.wait()
+            if self._init_error is not None:
+                raise self._init_error
+
+    @property
+    def available(self) -> bool:
+        """False once engine start-up has failed; queued text is then dropped."""
+        return self._init_error is None
+
+    def _setup(self, engine_factory, rate, volume, voice_contains) -> None:
+        self.engine = engine_factory()
         self.engine.setProperty("rate", rate)
         self.engine.setProperty("volume", volume)
         if voice_contains:
@@ -35,11 +197,199 @@ class TTS:
                 if voice_contains.lower() in name:
                     self.engine.setProperty("voice", v.id)
                     break
+        connect = getattr(self.engine, "connect", None)
+        if connect is not None:
+            connect("started-word", self._on_word)
+
+    def _on_word(self, name: Any, location: int, length: int) -> None:
+        # Runs on the worker inside runAndWait(): the only safe place to stop the engine.
+        if self._interrupted.is_set():
+            self.engine.stop()
 
-    def say(self, text: str, wait: bool = True) -> None:
+    def _run(self, *setup_args) -> None:
+        # The engine is created and driven on this thread only (pyttsx3 drivers are
+        # not thread-safe); other threads talk to it through the queue.
+        try:
+            self._setup(*setup_args)
+        except BaseException as e:  # surfaced by __init__ unless wait_ready=False
+            self._init_error = e
+        self._ready.set()
+        while True:
+            handle = self._queue.get()
+            if handle is None:
+                break
+            with self._lock:
+                if handle.cancelled or self._init_error is not None:
+                    handle._finish()
+                    continue
+                self._current = handle
+                self._interrupted.clear()
+            METRICS.record("tts.queue", time.perf_counter() - handle.queued_at)
+            try:
+                with METRICS.span("tts.speak"):
+                    if handle._chunks is None:
+                        self._speak(handle, handle.text)
+                    elif handle._whole:  # joined here: the iterator may still be producing
+                        handle.text = "".join(handle._chunks)
+                        self._speak(handle, handle.text)
+                    else:
+                        self._speak_chunks(handle)
+            except Exception:
+                pass
+            finally:
+                with self._lock:
+                    self._current = None
+                handle._finish()
+
+    def _speak(self, handle: SpeechHandle, text: str) -> None:
+        if self._cacheable(text):
+            data = self._audio(text, store=True, render=self._seen_before(text))
+            if data:
+                if not self._interrupted.is_set():
+                    handle._started()
+                    self.player.play(data)
+                return
+        handle._started()
         self.engine.say(text)
-        if wait:
+        self.engine.runAndWait()
+
+    def _speak_chunks(self, handle: SpeechHandle) -> None:
+        if self.player is None or not self.player.available:
+            for chunk in handle._chunks:
+                if self._interrupted.is_set():
+                    return
+                self._speak(handle, chunk)
+            return
+        # Render sentence n+1 here while a playback thread plays sentence n.
+        rendered: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=1)
+        playback = threading.Thread(
+            target=self._play_rendered, args=(handle, rendered), name="tts-play", daemon=True
+        )
+        playback.start()
+        try:
+            for chunk in handle._chunks:
+                if self._interrupted.is_set():
+                    break
+                # Sentences of a long answer are one-offs: read the cache, don't fill it.
+                data = self._audio(chunk, store=False)
+                if data:
+                    rendered.put(data)
+                else:  # render failed: let playback catch up, then speak directly
+                    rendered.join()
+                    self._speak(handle, chunk)
+        finally:
+            rendered.put(None)
+            playback.join()
+
+    def _play_rendered(self, handle: SpeechHandle, rendered: "queue.Queue[Optional[bytes]]"):
+        while True:
+            data = rendered.get()
+            try:
+                if data is None:
+                    return
+                if not self._interrupted.is_set():  # after barge-in, just drain
+                    handle._started()
+                    self.player.play(data)
+            finally:
+                rendered.task_done()
+
+    def _seen_before(self, text: str) -> bool:
+        """Note a use of ``text``; True from its second use on."""
+        if text in self._seen:
+            self._seen.move_to_end(text)
+            return True
+        self._seen[text] = None
+        if len(self._seen) > SEEN_MAX:
+            self._seen.popitem(last=False)
+        return False
+
+    def _audio(self, text: str, store: bool, render: bool = True) -> Optional[bytes]:
+        """WAV bytes for ``text`` from the cache, rendering them on a miss if ``render``."""
+        key = None
+        if self.cache is not None:
+            key = AudioCache.key(text, self.engine.getProperty("voice"), self.rate, self.volume)
+            data = self.cache.get(key)
+            if data is not None:
+                return data
+        if not render:
+            return None
+        t0 = time.perf_counter()
+        data = self._render(text)
+        synth = time.perf_counter() - t0
+        METRICS.record("tts.synth", synth)
+        if data and store and key is not None:
+            self.cache.put(key, data, synth)
+        return data
+
+    def _cacheable(self, text: str) -> bool:
+        return (
+            self.cache is not None
+            and self.player is not None
+            and self.player.available
+            and len(text) <= self.cache_max_chars
+        )
+
+    def _render(self, text: str) -> Optional[bytes]:
+        fd, path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        try:
+            self.engine.save_to_file(text, path)
             self.engine.runAndWait()
+            with open(path, "rb") as f:
+                return f.read() or None
+        except Exception:
+            return None
+        finally:
+            os.unlink(path)
+
+    def _interrupt(self, handle: SpeechHandle) -> None:
+        with self._lock:
+            if self._current is handle:
+                self._interrupted.set()  # seen by _on_word and between sentences
+                if self.player is not None:
+                    self.player.stop()
+
+    def say(self, text: Union[str, Iterable[str]], wait: bool = False) -> SpeechHandle:
+        """Queue ``text`` (a string or an iterator of fragments) and return at once.
+
+        If the queue is full the utterance is dropped: the handle is already done and
+        cancelled.
+        """
+        if isinstance(text, str):
+            chunks = split_sentences(text, self.cache_max_chars) if self.stream else [text]
+            handle = SpeechHandle(text, self, iter(chunks) if len(chunks) > 1 else None)
+        elif self.stream:
+            handle = SpeechHandle("", self)
+            handle._chunks = _collect(handle, iter_sentences(text, self.cache_max_chars))
+        else:
+            handle = SpeechHandle("", self, iter(text), whole=True)
+        try:
+            self._queue.put_nowait(handle)
+        except queue.Full:  # never block the caller; drop this utterance instead
+            handle.cancelled = True
+            handle._finish()
+        if wait:
+            handle.wait()
+        return handle
 
     def stop(self) -> None:
-        self.engine.stop()
\ No newline at end of file
+        """Barge-in: flush queued utterances and interrupt the one being spoken."""
+        while True:
+            try:
+                handle = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if handle is None:  # keep a pending shutdown request
+                self._queue.put(None)
+                break
+            handle.cancelled = True
+            handle._finish()
+        with self._lock:
+            current = self._current
+        if current is not None:
+            current.cancel()
+
+    def close(self, timeout: Optional[float] = 2.0) -> None:
+        self.stop()
+        self._queue.put(None)
+        self._worker.join(timeout)
\ No newline at end of file
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: vad.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Voice activity detection stage that runs before any STT backend sees the audio.
+
+Usage:
+from voice_assistant.vad import VoiceActivityDetector; audio = VoiceActivityDetector().apply(audio)
+
+Notes:
+- Works on 16-bit PCM frames. Per-frame RMS energy and zero-crossing rate are
+  computed for the whole clip at once with NumPy; webrtcvad is used instead when
+  installed (and use_webrtc is left on).
+- Short bursts are discarded, the remaining speech is padded by a hangover so word
+  edges survive, and everything else is cut: leading/trailing silence and long
+  pauses. A clip without enough speech is dropped entirely (apply returns None).
+
+===================================================================
+"""
+from __future__ import annotations
+
+import threading
+from typing import Dict, Optional
+
+import numpy as np
+import speech_recognition as sr
+
+try:
+    import webrtcvad  # type: ignore
+except Exception:  # pragma: no cover
+    webrtcvad = None
+
+_WEBRTC_RATES = (8000, 16000, 32000, 48000)
+
+
+class VoiceActivityDetector:
+    def __init__(
+        self,
+        frame_ms: int = 30,
+        energy_ratio: float = 3.0,
+        min_energy: float = 200.0,
+        max_noise: float = 500.0,
+        max_zcr: float = 0.35,
+        min_speech_ms: int = 150,
+        hangover_ms: int = 240,
+        aggressiveness: int = 2,
+        use_webrtc: bool = True,
+    ):
+        self.frame_ms = frame_ms
+        self.energy_ratio = energy_ratio
+        self.min_energy = min_energy
+        self.max_noise = max_noise
+        self.max_zcr = max_zcr
+        self.min_speech_ms = min_speech_ms
+        self.hangover_ms = hangover_ms
+        self._webrtc = webrtcvad.Vad(aggressiveness) if (use_webrtc and webrtcvad) else None
+        self._lock = threading.Lock()
+        self.seen_seconds = 0.0
+        self.kept_seconds = 0.0
+        self.clips = 0
+        self.dropped_clips = 0
+
+    def speech_mask(self, frames: np.ndarray, sample_rate: int) -> np.ndarray:
+        """Boolean speech decision per frame (rows of int16 samples)."""
+        webrtc_ok = sample_rate in _WEBRTC_RATES and self.frame_ms in (10, 20, 30)
+        if self._webrtc is not None and webrtc_ok:
+            return np.fromiter(
+                (self._webrtc.is_speech(f.tobytes(), sample_rate) for f in frames),
+                dtype=bool,
+                count=len(frames),
+            )
+        x = frames.astype(np.float32)
+        energy = np.sqrt(np.mean(x * x, axis=1))
+        signs = np.signbit(x)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / max(1, x.shape[1] - 1)
+        # The quietest frames estimate the noise floor for this clip. In a clip that is
+        # nearly all speech they are speech too, so the estimate is capped at max_noise.
+        floor = min(float(np.percentile(energy, 10)), self.max_noise)
+        threshold = max(self.min_energy, floor * self.energy_ratio)
+        # Loud frames count even with a high ZCR (fricatives); quieter ones must look voiced.
+        return (energy > threshold) & ((zcr < self.max_zcr) | (energy > 3 * threshold))
+
+    def trim(self, pcm: bytes, sample_rate: int) -> Optional[bytes]:
+        """Return only the speech portions of mono 16-bit ``pcm``, or None if there are none."""
+        samples = np.frombuffer(pcm, dtype=np.int16)
+        flen = max(1, sample_rate * self.frame_ms // 1000)
+        n = len(samples) // flen
+        seconds = len(samples) / float(sample_rate)
+        if n == 0:
+            self._account(seconds, 0.0)
+            return None
+        frames = samples[: n * flen].reshape(n, flen)
+        mask = self.speech_mask(frames, sample_rate)
+
+        # Drop runs of speech frames shorter than min_speech_ms.
+        edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+        starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+        min_run = max(1, self.min_speech_ms // self.frame_ms)
+        keep = np.zeros(n, dtype=bool)
+        for s, e in zip(starts, ends):
+            if e - s >= min_run:
+                keep[s:e] = True
+        if not keep.any():
+            self._account(seconds, 0.0)
+            return None
+
+        # Pad speech with a hangover on both sides so word onsets/tails survive.
+        h = self.hangover_ms // self.frame_ms
+        if h:
+            keep = np.convolve(keep.astype(np.int8), np.ones(2 * h + 1, dtype=np.int8), "same") > 0
+        out = frames[keep].tobytes()
+        self._account(seconds, len(out) / 2.0 / sample_rate)
+        return out
+
+    def apply(self, audio: sr.AudioData) -> Optional[sr.AudioData]:
+        pcm = audio.get_raw_data(convert_width=2)
+        rate = audio.sample_rate
+        if self._webrtc is not None and rate not in _WEBRTC_RATES:
+            pcm, rate = audio.get_raw_data(convert_rate=16000, convert_width=2), 16000
+        out = self.trim(pcm, rate)
+        return sr.AudioData(out, rate, 2) if out else None
+
+    def _account(self, seen: float, kept: float) -> None:
+        with self._lock:
+            self.clips += 1
+            self.dropped_clips += kept == 0.0
+            self.seen_seconds += seen
+            self.kept_seconds += kept
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            discarded = self.seen_seconds - self.kept_seconds
+            return {
+                "clips": self.clips,
+                "dropped_clips": self.dropped_clips,
+                "audio_seconds": round(self.seen_seconds, 2),
+                "discarded_seconds": round(discarded, 2),
+                "discarded_pct": (
+                    round(100 * discarded / self.seen_seconds, 1) if self.seen_seconds else 0.0
+                ),
+            }
\ No newline at end of file
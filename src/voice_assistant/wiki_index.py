@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: wiki_index.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Offline Wikipedia summaries: an importer that streams an abstracts dump into
+SQLite with an FTS5 title index, and the lookup the Wikipedia skill tries before
+going online.
+
+Usage:
+voice-assistant wiki-import enwiki-latest-abstract.xml.gz
+index = WikiIndex.open("~/.cache/voice_assistant/wikipedia.sqlite3")
+index.summary("ada lovelace")
+
+Notes:
+- Dumps are the <feed><doc><title>Wikipedia: ...</title><abstract>...</abstract>
+  files from dumps.wikimedia.org, plain, .gz or .bz2. They are parsed with
+  iterparse and every <doc> is dropped once read. Rows go in batches, so memory
+  stays flat whatever the dump size. The index is built next to the target and
+  renamed into place at the end.
+- Disambiguation pages and empty or template-only abstracts are skipped.
+- Lookups go from cheapest to most forgiving:
+  1. the normalised title (B-tree; with and without a leading "the"/"a"/"an");
+  2. FTS5 on title words (prefix match on the last word), reranked with difflib;
+  3. each unknown word replaced by its closest title term, then step 2 again.
+  A title (or the title without its "(...)" qualifier) must be within MIN_RATIO
+  of the query to be used.
+- The database is opened read-only, so the import can replace it at any time.
+
+===================================================================
+"""
+from __future__ import annotations
+
+import bz2
+import difflib
+import gzip
+import os
+import re
+import sqlite3
+import threading
+import xml.etree.ElementTree as ET
+from typing import IO, Callable, Iterator, List, Optional, Tuple
+
+MIN_RATIO = 0.6
+CANDIDATES = 20  # FTS hits reranked with difflib
+_TOKEN = re.compile(r"\w+")
+_ARTICLE = re.compile(r"^(?:the|a|an)\s+")
+_QUALIFIER = re.compile(r"\s*\([^)]*\)")  # "Python (programming language)"
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'(])")
+_INSERT = "INSERT INTO pages (title, norm, abstract) VALUES (?, ?, ?)"
+
+
+def norm_title(text: str) -> str:
+    return " ".join(_TOKEN.findall(text.lower().replace("_", " ")))
+
+
+def first_sentences(text: str, n: int = 2) -> str:
+    return " ".join(_SENTENCE_END.split(text.strip(), maxsplit=n)[:n])
+
+
+def _open_dump(path: str) -> IO[bytes]:
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    if path.endswith(".bz2"):
+        return bz2.open(path, "rb")
+    return open(path, "rb")
+
+
+def iter_abstracts(src: IO[bytes]) -> Iterator[Tuple[str, str]]:
+    """(title, abstract) per <doc>, holding one document in memory at a time."""
+    events = ET.iterparse(src, events=("start", "end"))
+    _, root = next(events)
+    title = abstract = ""
+    for event, elem in events:
+        if event != "end":
+            continue
+        if elem.tag == "title":
+            title = (elem.text or "").strip()
+            if title.startswith("Wikipedia:"):
+                title = title[len("Wikipedia:") :].strip()
+        elif elem.tag == "abstract":
+            abstract = (elem.text or "").strip()
+        elif elem.tag == "doc":
+            if title and _usable(abstract):
+                yield title, abstract
+            title = abstract = ""
+            root.clear()  # drop the finished <doc> (and its links)
+
+
+def _usable(abstract: str) -> bool:
+    if len(abstract) < 20 or abstract[0] in "|{[":
+        return False
+    return "may refer to" not in abstract[-40:]
+
+
+def import_abstracts(
+    dump: str,
+    path: str,
+    batch_size: int = 5000,
+    progress: Optional[Callable[[int], None]] = None,
+) -> int:
+    """Build the index at ``path`` from an abstracts dump; returns the page count."""
+    path = os.path.expanduser(path)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    db = sqlite3.connect(tmp)
+    db.executescript(
+        """
+        PRAGMA journal_mode = OFF;
+        PRAGMA synchronous = OFF;
+        CREATE TABLE pages (id INTEGER PRIMARY KEY, title TEXT NOT NULL,
+                            norm TEXT NOT NULL, abstract TEXT NOT NULL);
+        """
+    )
+    count = 0
+    batch: List[Tuple[str, str, str]] = []
+    try:
+        with _open_dump(dump) as src:
+            for title, abstract in iter_abstracts(src):
+                batch.append((title, norm_title(title), abstract))
+                if len(batch) >= batch_size:
+                    db.executemany(_INSERT, batch)
+                    count += len(batch)
+                    batch.clear()
+                    if progress is not None:
+                        progress(count)
+        db.executemany(_INSERT, batch)
+        count += len(batch)
+        db.executescript(
+            """
+            CREATE INDEX pages_norm ON pages (norm);
+            CREATE VIRTUAL TABLE titles USING fts5(
+                title, content='pages', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2');
+            INSERT INTO titles (titles) VALUES ('rebuild');
+            CREATE VIRTUAL TABLE temp.vocab USING fts5vocab(main, titles, row);
+            CREATE TABLE terms (term TEXT PRIMARY KEY, docs INTEGER NOT NULL) WITHOUT ROWID;
+            INSERT INTO terms SELECT term, doc FROM temp.vocab;
+            """
+        )
+        db.commit()
+        db.execute("VACUUM")
+        db.close()
+        os.replace(tmp, path)
+    except BaseException:
+        db.close()
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return count
+
+
+def _ratio(a: str, b: str) -> float:
+    return difflib.SequenceMatcher(None, a, b).ratio()
+
+
+class WikiIndex:
+    def __init__(self, path: str):
+        path = os.path.expanduser(path)
+        self._db = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._len: Optional[int] = None
+
+    @classmethod
+    def open(cls, path: Optional[str]) -> Optional["WikiIndex"]:
+        """The index at ``path``, or None if there isn't one (nothing imported yet)."""
+        if not path or not os.path.exists(os.path.expanduser(path)):
+            return None
+        try:
+            return cls(path)
+        except sqlite3.Error:
+            return None
+
+    def __len__(self) -> int:
+        if self._len is None:
+            with self._lock:
+                self._len = self._db.execute("SELECT count(*) FROM pages").fetchone()[0]
+        return self._len
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def lookup(self, query: str) -> Optional[Tuple[str, str]]:
+        """(title, abstract) of the page that best matches ``query``, or None."""
+        full = norm_title(query)
+        q = _ARTICLE.sub("", full)
+        if not q:
+            return None
+        with self._lock:
+            row = self._db.execute(
+                "SELECT title, abstract FROM pages WHERE norm IN (?, ?) ORDER BY id LIMIT 1",
+                (full, q),
+            ).fetchone()
+            if row is not None:
+                return row
+            words = q.split()
+            hit = self._best_title(q, words)
+            if hit is None:
+                fixed = [self._correct(w) for w in words]
+                if fixed != words and None not in fixed:
+                    hit = self._best_title(q, fixed)
+            return hit
+
+    def summary(self, query: str, sentences: int = 2) -> Optional[str]:
+        hit = self.lookup(query)
+        return first_sentences(hit[1], sentences) if hit is not None else None
+
+    def _best_title(self, q: str, words: List[str]) -> Optional[Tuple[str, str]]:
+        match = " ".join(f'"{w}"' for w in words[:-1]) + f' "{words[-1]}"*'
+        rows = self._db.execute(
+            "SELECT p.title, p.norm, p.abstract FROM titles JOIN pages p ON p.id = titles.rowid"
+            " WHERE titles MATCH ? ORDER BY rank LIMIT ?",
+            (match.strip(), CANDIDATES),
+        ).fetchall()
+        best, best_ratio = None, MIN_RATIO
+        for title, norm, abstract in rows:
+            base = norm_title(_QUALIFIER.sub("", title))
+            ratio = max(_ratio(q, norm), _ratio(q, base) if base != norm else 0.0)
+            if ratio > best_ratio:
+                best, best_ratio = (title, abstract), ratio
+        return best
+
+    def _correct(self, word: str) -> Optional[str]:
+        """``word`` if it is a title term, else the closest term sharing its first two letters."""
+        if self._db.execute("SELECT 1 FROM terms WHERE term = ?", (word,)).fetchone():
+            return word
+        if len(word) < 3:
+            return None
+        lo = word[:2]
+        hi = lo[:-1] + chr(ord(lo[-1]) + 1)
+        rows = self._db.execute(
+            "SELECT term FROM terms WHERE term >= ? AND term < ?"
+            " AND length(term) BETWEEN ? AND ? ORDER BY docs DESC LIMIT 2000",
+            (lo, hi, len(word) - 2, len(word) + 2),
+        ).fetchall()
+        close = difflib.get_close_matches(word, [r[0] for r in rows], n=1, cutoff=0.75)
+        return close[0] if close else None
\ No newline at end of file
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: test_audio.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Tests for the rendered-speech audio cache.
+
+Usage:
+pytest -q
+
+===================================================================
+"""
+from voice_assistant.audio import AudioCache
+
+
+def test_key_depends_on_voice_settings():
+    k = AudioCache.key("Hello", "zira", 180, 1.0)
+    assert k == AudioCache.key("Hello", "zira", 180, 1.0)
+    assert k != AudioCache.key("Hello", "zira", 200, 1.0)
+    assert k != AudioCache.key("Hello", "david", 180, 1.0)
+
+
+def test_lru_eviction_and_counters():
+    cache = AudioCache(max_bytes=10)
+    cache.put("a", b"12345", synth_seconds=0.5)
+    cache.put("b", b"12345")
+    assert cache.get("a") == b"12345"  # a is now most recent
+    cache.put("c", b"123")
+    assert cache.get("b") is None and cache.get("a") and cache.get("c")
+    stats = cache.stats()
+    assert stats["hits"] == 3 and stats["misses"] == 1 and stats["saved_seconds"] == 1.0
+
+
+def test_disk_tier_survives_new_instance(tmp_path):
+    AudioCache(disk_dir=str(tmp_path)).put("k", b"RIFF....")
+    cache = AudioCache(disk_dir=str(tmp_path))
+    assert cache.get("k") == b"RIFF...." and cache.disk_hits == 1
+    assert cache.get("k") and cache.hits == 1
\ No newline at end of file
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: test_batch.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Tests for offline batch intent parsing.
+
+Usage:
+pytest -q
+
+===================================================================
+"""
+import io
+import json
+
+from voice_assistant.batch import run_batch
+
+_INPUT = "\n".join(
+    [
+        "weather in Rome",
+        '{"id": 7, "text": "wikipedia Alan Turing"}',
+        "",
+        "unrecognized command",
+        "tell me a joke",
+    ]
+    * 25
+)
+
+
+def _run(**kw):
+    out = io.StringIO()
+    n = run_batch(io.StringIO(_INPUT), out, **kw)
+    return n, [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+def test_batch_records():
+    n, recs = _run(chunk_size=3)
+    assert n == len(recs) == 100
+    assert recs[0] == {
+        "line": 1, "text": "weather in Rome", "intent": "weather", "slots": {"city": "Rome"}
+    }
+    assert recs[1]["id"] == 7 and recs[1]["intent"] == "wikipedia"
+    assert recs[2]["intent"] is None and recs[2]["line"] == 4
+
+
+def test_process_pool_keeps_input_order():
+    assert _run(jobs=2, chunk_size=7) == _run(jobs=1, chunk_size=7)
+
+
+def test_fuzzy_classifies_pattern_misses(tmp_path):
+    text = "\n".join(["weather in Rome", "how hot is it outside", "unrecognized command"])
+    out = io.StringIO()
+    run_batch(io.StringIO(text), out, fuzzy=(str(tmp_path / "intents.model"), 0.35))
+    recs = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert "score" not in recs[0]
+    assert recs[1]["intent"] == "weather" and recs[1]["score"] > 0.35
+    assert recs[2]["intent"] is None
\ No newline at end of file
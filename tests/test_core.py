@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: test_core.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Tests for the asyncio core: sync/async skills, preemption, timeouts, and
+speculative dispatch from interim hypotheses.
+
+Usage:
+pytest -q
+
+===================================================================
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from voice_assistant.app import _gui_callbacks
+from voice_assistant.core import TIMED_OUT, AssistantCore, LoopThread
+from voice_assistant.skills.base import AsyncSkill, Skill, SkillRegistry
+
+
+class Ctx:
+    def __init__(self):
+        self.spoken = []
+
+    def speak(self, text):
+        self.spoken.append(text)
+
+
+class SyncTime(Skill):
+    intents = ("time",)
+
+    def handle(self, ctx, intent_name, slots):
+        ctx.speak("noon")
+        return "noon"
+
+
+class SlowJoke(AsyncSkill):
+    intents = ("joke",)
+
+    def __init__(self):
+        self.started = asyncio.Event()
+        self.cancelled = False
+
+    async def handle_async(self, ctx, intent_name, slots):
+        self.started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return "too late"
+
+
+class BlockingTime(Skill):
+    """Blocks its thread; checks the token and would speak after being abandoned."""
+
+    intents = ("time",)
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.finished = threading.Event()
+
+    def handle(self, ctx, intent_name, slots):
+        self.release.wait(5)
+        ctx.speak("stale")
+        try:
+            ctx.token.raise_if_cancelled()
+        finally:
+            self.finished.set()
+        return "stale"
+
+
+def test_sync_skill_runs_through_executor():
+    ctx = Ctx()
+    core = AssistantCore(ctx, SkillRegistry([SyncTime()]))
+    assert asyncio.run(core.handle("what time is it")) == "noon"
+    assert ctx.spoken == ["noon"]
+    assert asyncio.run(core.handle("gibberish")) == "Sorry, I didn't understand."
+
+
+def test_new_utterance_preempts_running_command():
+    ctx, barge_ins = Ctx(), []
+    joke = SlowJoke()
+    core = AssistantCore(
+        ctx, SkillRegistry([joke, SyncTime()]), on_preempt=lambda: barge_ins.append(1)
+    )
+
+    async def scenario():
+        first = asyncio.ensure_future(core.handle("tell me a joke"))
+        await joke.started.wait()
+        second = await core.handle("what time is it")
+        return await first, second
+
+    assert asyncio.run(scenario()) == (None, "noon")
+    assert joke.cancelled and len(barge_ins) == 2
+
+
+def test_typed_gui_commands_overlap_and_spoken_ones_preempt():
+    ctx, barge_ins = Ctx(), []
+    slow = BlockingTime()
+    slow.intents = ("joke",)
+    core = AssistantCore(
+        ctx, SkillRegistry([slow, SyncTime()]), on_preempt=lambda: barge_ins.append(1)
+    )
+    runner = LoopThread()
+    heard = []
+    on_listen, on_text = _gui_callbacks(core, runner, lambda: heard.pop())
+    with ThreadPoolExecutor(2) as pool:  # the GUI's command threads
+        first = pool.submit(on_text, "tell me a joke")
+        assert on_text("what time is it") == "noon"  # answered while the joke still runs
+        assert not first.done() and barge_ins == []
+        slow.release.set()
+        assert first.result(5) == "stale"
+
+        slow.release.clear()
+        first = pool.submit(on_text, "tell me a joke")
+        while not core._active:
+            time.sleep(0.01)
+        heard.append("what time is it")
+        assert on_listen() == "what time is it"
+        assert first.result(5) == "(interrupted)" and barge_ins == [1]
+    slow.release.set()
+    runner.close()
+
+
+def test_timeout_abandons_blocking_skill_and_mutes_it():
+    ctx = Ctx()
+    skill = BlockingTime()
+    core = AssistantCore(ctx, SkillRegistry([skill]), timeout=0.05)
+
+    async def scenario():
+        ans = await core.handle("what time is it")
+        skill.release.set()  # the abandoned thread now wakes up and tries to speak
+        return ans
+
+    assert asyncio.run(scenario()) == TIMED_OUT
+    assert skill.finished.wait(5)
+    assert ctx.spoken == [TIMED_OUT]
+
+
+def test_async_skill_still_callable_synchronously():
+    class Hello(AsyncSkill):
+        intents = ("joke",)
+
+        async def handle_async(self, ctx, intent_name, slots):
+            return "hi"
+
+    assert SkillRegistry([Hello()]).dispatch(Ctx(), "joke", {}) == "hi"
+
+
+class Lookup(AsyncSkill):
+    intents = ("weather",)
+    speculative = True
+
+    def __init__(self):
+        self.calls = []
+
+    async def handle_async(self, ctx, intent_name, slots):
+        self.calls.append(slots.get("city"))
+        ctx.speak(f"sunny in {slots.get('city')}")
+        await asyncio.sleep(0)
+        return "sunny"
+
+
+def test_stable_partial_starts_skill_and_final_confirms_it():
+    ctx, skill = Ctx(), Lookup()
+    core = AssistantCore(ctx, SkillRegistry([skill]))
+    hyps = [("weather in", False), ("weather in Rome", False), ("weather in Rome", False)]
+    ans = asyncio.run(core.handle_stream(hyps + [("weather in Rome", True)]))
+    assert ans == "sunny" and skill.calls == ["Rome"]
+    assert ctx.spoken == ["sunny in Rome"]
+    assert core.speculation_stats == {"started": 1, "used": 1, "dropped": 0}
+
+
+def test_speculation_dropped_when_final_disagrees():
+    ctx, skill = Ctx(), Lookup()
+    core = AssistantCore(ctx, SkillRegistry([skill, SyncTime()]))
+    hyps = [("weather in Rome", False)] * 3 + [("weather in Rome and Paris", True)]
+    assert asyncio.run(core.handle_stream(hyps)) == "sunny"
+    assert ctx.spoken == ["sunny in Rome and Paris"]  # the Rome-only answer never spoke
+    assert core.speculation_stats == {"started": 1, "used": 0, "dropped": 1}
+    # time is not marked speculative: nothing starts before the final transcript
+    hyps = [("what time is it", False)] * 3 + [("what time is it", True)]
+    assert asyncio.run(core.handle_stream(hyps)) == "noon"
+    assert core.speculation_stats["started"] == 1
\ No newline at end of file
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: test_daemon.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Tests for the resident daemon on a Unix socket and its thin client.
+
+Usage:
+pytest -q
+
+===================================================================
+"""
+import errno
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from voice_assistant import client
+from voice_assistant.config import Config
+from voice_assistant.core import LoopThread
+from voice_assistant.server import AssistantServer, daemon_pid
+from voice_assistant.skills.base import Skill, SkillRegistry
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="Unix sockets and flock")
+
+
+class _Clock(Skill):
+    name = "clock"
+    intents = ("time",)
+
+    def handle(self, ctx, intent_name, slots):
+        ctx.speak("noon")
+        return "noon"
+
+
+class _Voice:
+    def __init__(self):
+        self.said = []
+
+    def say(self, text):
+        self.said.append(text)
+
+    def stop(self):
+        pass
+
+
+def test_unix_socket_roundtrip_and_single_instance(tmp_path):
+    path = str(tmp_path / "va.sock")
+    Path(path).write_text("left behind by a crashed daemon")
+    voice = _Voice()
+    runner = LoopThread()
+    server = AssistantServer(Config(), SkillRegistry([_Clock()]), tts=voice)
+    runner.submit(server.start_unix(path)).result(5)
+    try:
+        assert os.stat(path).st_mode & 0o777 == 0o600
+        assert client.ask("what time is it", path) == {
+            "session": None,
+            "answer": "noon",
+            "interrupted": False,
+        }
+        assert voice.said == ["noon"]
+        assert daemon_pid(path) == os.getpid()
+
+        second = AssistantServer(Config(), SkillRegistry([_Clock()]))
+        with pytest.raises(OSError) as e:
+            runner.submit(second.start_unix(path)).result(5)
+        assert e.value.errno == errno.EADDRINUSE
+        with pytest.raises(client.DaemonError, match="too large"):
+            client.ask("x" * (70 * 1024), path)
+    finally:
+        runner.submit(server.close()).result(5)
+        runner.close()
+    assert not os.path.exists(path) and daemon_pid(path) is None
+    with pytest.raises(FileNotFoundError):
+        client.ask("what time is it", path)
+
+
+def test_main_routes_text_to_the_daemon(monkeypatch, capsys):
+    from voice_assistant import app
+
+    monkeypatch.setattr(client, "run_command", lambda text: f"echo {text}")
+    assert client.main(["what's", "the", "time"]) == 0
+    assert capsys.readouterr().out == "echo what's the time\n"
+    seen = []
+    monkeypatch.setattr(app, "main", lambda argv: seen.append(argv) or 0)
+    for argv in ([], ["--cli"], ["serve", "--port", "0"], ["daemon", "--stop"]):
+        client.main(argv)
+    assert seen == [[], ["--cli"], ["serve", "--port", "0"], ["daemon", "--stop"]]
+
+
+def test_client_starts_the_daemon_once(tmp_path, monkeypatch):
+    path = str(tmp_path / "va.sock")
+    src = str(Path(__file__).resolve().parents[1] / "src")
+    monkeypatch.setenv("PYTHONPATH", os.pathsep.join(filter(None, [src, os.getenv("PYTHONPATH")])))
+    for name, value in (
+        ("VA_DAEMON_SPEAK", "0"),
+        ("VA_FILE_ROOTS", ""),
+        ("VA_CACHE_PATH", ""),
+    ):
+        monkeypatch.setenv(name, value)
+    assert client.run_command("tell me a joke", path)
+    pid = daemon_pid(path)
+    assert pid is not None and pid != os.getpid()
+    assert client.run_command("tell me a joke", path)
+    assert daemon_pid(path) == pid  # the warm daemon answered
+
+    out = subprocess.run(
+        [sys.executable, "-m", "voice_assistant.app", "daemon", "--stop", "--socket", path],
+        capture_output=True,
+        text=True,
+        timeout=30,
+    )
+    assert out.returncode == 0, out.stderr
+    deadline = time.monotonic() + 10
+    while os.path.exists(path) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not os.path.exists(path)
+    try:
+        os.kill(pid, signal.SIGKILL)  # make sure it is gone
+    except ProcessLookupError:
+        pass
\ No newline at end of file
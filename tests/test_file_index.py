@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: test_file_index.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Tests for the background file index and the files skill built on it.
+
+Usage:
+pytest -q
+
+===================================================================
+"""
+import os
+
+from voice_assistant.file_index import FileIndex, top_entries
+from voice_assistant.skills import skill_files
+from voice_assistant.skills.skill_files import FilesSkill
+
+
+def _tree(root):
+    for rel in (
+        "Documents/quarterly_report_2024.pdf",
+        "Documents/notes.txt",
+        "Documents/taxes/receipts.csv",
+        "Music/playlist.m3u",
+        ".hidden/secret.txt",
+    ):
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x")
+
+
+def test_fuzzy_search_and_persistence(tmp_path):
+    _tree(tmp_path / "home")
+    db = str(tmp_path / "files.sqlite3")
+    index = FileIndex(db, [str(tmp_path / "home")], watch=False)
+    index.crawl()
+    assert index.search("quartly report")[0].endswith("quarterly_report_2024.pdf")
+    assert index.search("receipts")[0].endswith(os.path.join("taxes", "receipts.csv"))
+    assert index.search("secret") == []  # hidden trees are skipped
+    assert index.directories("taxes")[0].endswith("taxes")
+    n = len(index)
+    index.close()
+
+    warm = FileIndex(db, [str(tmp_path / "home")], watch=False)
+    assert warm.load() == n
+    assert warm.search("notes")[0].endswith("notes.txt")
+    warm.close()
+
+
+def test_crawl_only_rereads_changed_directories(tmp_path, monkeypatch):
+    _tree(tmp_path)
+    index = FileIndex(None, [str(tmp_path)], watch=False)
+    index.crawl()
+
+    (tmp_path / "Documents" / "taxes" / "refund.txt").write_text("x")
+    os.remove(tmp_path / "Music" / "playlist.m3u")
+    rescanned = []
+    real = index._rescan
+    monkeypatch.setattr(index, "_rescan", lambda d, m: rescanned.append(d) or real(d, m))
+    index.crawl()
+    changed = [str(tmp_path / "Documents" / "taxes"), str(tmp_path / "Music")]
+    assert sorted(rescanned) == sorted(changed)
+    assert index.search("refund")
+    assert index.search("playlist") == []
+
+
+def test_add_and_remove_subtree(tmp_path):
+    index = FileIndex(None, [str(tmp_path)], watch=False)
+    index.crawl()
+    (tmp_path / "Projects" / "thesis").mkdir(parents=True)
+    (tmp_path / "Projects" / "thesis" / "draft.tex").write_text("x")
+    index.add(str(tmp_path / "Projects"))  # as a watchdog "created" event would
+    assert index.search("draft")[0].endswith("draft.tex")
+    index.remove(str(tmp_path / "Projects"))
+    assert index.search("draft") == [] and len(index) == 0
+
+
+def test_top_entries_matches_full_sort(tmp_path):
+    names = [f"File{i:03d}.txt" for i in range(50, 0, -1)] + ["alpha", "Beta"]
+    for name in names:
+        (tmp_path / name).write_text("x")
+    top, total = top_entries(str(tmp_path), 5)
+    assert top == sorted(names, key=str.lower)[:5] and total == len(names)
+
+
+def test_files_skill_open_and_list(tmp_path, monkeypatch):
+    class Ctx:
+        def speak(self, text):
+            pass
+
+    _tree(tmp_path)
+    opened = []
+    monkeypatch.setattr(skill_files, "_open", opened.append)
+    index = FileIndex(None, [str(tmp_path)], watch=False)
+    index.crawl()
+    index.ready.set()
+    skill = FilesSkill(index)
+
+    assert skill.handle(Ctx(), "file", {"action": "open", "query": "quarterly report"}) == (
+        "Opening quarterly_report_2024.pdf."
+    )
+    assert opened[-1].endswith("quarterly_report_2024.pdf")
+    msg = skill.handle(Ctx(), "file", {"action": "list", "query": "in Documents"})
+    assert msg.startswith(f"Here are some files in {tmp_path / 'Documents'}: notes.txt")
+    missing = skill.handle(Ctx(), "file", {"action": "find", "query": "zzzz"})
+    assert missing == "I couldn't find a file matching 'zzzz'."
+
+
+def test_files_skill_does_not_open_a_weak_match(tmp_path, monkeypatch):
+    class Ctx:
+        def speak(self, text):
+            pass
+
+    (tmp_path / "bug list.txt").write_text("x")
+    opened = []
+    monkeypatch.setattr(skill_files, "_open", opened.append)
+    index = FileIndex(None, [str(tmp_path)], watch=False)
+    index.crawl()
+    index.ready.set()
+
+    msg = FilesSkill(index).handle(Ctx(), "file", {"action": "open", "query": "budget"})
+    assert msg == f"I found bug list.txt in {tmp_path}."
+    assert opened == []
+
+
+def test_files_skill_refuses_to_move(monkeypatch):
+    class Ctx:
+        def speak(self, text):
+            pass
+
+    opened = []
+    monkeypatch.setattr(skill_files, "_open", opened.append)
+    msg = FilesSkill().handle(Ctx(), "file", {"action": "move", "query": "notes"})
+    assert msg == "I can't move files."
+    assert opened == []
\ No newline at end of file
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: test_gui.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Tests for the GUI's command executor, result polling, in-flight indicator and
+batched log, with stand-in widgets so no display is needed.
+
+Usage:
+pytest -q
+
+===================================================================
+"""
+import threading
+import time
+
+import pytest
+
+gui = pytest.importorskip("voice_assistant.gui")
+
+
+class Widget:
+    def __init__(self, *args, **kwargs):
+        self.options = dict(kwargs)
+        self.value = ""
+
+    def __getattr__(self, name):  # pack, bind, set, ...: nothing to draw
+        return lambda *args, **kwargs: None
+
+    def configure(self, **kwargs):
+        self.options.update(kwargs)
+
+    def get(self):
+        return self.value
+
+    def delete(self, *args):
+        self.value = ""
+
+
+class Text(Widget):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lines, self.inserts = [], 0
+
+    def yview(self, *args):
+        return (0.0, 1.0)
+
+    def insert(self, index, text):
+        self.inserts += 1
+        new = text.splitlines()
+        self.lines = new + self.lines if index == "1.0" else self.lines + new
+
+    def delete(self, first, last):
+        del self.lines[: int(last.split(".")[0]) - 1]
+
+
+class Root(Widget):
+    def __init__(self):
+        super().__init__()
+        self.scheduled, self.idle = [], []
+
+    def after(self, ms, fn):
+        self.scheduled.append(fn)
+
+    def after_idle(self, fn):
+        self.idle.append(fn)
+
+    def tick(self):
+        """One pass of the Tk mainloop: idle callbacks, then due timers."""
+        for queue_ in (self.idle, self.scheduled):
+            due = queue_[:]
+            queue_.clear()
+            for fn in due:
+                fn()
+
+
+@pytest.fixture
+def make_gui(monkeypatch):
+    monkeypatch.setattr(gui.tk, "Tk", Root)
+    monkeypatch.setattr(gui.tk, "Text", Text)
+    for name in ("Frame", "Scrollbar", "Entry", "Button", "Label"):
+        monkeypatch.setattr(gui.ttk, name, Widget)
+    made = []
+
+    def make(**kwargs):
+        app = gui.AssistantGUI("test", **kwargs)
+        made.append(app)
+        return app
+
+    yield make
+    for app in made:
+        app._close()
+
+
+def _pump(app, until, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not until() and time.monotonic() < deadline:
+        app.root.tick()
+        time.sleep(0.005)
+    app.root.tick()
+    assert until()
+
+
+def _type(app, text):
+    app.entry.value = text
+    app._send_text()
+
+
+def test_typed_commands_run_concurrently_and_results_come_back_on_poll(make_gui):
+    release, started = threading.Event(), []
+
+    def on_text(q):
+        started.append(q)
+        release.wait(2)
+        if q == "fail":
+            raise RuntimeError("boom")
+        return f"answer to {q}"
+
+    ready = []
+    app = make_gui(on_listen=lambda: "", on_text=on_text, on_ready=lambda: ready.append(1))
+    _type(app, "first")
+    _type(app, "fail")
+    _type(app, "   ")  # blank input is ignored
+    assert app.status.options["text"] == "⏳ 2 running"
+    _pump(app, lambda: len(started) == 2)  # both on worker threads, neither blocks the loop
+    assert ready == [1] and app.status.options["text"] == "⏳ 2 running"
+
+    release.set()
+    _pump(app, lambda: app._inflight == 0)
+    assert app.status.options["text"] == ""
+    assert app.text.lines[-4:-2] == ["You: first", "You: fail"]
+    assert sorted(app.text.lines[-2:]) == ["Assistant: answer to first", "Error: boom"]
+
+
+def test_log_lines_are_batched_into_one_insert_per_tick(make_gui):
+    app = make_gui(on_listen=lambda: "", on_text=lambda q: q)
+    app.root.tick()
+    before = app.text.inserts
+    threads = [threading.Thread(target=app.log, args=("Worker", f"line {i}")) for i in range(20)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    app.log("Assistant", "two\nlines")
+    assert app.text.inserts == before  # nothing touches the widget off the Tk thread
+    app.root.tick()
+    assert app.text.inserts == before + 1
+    assert len(app.text.lines) == 1 + 20 + 2 and app.text.lines[-1] == "lines"
+
+
+def test_one_listen_at_a_time(make_gui):
+    release, calls = threading.Event(), []
+
+    def on_listen():
+        calls.append(1)
+        release.wait(2)
+        return "what time is it"
+
+    app = make_gui(on_listen=on_listen, on_text=lambda q: q)
+    app._listen()
+    app._listen()  # ignored: the microphone is busy
+    assert app.status.options["text"] == "🎙️ listening…"
+    release.set()
+    _pump(app, lambda: app._inflight == 0)
+    assert calls == [1] and app.status.options["text"] == ""
+    assert app.text.lines[-2:] == ["You: (Listening…)", "Heard: what time is it"]
\ No newline at end of file
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: test_http_client.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Tests for the pooled HTTP client against a local stub server.
+
+Usage:
+pytest -q
+
+===================================================================
+"""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from voice_assistant.http_client import HttpClient
+
+
+@pytest.fixture
+def stub():
+    connections = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            connections.append(self.client_address)
+            super().setup()
+
+        def do_GET(self):
+            body = self.path.encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", connections
+    server.shutdown()
+
+
+def test_connections_are_reused(stub):
+    base, connections = stub
+    http = HttpClient()
+    assert [http.get(f"{base}/{i}").text for i in range(5)] == [f"/{i}" for i in range(5)]
+    assert len(connections) == 1
+    http.close()
+
+
+def test_map_keeps_order_and_maps_failures_to_none(stub):
+    base, _ = stub
+    http = HttpClient(retries=0)
+    urls = [f"{base}/a", "http://127.0.0.1:1/unreachable", f"{base}/b"]
+    assert http.map(lambda u: http.get(u, timeout=2).text, urls) == ["/a", None, "/b"]
+    http.close()
\ No newline at end of file
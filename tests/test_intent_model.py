@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: test_intent_model.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Tests for the n-gram fallback intent classifier and its model file.
+
+Usage:
+pytest -q
+
+===================================================================
+"""
+import numpy as np
+import pytest
+
+from voice_assistant.intent_model import IntentClassifier, load_classifier
+from voice_assistant.intents import FallbackParser, Intent
+from voice_assistant.skills import skill_files, skill_web
+from voice_assistant.skills.skill_files import FilesSkill
+
+
+def test_fallback_only_runs_on_pattern_misses():
+    loads = []
+
+    def load():
+        loads.append(1)
+        return IntentClassifier.train()
+
+    parse = FallbackParser(load)
+    assert parse("weather in Rome") == Intent("weather", {"city": "Rome"})
+    assert loads == []  # the patterns covered it: no model loaded
+    assert parse("how hot is it outside").name == "weather"
+    misheard = parse("whether in Rome")
+    assert (misheard.name, misheard.slots) == ("weather", {"city": "Rome"})
+    assert misheard.score >= parse.threshold
+    assert parse("who was Nikola Tesla?").slots == {"query": "Nikola Tesla"}
+    assert parse("look up cheap flights to Rome").slots == {"query": "cheap flights to Rome"}
+    assert parse("tell me a pun").name == "joke"
+    assert loads == [1] and parse.fallbacks == 5
+
+
+def test_unsafe_and_unknown_utterances_are_rejected():
+    parse = FallbackParser(IntentClassifier.train)
+    for text in ("turn the computer off", "write a mail to mom", "thanks", "banana", "   "):
+        assert parse(text) is None, text
+    assert parse.fallbacks == 0
+
+
+def test_fallback_matches_only_search_through_the_real_skills(monkeypatch):
+    class Index:
+        def __init__(self):
+            self.queries = []
+
+        def search(self, query, k=3):
+            self.queries.append(query)
+            return ["/home/me/docs/resume.pdf"]
+
+    class Ctx:
+        def speak(self, text):
+            pass
+
+    opened, browsed = [], []
+    monkeypatch.setattr(skill_files, "_open", opened.append)
+    monkeypatch.setattr(skill_web.webbrowser, "open", browsed.append)
+    parse, index = FallbackParser(IntentClassifier.train), Index()
+    files = FilesSkill(index)
+    asked = (("find my resume", "resume"), ("where is my thesis draft?", "thesis draft"))
+    for text, query in asked:
+        intent = parse(text)
+        assert intent.slots == {"action": "find", "query": query}
+        assert files.handle(Ctx(), intent.name, intent.slots).startswith("I found resume.pdf")
+    assert index.queries == ["resume", "thesis draft"] and opened == []
+
+    assert parse("book a flight to paris") is None  # web search guessed under the action bar
+    intent = parse("look up cheap flights to Rome")
+    assert intent.score >= parse.action_threshold
+    skill_web.WebSkill().handle(Ctx(), intent.name, intent.slots)
+    assert browsed == ["https://www.google.com/search?q=cheap+flights+to+Rome"]
+
+
+def test_batch_scores_match_single_scores():
+    model = IntentClassifier.train()
+    texts = ["how hot is it outside", "tell me a pun", "open my budget spreadsheet", "zzz"]
+    batch = model.scores(texts)
+    assert batch.shape == (4, len(model.intents))
+    for i, text in enumerate(texts):
+        np.testing.assert_allclose(batch[i], model.scores([text])[0], rtol=1e-5)
+
+
+def test_model_file_roundtrip_and_rebuild(tmp_path):
+    path = str(tmp_path / "intents.model")
+    built = load_classifier(path)
+    mapped = IntentClassifier.load(path)
+    assert not mapped.weights.flags.writeable  # a read-only view of the mapped file
+    assert mapped.intents == built.intents and mapped.digest == built.digest
+    texts = ["how cold is it", "who wrote Dune"]
+    np.testing.assert_allclose(mapped.scores(texts), built.scores(texts), rtol=1e-6)
+    assert load_classifier(path).digest == built.digest
+
+    other = load_classifier(path, {"time": ("what time is it",), "joke": ("tell me a joke",)})
+    assert other.intents == ["time", "joke"]  # examples changed: rebuilt and rewritten
+    assert IntentClassifier.load(path).digest == other.digest
+
+    (tmp_path / "junk.model").write_bytes(b"not a model")
+    with pytest.raises(ValueError):
+        IntentClassifier.load(str(tmp_path / "junk.model"))
+    assert load_classifier(str(tmp_path / "junk.model")).digest == built.digest
\ No newline at end of file
@@ -6,7 +6,7 @@ Project: Desktop Voice Assistant
 File: test_intents.py
 Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
 Created: 2025-10-20
-Updated: 2025-10-20
+Updated: 2026-10-18
 License: MIT License (see LICENSE file for details)
 ===================================================================
 
@@ -18,7 +18,7 @@ pytest -q
 
 ===================================================================
 """
-from voice_assistant.intents import parse_intent
+from voice_assistant.intents import _parse_intent_sequential, parse_intent
 
 
 def test_weather_in_city():
@@ -32,4 +32,52 @@ def test_wikipedia_query():
 
 
 def test_no_intent():
-    assert parse_intent("unrecognized command") is None
\ No newline at end of file
+    assert parse_intent("unrecognized command") is None
+
+
+def test_priority_follows_pattern_order():
+    # "time" is listed before "weather", regardless of position in the utterance.
+    assert parse_intent("weather at this time").name == "time"
+    assert parse_intent("open file report").name == "file"
+    assert parse_intent("open github").name == "web_search"
+
+
+def test_file_slots():
+    assert parse_intent("open file quarterly report").slots == {
+        "action": "open",
+        "query": "quarterly report",
+    }
+    assert parse_intent("please list files in Downloads").slots == {
+        "action": "list",
+        "query": "in Downloads",
+    }
+    assert parse_intent("find file").slots == {"action": "find"}
+
+
+def test_web_search_strips_leading_trigger_only():
+    assert parse_intent("search network slicing 6G").slots == {"query": "network slicing 6G"}
+    assert parse_intent("please google cats").slots == {"query": "please google cats"}
+
+
+def test_compiled_matcher_matches_sequential_loop():
+    corpus = [
+        "what's the time",
+        "Time in Rome",
+        "weather in New York  ",
+        "temperature in R ",
+        "who is Ada Lovelace",
+        "tell me about time travel",
+        "wikipedia",
+        "Google    quantum",
+        "make me laugh",
+        "lock the screen",
+        "send email to bob",
+        "list files in Downloads",
+        "open file budget 2024",
+        "timely weather in Rome",
+        "the forecast in Sao Paulo",
+        "nothing to see here",
+        "",
+    ]
+    for text in corpus:
+        assert parse_intent(text) == _parse_intent_sequential(text), text
\ No newline at end of file
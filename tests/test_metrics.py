@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: test_metrics.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Tests for stage latency histograms and their Prometheus/JSON export.
+
+Usage:
+pytest -q
+
+===================================================================
+"""
+import json
+import random
+import urllib.request
+
+from voice_assistant.metrics import JsonDumper, LatencyHistogram, Metrics, serve_prometheus
+
+
+def test_histogram_percentiles_within_bucket_error():
+    rng = random.Random(7)
+    samples = [rng.lognormvariate(-3, 1) for _ in range(20000)]
+    hist = LatencyHistogram()
+    for s in samples:
+        hist.record(s)
+    ordered = sorted(samples)
+    for q in (0.5, 0.95, 0.99):
+        exact = ordered[int(q * len(ordered)) - 1]
+        assert abs(hist.percentile(q) - exact) / exact < 0.02
+    assert hist.count == 20000 and len(hist.counts) < 1000
+    assert hist.percentile(1.0) == max(samples)
+
+
+def test_disabled_metrics_record_nothing():
+    m = Metrics()
+    with m.span("stt"):
+        pass
+    m.record("tts.speak", 0.1)
+    assert m.as_dict() == {} and m.report() == "no stages recorded"
+
+
+def test_prometheus_endpoint_and_json_dump(tmp_path):
+    m = Metrics(enabled=True)
+    for ms in (10, 20, 30):
+        m.record("skill.weather", ms / 1000)
+    server = serve_prometheus(m, port=0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        body = urllib.request.urlopen(url, timeout=5).read().decode()
+    finally:
+        server.shutdown()
+    assert 'voice_assistant_stage_seconds{stage="skill.weather",quantile="0.5"} 0.020' in body
+    assert 'voice_assistant_stage_seconds_count{stage="skill.weather"} 3' in body
+
+    path = tmp_path / "metrics.json"
+    JsonDumper(str(path), m, interval=60).close()
+    stages = json.loads(path.read_text())["stages"]
+    assert stages["skill.weather"]["count"] == 3
+    assert abs(stages["skill.weather"]["p99"] - 0.03) < 0.001
\ No newline at end of file
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: test_server.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Tests for the multi-session HTTP/WebSocket server.
+
+Usage:
+pytest -q
+
+===================================================================
+"""
+import asyncio
+import base64
+import json
+import os
+
+from voice_assistant.config import Config
+from voice_assistant.server import (
+    OP_TEXT,
+    AssistantServer,
+    encode_frame,
+    read_frame,
+    read_message,
+    ws_accept_key,
+)
+from voice_assistant.skills.base import AsyncSkill, Skill, SkillRegistry
+
+
+class _Clock(Skill):
+    name = "clock"
+    intents = ("time",)
+
+    def handle(self, ctx, intent_name, slots):
+        ctx.speak("noon")
+        return f"noon for {ctx.session_id[:4]}"
+
+
+class _SlowJoke(AsyncSkill):
+    name = "slow_joke"
+    intents = ("joke",)
+
+    async def handle_async(self, ctx, intent_name, slots):
+        await asyncio.sleep(0.5)
+        return "a slow joke"
+
+
+def _server(**kwargs) -> AssistantServer:
+    return AssistantServer(Config(), SkillRegistry([_Clock(), _SlowJoke()]), **kwargs)
+
+
+async def _http(port, method, path, body=None, headers=""):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    data = json.dumps(body).encode() if body is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: x\r\nContent-Length: {len(data)}\r\n"
+        f"Connection: close\r\n{headers}\r\n".encode() + data
+    )
+    raw = await reader.read()
+    writer.close()
+    head, _, payload = raw.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(payload)
+
+
+async def _ws(port):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    key = base64.b64encode(os.urandom(16)).decode()
+    writer.write(
+        f"GET /v1/ws HTTP/1.1\r\nHost: x\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+        f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n".encode()
+    )
+    head = await reader.readuntil(b"\r\n\r\n")
+    assert b" 101 " in head and ws_accept_key(key).encode() in head
+    return reader, writer
+
+
+def _send(writer, text):
+    writer.write(encode_frame(OP_TEXT, text.encode(), mask=True))
+
+
+async def _recv(reader, writer):
+    return json.loads(await read_message(reader, writer))
+
+
+def test_http_command_health_and_errors():
+    async def main():
+        server = _server()
+        port = await server.start("127.0.0.1", 0)
+        status, data = await _http(port, "POST", "/v1/command", {"text": "what time is it"})
+        assert status == 200 and data["answer"].startswith("noon") and data["session"] is None
+        status, data = await _http(
+            port, "POST", "/v1/command", {"text": "what time is it", "session": "abc"}
+        )
+        assert data["session"] == "abc" and "abc" in server.sessions
+        assert await _http(port, "GET", "/v1/health") == (200, {"status": "ok", "sessions": 1})
+        assert (await _http(port, "POST", "/v1/command", {"nope": 1}))[0] == 400
+        assert (await _http(port, "GET", "/elsewhere"))[0] == 404
+        await server.close()
+
+    asyncio.run(main())
+
+
+def test_token_is_required_when_configured():
+    async def main():
+        server = _server(token="s3cret")
+        port = await server.start("127.0.0.1", 0)
+        assert (await _http(port, "GET", "/v1/health"))[0] == 401
+        ok = await _http(port, "GET", "/v1/health", headers="Authorization: Bearer s3cret\r\n")
+        assert ok[0] == 200
+        await server.close()
+
+    asyncio.run(main())
+
+
+def test_websocket_sessions_preempt_only_themselves():
+    async def main():
+        server = _server()
+        port = await server.start("127.0.0.1", 0)
+        a_reader, a_writer = await _ws(port)
+        b_reader, b_writer = await _ws(port)
+        assert len(server.sessions) == 2
+
+        _send(a_writer, json.dumps({"text": "tell me a joke", "id": 1}))
+        _send(b_writer, "tell me a joke")
+        await asyncio.sleep(0.1)
+        _send(a_writer, json.dumps({"text": "what time is it", "id": 2}))  # barge in on A
+        replies = [await _recv(a_reader, a_writer), await _recv(a_reader, a_writer)]
+        by_id = {r["id"]: r for r in replies}
+        assert by_id[1]["interrupted"] and by_id[1]["answer"] is None
+        assert by_id[2]["answer"].startswith("noon")
+        assert await _recv(b_reader, b_writer) == {
+            "id": None,
+            "answer": "a slow joke",
+            "interrupted": False,
+        }
+
+        a_writer.write(encode_frame(0x8, b"", mask=True))
+        await read_frame(a_reader)  # the server's close frame
+        await asyncio.sleep(0.05)
+        assert len(server.sessions) == 1
+        b_writer.close()
+        await server.close()
+
+    asyncio.run(main())
+
+
+def test_frames_roundtrip_with_masking():
+    async def main():
+        for size in (0, 5, 300, 40_000):
+            payload = os.urandom(size)
+            reader = asyncio.StreamReader()
+            reader.feed_data(encode_frame(OP_TEXT, payload, mask=True))
+            assert await read_frame(reader) == (True, OP_TEXT, payload)
+
+    asyncio.run(main())
\ No newline at end of file
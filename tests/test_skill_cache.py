@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: test_skill_cache.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Tests for the shared skill response cache.
+
+Usage:
+pytest -q
+
+===================================================================
+"""
+import threading
+import time
+
+from voice_assistant.skills.cache import ResponseCache
+
+
+class Fetcher:
+    def __init__(self):
+        self.calls = 0
+        self.done = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        self.done.set()
+        return f"answer {self.calls}"
+
+
+def test_ttl_hit_and_persistence(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    fetch = Fetcher()
+    cache = ResponseCache(path)
+    assert cache.get_or_fetch("weather", "rome", fetch, ttl=60) == "answer 1"
+    assert cache.get_or_fetch("weather", "rome", fetch, ttl=60) == "answer 1"
+    cache.close()
+    warm = ResponseCache(path)
+    assert warm.get_or_fetch("weather", "rome", fetch, ttl=60) == "answer 1"
+    assert fetch.calls == 1 and warm.hits == 1
+
+
+def test_stale_while_revalidate():
+    cache = ResponseCache()
+    cache.put("wikipedia", "turing", "old", stored_at=time.time() - 120)
+    fetch = Fetcher()
+    assert cache.get_or_fetch("wikipedia", "turing", fetch, ttl=60, stale_ttl=600) == "old"
+    assert fetch.done.wait(2)
+    for _ in range(100):
+        if cache.get_or_fetch("wikipedia", "turing", fetch, ttl=60) == "answer 1":
+            break
+        time.sleep(0.01)
+    assert fetch.calls == 1 and cache.stale_hits == 1
+
+
+def test_expired_entry_and_failures_are_refetched():
+    cache = ResponseCache(max_entries=1)
+    cache.put("weather", "rome", "old", stored_at=time.time() - 1000)
+    assert cache.get_or_fetch("weather", "rome", lambda: None, ttl=60, stale_ttl=600) is None
+    assert cache.get_or_fetch("weather", "oslo", lambda: "cold", ttl=60) == "cold"
+    assert cache.stats()["entries"] == 1
\ No newline at end of file
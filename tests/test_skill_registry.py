@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: test_skill_registry.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Tests for the intent-indexed skill registry and lazily loaded skills.
+
+Usage:
+pytest -q
+
+===================================================================
+"""
+import sys
+
+from voice_assistant.skills.base import LazySkill, Skill, SkillRegistry
+
+
+class Echo(Skill):
+    def __init__(self, name, intents=(), priority=0, answer=True):
+        self.name, self.intents, self.priority, self.answer = name, intents, priority, answer
+
+    def handle(self, ctx, intent_name, slots):
+        return self.name if self.answer else None
+
+
+class Legacy(Skill):
+    name = "legacy"
+
+    def can_handle(self, intent_name):
+        return intent_name == "old"
+
+    def handle(self, ctx, intent_name, slots):
+        return "legacy"
+
+
+def test_priority_and_fallthrough():
+    reg = SkillRegistry(
+        [
+            Echo("low", ("weather",)),
+            Echo("declines", ("weather",), priority=10, answer=False),
+            Echo("high", ("weather",), priority=5),
+        ]
+    )
+    assert [s.name for s in reg.handlers("weather")] == ["declines", "high", "low"]
+    assert reg.dispatch(None, "weather", {}) == "high"
+
+
+def test_legacy_can_handle_and_unknown_intent():
+    reg = SkillRegistry([Echo("time", ("time",)), Legacy()])
+    assert reg.dispatch(None, "old", {}) == "legacy"
+    assert reg.handlers("nope") == [] and reg.dispatch(None, "nope", {}) is None
+
+
+def test_lazy_skill_imports_on_first_dispatch(tmp_path, monkeypatch):
+    (tmp_path / "lazy_probe_skill.py").write_text(
+        "from voice_assistant.skills.base import Skill\n"
+        "class Probe(Skill):\n"
+        "    intents = ('probe',)\n"
+        "    def __init__(self, answer):\n"
+        "        self.answer = answer\n"
+        "    def handle(self, ctx, intent_name, slots):\n"
+        "        return self.answer\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "lazy_probe_skill", raising=False)
+    lazy = LazySkill("probe", ("probe",), "lazy_probe_skill:Probe", lambda cls: cls("pong"))
+    reg = SkillRegistry([lazy, Echo("time", ("time",))])
+
+    assert reg.dispatch(None, "time", {}) == "time"
+    assert not lazy.loaded and "lazy_probe_skill" not in sys.modules
+    assert reg.dispatch(None, "probe", {}) == "pong"
+    assert lazy.loaded and reg.prewarm() == 0
\ No newline at end of file
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: test_skill_weather.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Tests for splitting a weather request into cities.
+
+Usage:
+pytest -q
+
+===================================================================
+"""
+from voice_assistant.config import Config
+from voice_assistant.intents import parse_intent
+from voice_assistant.skills.cache import ResponseCache
+from voice_assistant.skills.skill_weather import WeatherSkill, _split_cities
+
+_UNKNOWN = {"Tobago", "Herm"}  # names the fake service can't resolve on their own
+
+
+class Response:
+    def __init__(self, status_code, data=None):
+        self.status_code = status_code
+        self._data = data
+
+    def json(self):
+        return self._data
+
+
+class Http:
+    def __init__(self):
+        self.cities = []
+
+    def get(self, url):
+        city = url.rsplit("/", 1)[1].split("?")[0]
+        self.cities.append(city)
+        if city in _UNKNOWN:
+            return Response(404)
+        return Response(200, {
+            "current_condition": [
+                {"temp_C": "20", "FeelsLikeC": "19", "weatherDesc": [{"value": "Sunny"}]}
+            ],
+        })
+
+    def map(self, fn, items):
+        self.mapped = list(items)
+        return [fn(i) for i in items]
+
+
+class Ctx:
+    def speak(self, text):
+        pass
+
+
+def test_split_cities_on_commas_and_and():
+    assert _split_cities("Rome, Paris and Oslo") == [
+        ("Rome", ["Rome"]),
+        ("Paris and Oslo", ["Paris", "Oslo"]),
+    ]
+    assert _split_cities("Trinidad and Tobago") == [
+        ("Trinidad and Tobago", ["Trinidad and Tobago"])
+    ]
+
+
+def test_comma_separated_cities_reach_the_skill():
+    intent = parse_intent("weather in Rome, Paris and Oslo")
+    assert intent.slots == {"city": "Rome, Paris and Oslo"}
+    http = Http()
+    msg = WeatherSkill(Config(), http=http).handle(Ctx(), "weather", intent.slots)
+    assert http.cities == ["Rome", "Paris", "Oslo"] and msg.count("Weather in") == 3
+
+
+def test_cities_are_fetched_together_without_probing_the_names():
+    http = Http()
+    skill = WeatherSkill(Config(), http=http)
+    msg = skill.handle(Ctx(), "weather", {"city": "Rome and Paris"})
+    assert msg.startswith("Weather in Rome:") and "Weather in Paris:" in msg
+    assert http.mapped == ["Rome", "Paris"] and http.cities == ["Rome", "Paris"]
+
+    http.cities = []
+    msg = skill.handle(Ctx(), "weather", {"city": "Trinidad and Tobago"})
+    assert msg == "Weather in Trinidad and Tobago: Sunny, 20°C (feels 19°C)."
+    assert http.cities == ["Trinidad and Tobago"]
+
+
+def test_unresolved_piece_retries_the_whole_phrase_through_the_cache():
+    http = Http()
+    cache = ResponseCache()
+    skill = WeatherSkill(Config(), cache=cache, http=http)
+    msg = skill.handle(Ctx(), "weather", {"city": "Guernsey and Herm, Oslo"})
+    assert msg.startswith("Weather in Guernsey and Herm:") and msg.count("Weather in") == 2
+    assert http.cities == ["Guernsey", "Herm", "Oslo", "Guernsey and Herm"]
+
+    http.cities = []
+    assert skill.handle(Ctx(), "weather", {"city": "Guernsey and Herm, Oslo"}) == msg
+    assert http.cities == ["Herm"]  # only the failed piece is asked again
\ No newline at end of file
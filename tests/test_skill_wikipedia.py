@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: test_skill_wikipedia.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Hedged Wikipedia + WolframAlpha lookups against stub backends with injected latency.
+
+Usage:
+pytest -q
+
+===================================================================
+"""
+import time
+
+from voice_assistant.config import Config
+from voice_assistant.skills.skill_wikipedia import WikipediaSkill
+
+
+def _stub(latency: float, answer):
+    def backend(q):
+        time.sleep(latency)
+        return answer
+
+    return backend
+
+
+def _skill(hedge: bool, wiki, wolfram, prefer_ms: float = 100):
+    skill = WikipediaSkill(Config(wikipedia_hedge=hedge, wikipedia_prefer_ms=prefer_ms))
+    skill._wolfram_client = object()  # enable the fallback path; the stubs below answer
+    skill._from_wikipedia = wiki
+    skill._from_wolfram = wolfram
+    return skill
+
+
+def _timed(skill):
+    t0 = time.perf_counter()
+    ans = skill._lookup("Alan Turing")
+    return ans, time.perf_counter() - t0
+
+
+def test_wikipedia_miss_costs_one_round_trip_when_hedged():
+    wiki, wolfram = _stub(0.3, None), _stub(0.3, "wolfram")
+    seq_ans, seq_t = _timed(_skill(False, wiki, wolfram))
+    hedged_ans, hedged_t = _timed(_skill(True, wiki, wolfram))
+    assert seq_ans == hedged_ans == "wolfram"
+    assert seq_t >= 0.6 and hedged_t < 0.5
+
+
+def test_wikipedia_preferred_within_window():
+    ans, _ = _timed(_skill(True, _stub(0.08, "wiki"), _stub(0.01, "wolfram"), prefer_ms=200))
+    assert ans == "wiki"
+
+
+def test_slow_wikipedia_loses_after_window():
+    ans, t = _timed(_skill(True, _stub(1.0, "wiki"), _stub(0.01, "wolfram"), prefer_ms=100))
+    assert ans == "wolfram" and t < 0.5
\ No newline at end of file
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: test_smtp_client.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Tests for the persistent SMTP session and the outbound mail queue, against a
+local stub server.
+
+Usage:
+pytest -q
+
+===================================================================
+"""
+import smtplib
+import socketserver
+import threading
+import time
+from email.message import EmailMessage
+
+import pytest
+
+from voice_assistant.config import Config
+from voice_assistant.skills.skill_email import EmailSkill
+from voice_assistant.smtp_client import MailQueue, SMTPConnection
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        server = self.server
+        server.connections += 1
+        self.wfile.write(b"220 stub\r\n")
+        in_data, lines = False, []
+        for raw in self.rfile:
+            line = raw.decode().rstrip("\r\n")
+            if in_data:
+                if line != ".":
+                    lines.append(line)
+                    continue
+                in_data = False
+                server.messages.append("\n".join(lines))
+                lines = []
+                if server.hang_up_in_data:
+                    return  # message received, but the reply never comes
+                self.wfile.write(b"250 queued\r\n")
+                if server.drop_after_next:
+                    server.drop_after_next = False
+                    return  # hang up without QUIT, as an idle-timing-out server does
+                continue
+            verb = line[:4].upper()
+            if verb == "EHLO":
+                self.wfile.write(b"250-stub\r\n250 AUTH PLAIN\r\n")
+            elif verb == "AUTH":
+                server.logins += 1
+                self.wfile.write(b"235 ok\r\n")
+            elif verb == "DATA":
+                in_data = True
+                self.wfile.write(b"354 go\r\n")
+            elif verb == "QUIT":
+                self.wfile.write(b"221 bye\r\n")
+                return
+            else:
+                self.wfile.write(b"250 ok\r\n")
+
+
+@pytest.fixture
+def smtp_stub():
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    server.connections = server.logins = 0
+    server.messages = []
+    server.drop_after_next = server.hang_up_in_data = False
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _message(i: int) -> EmailMessage:
+    m = EmailMessage()
+    m["From"] = "me@example.com"
+    m["To"] = "you@example.com"
+    m["Subject"] = f"note {i}"
+    m.set_content(f"body {i}")
+    return m
+
+
+def _connection(server, **kwargs) -> SMTPConnection:
+    port = server.server_address[1]
+    return SMTPConnection("127.0.0.1", port, "me", "pw", security="plain", **kwargs)
+
+
+def test_session_is_reused_and_reopened_after_a_drop(smtp_stub):
+    conn = _connection(smtp_stub)
+    conn.send(_message(0))
+    conn.send(_message(1))
+    assert (smtp_stub.connections, smtp_stub.logins) == (1, 1)
+
+    smtp_stub.drop_after_next = True
+    conn.send(_message(2))
+    conn.send(_message(3))  # server hung up after #2: reconnect and resend
+    conn.close()
+    assert smtp_stub.connections == 2 and smtp_stub.logins == 2
+    assert [m.count("Subject: note") for m in smtp_stub.messages] == [1, 1, 1, 1]
+
+
+def test_idle_session_is_closed(smtp_stub):
+    conn = _connection(smtp_stub, idle_timeout=0.05)
+    conn.send(_message(0))
+    assert not conn.close_if_idle() and conn.connected
+    time.sleep(0.1)
+    assert conn.close_if_idle() and not conn.connected
+    conn.send(_message(1))
+    conn.close()
+    assert smtp_stub.connections == 2
+
+
+def test_queue_sends_in_batches_over_one_session(smtp_stub):
+    mailer = MailQueue(_connection(smtp_stub), batch_size=10, batch_window=0.2)
+    futures = [mailer.send(_message(i)) for i in range(25)]
+    assert mailer.flush(5)
+    assert all(f.done() and f.exception() is None for f in futures)
+    mailer.close()
+    assert len(smtp_stub.messages) == 25
+    assert smtp_stub.connections == 1
+    assert mailer.batches == 3
+
+
+def test_failures_are_retried_then_reported():
+    delays = []
+    conn = SMTPConnection("127.0.0.1", 1, security="plain", timeout=1)  # nothing listens
+    mailer = MailQueue(conn, retries=2, backoff=0.1, sleep=delays.append)
+    fut = mailer.send(_message(0))
+    assert isinstance(fut.exception(timeout=5), OSError)
+    assert delays == [0.1, 0.2]
+    mailer.close()
+
+
+def test_failure_after_data_is_never_resent(smtp_stub):
+    smtp_stub.hang_up_in_data = True
+    conn = _connection(smtp_stub)
+    with pytest.raises(smtplib.SMTPServerDisconnected):
+        conn.send(_message(0))
+    assert conn.reached_data and not conn.connected
+
+    mailer = MailQueue(conn, retries=2, sleep=lambda s: None)
+    conn.send = _counting(conn.send)
+    fut = mailer.send(_message(1))
+    assert isinstance(fut.exception(timeout=5), smtplib.SMTPServerDisconnected)
+    assert conn.send.calls == 1  # the queue does not retry a message the server may have
+    assert len(smtp_stub.messages) == 2
+    mailer.close()
+    t0 = time.perf_counter()
+    assert mailer.flush() and time.perf_counter() - t0 < 0.1  # closed: returns at once
+
+
+def _counting(fn):
+    def wrapper(*args):
+        wrapper.calls += 1
+        return fn(*args)
+
+    wrapper.calls = 0
+    return wrapper
+
+
+def test_email_skill_returns_once_enqueued(smtp_stub):
+    class Ctx:
+        spoken = []
+
+        def speak(self, text):
+            self.spoken.append(text)
+
+    cfg = Config(allow_email=True, email_sender="me@example.com")
+    mailer = MailQueue(_connection(smtp_stub), batch_window=0.5)
+    t0 = time.perf_counter()
+    ans = EmailSkill(cfg, mailer).handle(Ctx(), "email", {})
+    assert time.perf_counter() - t0 < 0.25 and not smtp_stub.messages
+    assert ans == "Sending email to me@example.com."
+    mailer.close()
+    assert len(smtp_stub.messages) == 1
\ No newline at end of file
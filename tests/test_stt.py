@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: test_stt.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Tests for the CaptureSession lifecycle and its phrase hand-off, with a fake
+microphone and recognizer in place of the audio device.
+
+Usage:
+pytest -q
+
+===================================================================
+"""
+import queue
+import threading
+import time
+
+import speech_recognition as sr
+
+from voice_assistant import stt
+from voice_assistant.stt import CaptureSession
+from voice_assistant.stt_backends import WavFileBackend
+
+
+def _audio(seed: int) -> sr.AudioData:
+    return sr.AudioData(bytes((seed + i) % 256 for i in range(3200)), 16000, 2)
+
+
+class FakeMicrophone:
+    opened = []
+
+    def __init__(self):
+        self.entered = self.exited = 0
+        FakeMicrophone.opened.append(self)
+
+    def __enter__(self):
+        self.entered += 1
+        return self
+
+    def __exit__(self, *exc):
+        self.exited += 1
+
+
+class FakeRecognizer:
+    """Hands out queued phrases; raises WaitTimeoutError while nothing is said."""
+
+    def __init__(self):
+        self.spoken: "queue.Queue[sr.AudioData]" = queue.Queue()
+        self.calibrations = 0
+
+    def adjust_for_ambient_noise(self, source, duration=1):
+        self.calibrations += 1
+
+    def listen(self, source, timeout=None, phrase_time_limit=None):
+        try:
+            return self.spoken.get(timeout=0.02)
+        except queue.Empty:
+            raise sr.WaitTimeoutError("quiet") from None
+
+
+def _session(monkeypatch, **kw):
+    FakeMicrophone.opened = []
+    monkeypatch.setattr(stt.sr, "Microphone", FakeMicrophone)
+    backend = WavFileBackend()
+    for seed, text in enumerate(["weather in Rome", "open notepad", "what time is it"]):
+        backend.add(_audio(seed), text)
+    session = CaptureSession(backend=backend, **kw)
+    session.recognizer = FakeRecognizer()
+    return session
+
+
+def test_start_is_idempotent_and_stop_releases_the_microphone(monkeypatch):
+    session = _session(monkeypatch)
+    assert session.start() is session
+    thread = session._thread
+    session.start()
+    assert session._thread is thread
+    assert len(FakeMicrophone.opened) == 1
+    mic = FakeMicrophone.opened[0]
+    assert (mic.entered, session.recognizer.calibrations) == (1, 1)
+
+    session.stop()
+    assert not thread.is_alive()
+    assert mic.exited == 1
+    session.stop()  # a second stop is a no-op
+    assert mic.exited == 1
+
+    session.start()  # a stopped session can be started again on a fresh stream
+    assert len(FakeMicrophone.opened) == 2
+    assert session.recognizer.calibrations == 2
+    session.stop()
+
+
+def test_captured_phrases_are_handed_off_in_order(monkeypatch):
+    session = _session(monkeypatch).start()
+    try:
+        session.recognizer.spoken.put(_audio(0))
+        session.recognizer.spoken.put(_audio(1))
+        assert session.next_phrase(timeout=2) == "weather in Rome"
+        assert session.next_phrase(timeout=2) == "open notepad"
+        assert session.next_phrase(timeout=0.1) == ""
+    finally:
+        session.stop()
+
+
+def test_listen_ignores_speech_from_before_the_call(monkeypatch):
+    session = _session(monkeypatch, phrase_time_limit=None).start()
+    try:
+        session.recognizer.spoken.put(_audio(0))
+        while session._segments.empty():
+            time.sleep(0.01)
+        threading.Timer(0.1, session.recognizer.spoken.put, [_audio(2)]).start()
+        assert session.listen(timeout=2) == "what time is it"
+    finally:
+        session.stop()
+
+
+def test_streaming_falls_back_when_listen_cannot_stream(monkeypatch):
+    assert CaptureSession(backend=WavFileBackend(), streaming=True).streaming
+    monkeypatch.setattr(stt.sr, "Recognizer", FakeRecognizer)  # listen() has no stream=
+    session = _session(monkeypatch, streaming=True)
+    assert not session.streaming
+    session.start()
+    try:
+        session.recognizer.spoken.put(_audio(0))
+        assert [text for text, _ in session.next_stream(timeout=2)] == ["weather in Rome"]
+    finally:
+        session.stop()
+
+
+def test_full_queue_drops_the_oldest_phrase(monkeypatch):
+    session = _session(monkeypatch, max_pending=2)
+    for seed in range(3):
+        session._offer(_audio(seed))
+    assert session.next_phrase(timeout=0) == "open notepad"
+    assert session.next_phrase(timeout=0) == "what time is it"
\ No newline at end of file
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: test_stt_backends.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Tests for STT backend selection and the deterministic WAV backend.
+
+Usage:
+pytest -q
+
+===================================================================
+"""
+import wave
+
+import pytest
+import speech_recognition as sr
+
+from voice_assistant.config import Config
+from voice_assistant.stt_backends import WavFileBackend, load_wav, make_backend, pcm_chunks
+
+
+def _clip(path, seed: int):
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(16000)
+        w.writeframes(bytes((seed + i) % 256 for i in range(3200)))
+
+
+def test_wav_backend_returns_sidecar_transcript(tmp_path):
+    _clip(tmp_path / "a.wav", 1)
+    (tmp_path / "a.txt").write_text("weather in Rome\n")
+    _clip(tmp_path / "b.wav", 2)  # no sidecar
+    backend = make_backend(Config(stt_backend="wav", stt_wav_dir=str(tmp_path)))
+    assert backend.transcribe(load_wav(str(tmp_path / "a.wav"))) == "weather in Rome"
+    assert backend.transcribe_file(str(tmp_path / "b.wav")) == ""
+
+
+def test_wav_backend_streams_growing_partials():
+    # 0.3 s silence, 1 s of speech-level noise, 0.5 s silence
+    voiced = bytes(b for i in range(16000) for b in (0, 0x40 if i % 2 else 0xC0))
+    pcm = b"\0" * 9600 + voiced + b"\0" * 16000
+    backend = WavFileBackend()
+    backend.add(sr.AudioData(pcm, 16000, 2), "weather in Rome")
+    hyps = list(backend.stream(pcm_chunks(pcm, 1000)))
+    partials = [h.text for h in hyps if not h.final]
+    assert partials[0] == "weather" and partials[-1] == "weather in Rome"
+    assert partials.count("weather in Rome") >= 5  # repeated through the trailing pause
+    assert hyps[-1] == ("weather in Rome", True)
+    assert list(backend.stream([pcm[:6400]])) == [("", True)]
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        make_backend(Config(stt_backend="nope"))
\ No newline at end of file
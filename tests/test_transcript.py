@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: test_transcript.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Tests for the bounded GUI transcript model.
+
+Usage:
+pytest -q
+
+===================================================================
+"""
+import tracemalloc
+
+from voice_assistant.transcript import Transcript
+
+
+def test_trims_in_chunks_and_pages_history(tmp_path):
+    t = Transcript(max_lines=10, trim_chunk=4, spill_path=str(tmp_path / "log.txt"))
+    trimmed = [t.append(f"line {i}") for i in range(15)]
+    assert sum(trimmed) == 8 and max(trimmed) == 4
+    assert t.lines[0] == "line 8" and len(t.lines) == 7
+    assert t.history(0, 3) == ["line 5", "line 6", "line 7"]
+    assert t.history(6, 5) == ["line 0", "line 1"]
+    t.close()
+
+
+def test_memory_stays_flat_over_1m_lines(tmp_path):
+    t = Transcript(max_lines=2000, trim_chunk=500, spill_path=str(tmp_path / "log.txt"))
+    tracemalloc.start()
+    # The GUI flushes a poll tick's worth of lines at a time.
+    batch = [f"Assistant: reply number {i}" for i in range(1000)]
+    for n in range(1000):
+        t.extend(batch)
+        if n == 100:
+            warm, _ = tracemalloc.get_traced_memory()
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(t.lines) <= 2000 and t.spilled >= 998_000
+    assert end - warm < 256 * 1024
+    assert t.history(0, 1) == [f"Assistant: reply number {(t.spilled - 1) % 1000}"]
+    t.close()
\ No newline at end of file
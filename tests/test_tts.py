@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: test_tts.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Tests for the TTS speech worker using a fake pyttsx3 engine.
+
+Usage:
+pytest -q
+
+===================================================================
+"""
+import threading
+import time
+
+from voice_assistant.audio import AudioCache
+from voice_assistant.tts import TTS, split_sentences
+
+
+class FakeEngine:
+    def __init__(self, duration: float = 0.2):
+        self.duration = duration
+        self.spoken = []
+        self.stopped_on = []
+        self._pending = None
+        self._stop = threading.Event()
+        self._on_word = None
+
+    def connect(self, topic, cb):
+        assert topic == "started-word"
+        self._on_word = cb
+
+    def setProperty(self, name, value):
+        pass
+
+    def getProperty(self, name):
+        return []
+
+    def say(self, text):
+        self._pending = text
+
+    def save_to_file(self, text, path):
+        self._pending = (text, path)
+
+    def runAndWait(self):
+        if isinstance(self._pending, tuple):
+            text, path = self._pending
+            with open(path, "wb") as f:
+                f.write(f"WAV:{text}".encode())
+            self.spoken.append(("render", text))
+            return
+        self._stop.clear()
+        deadline = time.monotonic() + self.duration
+        while time.monotonic() < deadline:
+            self._on_word("utterance", 0, 1)
+            if self._stop.wait(0.01):
+                return
+        self.spoken.append(self._pending)
+
+    def stop(self):
+        self.stopped_on.append(threading.current_thread().name)
+        self._stop.set()
+
+
+def test_say_returns_immediately():
+    engine = FakeEngine()
+    tts = TTS(engine_factory=lambda: engine)
+    t0 = time.perf_counter()
+    handle = tts.say("hello")
+    assert time.perf_counter() - t0 < 0.1
+    assert handle.wait(2) and engine.spoken == ["hello"]
+    tts.close()
+
+
+def test_stop_flushes_queue():
+    engine = FakeEngine(duration=5)
+    tts = TTS(engine_factory=lambda: engine)
+    handles = [tts.say(f"line {i}") for i in range(5)]
+    time.sleep(0.05)
+    tts.stop()
+    assert all(h.wait(1) for h in handles)
+    assert engine.spoken == [] and all(h.cancelled for h in handles)
+    assert engine.stopped_on == ["tts-worker"]  # stopped by the thread that owns it
+    tts.close()
+
+
+def test_say_never_blocks_on_a_full_queue():
+    engine = FakeEngine(duration=5)
+    tts = TTS(engine_factory=lambda: engine, max_queue=2)
+    tts.say("speaking")
+    time.sleep(0.05)
+    queued = [tts.say("one"), tts.say("two")]
+    t0 = time.perf_counter()
+    dropped = tts.say("three")
+    assert time.perf_counter() - t0 < 0.1
+    assert dropped.done() and dropped.cancelled and not any(h.done() for h in queued)
+    tts.close()
+
+
+class FakePlayer:
+    available = True
+
+    def __init__(self):
+        self.played = []
+
+    def play(self, data):
+        self.played.append(data)
+
+    def stop(self):
+        pass
+
+
+def test_repeated_phrase_is_rendered_once():
+    engine, player = FakeEngine(), FakePlayer()
+    tts = TTS(engine_factory=lambda: engine, cache=AudioCache(), player=player)
+    for _ in range(4):
+        tts.say("Sorry, I didn't understand.", wait=True)
+    tts.say("It is noon.", wait=True)
+    assert engine.spoken == [
+        "Sorry, I didn't understand.",  # first use: spoken at once, not rendered first
+        ("render", "Sorry, I didn't understand."),
+        "It is noon.",
+    ]
+    assert player.played == [b"WAV:Sorry, I didn't understand."] * 3
+    assert tts.cache.hits == 2 and len(tts.cache) == 1
+    tts.close()
+
+
+class SlowPlayer(FakePlayer):
+    def __init__(self, duration: float):
+        super().__init__()
+        self.duration = duration
+        self._stop = threading.Event()
+
+    def play(self, data):
+        self._stop.clear()
+        if not self._stop.wait(self.duration):
+            self.played.append(data)
+
+    def stop(self):
+        self._stop.set()
+
+
+ANSWER = (
+    "Ada Lovelace was an English mathematician. She wrote the first program, for the "
+    "Analytical Engine. She died in 1852."
+)
+
+
+def test_long_text_is_spoken_sentence_by_sentence():
+    assert split_sentences(ANSWER) == [
+        "Ada Lovelace was an English mathematician.",
+        "She wrote the first program, for the Analytical Engine.",
+        "She died in 1852.",
+    ]
+    parts = split_sentences("one two three, four five six", 15)
+    assert parts == ["one two three,", "four five six"]
+    engine, player = FakeEngine(), FakePlayer()
+    tts = TTS(
+        engine_factory=lambda: engine, cache=AudioCache(), cache_max_chars=60, player=player
+    )
+    handle = tts.say(ANSWER, wait=True)
+    assert player.played == [f"WAV:{s}".encode() for s in split_sentences(ANSWER)]
+    assert handle.text == ANSWER and handle.first_audio_at is not None
+    assert len(tts.cache) == 0  # one-off sentences are not cached
+
+    engine.spoken.clear()
+    tts.stream = False
+    tts.say(ANSWER, wait=True)
+    assert engine.spoken == [ANSWER]  # too long for the cache: spoken by the engine as is
+
+    more = threading.Event()
+
+    def fragments():
+        yield "Still "
+        more.wait(2)
+        yield "talking."
+
+    t0 = time.perf_counter()
+    handle = tts.say(fragments())  # joined on the worker, not here
+    assert time.perf_counter() - t0 < 0.1 and not handle.done()
+    more.set()
+    assert handle.wait(2) and handle.text == "Still talking."
+    assert engine.spoken[-1] == "Still talking."
+    tts.close()
+
+
+def test_streamed_fragments_start_speaking_early_and_barge_in_drops_the_rest():
+    engine, player = FakeEngine(), SlowPlayer(duration=5)
+    tts = TTS(engine_factory=lambda: engine, player=player)
+    more = threading.Event()
+
+    def fragments():
+        yield "The first sentence"
+        yield " is here. The sec"
+        more.wait(2)  # the rest of the answer is still on its way
+        yield "ond one arrives later. And a third. A fourth never gets rendered."
+
+    handle = tts.say(fragments())
+    deadline = time.monotonic() + 2
+    while handle.first_audio_at is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert handle.first_audio_at is not None and not more.is_set()
+    more.set()
+    time.sleep(0.05)
+    tts.stop()
+    assert handle.wait(2) and handle.cancelled
+    assert player.played == []  # the first sentence was cut off, the others never played
+    assert [text for _, text in engine.spoken] == [
+        "The first sentence is here.",
+        "The second one arrives later.",
+        "And a third.",
+    ]  # rendering stays at most two sentences ahead of playback
+    tts.close()
\ No newline at end of file
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: test_vad.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Tests for the NumPy voice activity detector.
+
+Usage:
+pytest -q
+
+===================================================================
+"""
+import numpy as np
+
+from voice_assistant.vad import VoiceActivityDetector
+
+RATE = 16000
+
+
+def _pcm(*parts):
+    rnd = np.random.default_rng(0)
+    out = []
+    for kind, seconds in parts:
+        n = int(RATE * seconds)
+        if kind == "tone":
+            x = 6000 * np.sin(2 * np.pi * 200 * np.arange(n) / RATE)
+        else:
+            x = rnd.normal(0, 40, n)
+        out.append(x)
+    return np.concatenate(out).astype(np.int16).tobytes()
+
+
+def test_trims_leading_and_trailing_silence():
+    vad = VoiceActivityDetector(use_webrtc=False)
+    out = vad.trim(_pcm(("noise", 1.0), ("tone", 0.6), ("noise", 1.5)), RATE)
+    kept = len(out) / 2 / RATE
+    assert 0.6 <= kept <= 0.6 + 2 * vad.hangover_ms / 1000 + 0.03
+    assert vad.stats()["discarded_seconds"] > 1.5
+
+
+def test_noise_only_clip_is_dropped():
+    vad = VoiceActivityDetector(use_webrtc=False)
+    assert vad.trim(_pcm(("noise", 2.0)), RATE) is None
+    assert vad.trim(_pcm(("noise", 1.0), ("tone", 0.06), ("noise", 1.0)), RATE) is None
+    assert vad.stats()["dropped_clips"] == 2
+
+
+def test_clip_of_nearly_all_speech_is_kept():
+    vad = VoiceActivityDetector(use_webrtc=False)
+    out = vad.trim(_pcm(("noise", 0.05), ("tone", 2.0), ("noise", 0.05)), RATE)
+    assert out is not None and len(out) / 2 / RATE >= 2.0
\ No newline at end of file
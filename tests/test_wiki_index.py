@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+===================================================================
+Project: Desktop Voice Assistant
+File: test_wiki_index.py
+Author: Mobin Yousefi (GitHub: github.com/mobinyousefi)
+Created: 2026-10-18
+Updated: 2026-10-18
+License: MIT License (see LICENSE file for details)
+===================================================================
+
+Description:
+Tests for the offline Wikipedia index and the skill's use of it.
+
+Usage:
+pytest -q
+
+===================================================================
+"""
+import gzip
+from xml.sax.saxutils import escape
+
+from voice_assistant.config import Config
+from voice_assistant.skills.skill_wikipedia import WikipediaSkill
+from voice_assistant.wiki_index import WikiIndex, import_abstracts
+
+_DOCS = [
+    ("Ada Lovelace", "Augusta Ada King was an English mathematician. She wrote the first "
+     "program for the Analytical Engine. She died in 1852."),
+    ("Alan Turing", "Alan Mathison Turing was an English mathematician. He formalised "
+     "computation."),
+    ("Turing machine", "A Turing machine is a model of computation. It manipulates symbols."),
+    ("The Beatles", "The Beatles were an English rock band formed in Liverpool in 1960."),
+    ("Python (programming language)", "Python is a high-level programming language. It "
+     "emphasises readability."),
+    ("Mercury", "Mercury may refer to:"),
+    ("Infobox", "{{Infobox person | name = nobody}}"),
+]
+
+
+def _dump(path):
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write("<feed>\n")
+        for title, abstract in _DOCS:
+            f.write(
+                f"<doc>\n<title>Wikipedia: {escape(title)}</title>\n"
+                f"<url>https://en.wikipedia.org/wiki/{escape(title)}</url>\n"
+                f"<abstract>{escape(abstract)}</abstract>\n<links><sublink linktype=\"nav\">"
+                "<anchor>History</anchor><link>x</link></sublink></links>\n</doc>\n"
+            )
+        f.write("</feed>\n")
+
+
+def _index(tmp_path):
+    _dump(tmp_path / "abstract.xml.gz")
+    path = str(tmp_path / "wiki.sqlite3")
+    seen = []
+    dump = str(tmp_path / "abstract.xml.gz")
+    n = import_abstracts(dump, path, batch_size=2, progress=seen.append)
+    assert n == 5 and seen == [2, 4]  # disambiguation and template-only pages skipped
+    return WikiIndex.open(path)
+
+
+def test_lookup_exact_partial_and_misspelled_titles(tmp_path):
+    index = _index(tmp_path)
+    assert len(index) == 5
+    title = lambda q: (index.lookup(q) or (None,))[0]  # noqa: E731
+    assert title("ada lovelace") == "Ada Lovelace"
+    assert title("the Beatles") == title("beatles") == "The Beatles"
+    assert title("Lovelace") == "Ada Lovelace"
+    assert title("turing machine") == "Turing machine"
+    assert title("python") == "Python (programming language)"
+    assert title("Alan Turning") == "Alan Turing"  # corrected against title terms
+    assert title("Mercury") is None and title("quantum gravity") is None and title("") is None
+    assert index.summary("Ada Lovelace") == (
+        "Augusta Ada King was an English mathematician. "
+        "She wrote the first program for the Analytical Engine."
+    )
+    index.close()
+
+
+def test_skill_answers_from_the_index_before_going_online(tmp_path):
+    class Ctx:
+        def speak(self, text):
+            pass
+
+    online = []
+    skill = WikipediaSkill(Config(wikipedia_hedge=False), index=_index(tmp_path))
+    skill._from_wikipedia = lambda q: online.append(q) or "online answer"
+    assert skill.handle(Ctx(), "wikipedia", {"query": "alan turing"}).startswith("Alan Mathison")
+    assert online == []
+    assert skill.handle(Ctx(), "wikipedia", {"query": "Grace Hopper"}) == "online answer"
+    assert online == ["Grace Hopper"]
+
+    skill.cfg.wikipedia_offline = True
+    msg = skill.handle(Ctx(), "wikipedia", {"query": "Grace Hopper"})
+    assert msg == "Sorry, I couldn't find an answer for 'Grace Hopper'." and len(online) == 1
+    assert WikiIndex.open(str(tmp_path / "missing.sqlite3")) is None
\ No newline at end of file